@@ -0,0 +1,278 @@
+"""
+Benchmarks for the engine's hot paths.
+
+    python -m benchmarks.run_benchmarks --output before.json
+    python -m benchmarks.run_benchmarks --compare before.json
+
+Every benchmark is seeded, so two runs on the same commit exercise the same
+rolls. Results are stored as JSON and `--compare` flags benchmarks whose median
+got slower than the threshold.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from piratesim.common.random import Deck, RouletteSelector
+from piratesim.encounters.encounter_manager import EncounterManager
+from piratesim.pirate import load_pirate_bank
+from piratesim.quests import load_quest_bank
+from piratesim.quests.quest_factory import QuestFactory
+from piratesim.selection import ASSIGNMENT_MODES, QuestSelector
+from piratesim.simulation import new_headless_run
+from piratesim.world_map import ProceduralWorldMap, WorldMap
+
+SEED = 1234
+RESULTS_DIR = Path(__file__).parent / "results"
+
+BENCHMARKS = {}
+
+
+def benchmark(name, repeat=50, setup=None):
+    """
+    Registers a benchmark. When `setup` is given it runs untimed before every
+    repetition and its return value is passed to the benchmarked function.
+    """
+
+    def decorator(func):
+        BENCHMARKS[name] = (func, setup, repeat)
+        return func
+
+    return decorator
+
+
+def _roulette(n_items):
+    def setup():
+        roulette = RouletteSelector()
+        for i in range(n_items):
+            roulette.add_item(i, 1.0 + i % 3)
+        return roulette
+
+    return setup
+
+
+for _n, _repeat in ((10, 500), (100, 200), (1000, 20)):
+    benchmark(f"roulette_roll[{_n}]", repeat=_repeat, setup=_roulette(_n))(
+        lambda roulette: roulette.roll()
+    )
+
+
+@benchmark(
+    "deck_draw[50x3]",
+    repeat=200,
+    setup=lambda: Deck(list(range(50)), n_cards=[3] * 50),
+)
+def bench_deck_draw(deck):
+    deck.draw(20, reshuffle=True)
+
+
+def _quest_template(chained):
+    quest_bank = load_quest_bank()
+    rows = quest_bank[(quest_bank["next_in_chain"] >= 0) == chained]
+    return rows.iloc[0].to_dict()
+
+
+@benchmark("quest_factory_from_dict[no_chain]", repeat=200)
+def bench_from_dict_no_chain(template=_quest_template(chained=False)):
+    QuestFactory().from_dict(template)
+
+
+@benchmark("quest_factory_from_dict[chain]", repeat=50)
+def bench_from_dict_chain(template=_quest_template(chained=True)):
+    QuestFactory().from_dict(template)
+
+
+def _selection_board(n_pirates, n_quests):
+    def setup():
+        random.seed(SEED)
+        templates = load_quest_bank().to_dict("records")
+        quests = [
+            QuestFactory().from_dict(random.choice(templates)) for _ in range(n_quests)
+        ]
+        for quest in quests:
+            quest.bounty = random.choice([0, 20, 50, 100])
+        pirates = (load_pirate_bank() * n_pirates)[:n_pirates]
+        return pirates, quests
+
+    return setup
+
+
+def _select(mode):
+    selector = QuestSelector(seed=SEED, mode=mode)
+    return lambda board: selector.select(*board)
+
+
+for _mode in ASSIGNMENT_MODES:
+    benchmark(
+        f"quest_selection[{_mode},30x300]",
+        repeat=20,
+        setup=_selection_board(30, 300),
+    )(_select(_mode))
+
+
+@benchmark("pirate_select_quest[30x300]", repeat=5, setup=_selection_board(30, 300))
+def bench_pirate_select_quest(board):
+    pirates, quests = board
+    for pirate in pirates:
+        quest = pirate.select_quest(quests)
+        if quest in quests:
+            quests.remove(quest)
+
+
+@benchmark("load_pirate_bank", repeat=20)
+def bench_load_pirate_bank():
+    load_pirate_bank()
+
+
+@benchmark("world_map_generation", repeat=20)
+def bench_world_map():
+    WorldMap()
+
+
+@benchmark("procedural_map_query_far_chunk", repeat=200)
+def bench_procedural_map():
+    world_map = ProceduralWorldMap(seed=SEED)
+    world_map.nearest(5000.0, -5000.0, k=3)
+
+
+@benchmark("encounter_manager_create_encounter", repeat=500, setup=EncounterManager)
+def bench_create_encounter(manager):
+    manager.create_encounter()
+
+
+@benchmark("single_run_next_turn", repeat=30, setup=lambda: new_headless_run(SEED))
+def bench_next_turn(run):
+    run.next_turn()
+
+
+def _mid_game_run():
+    run = new_headless_run(SEED)
+    run.simulate(25)
+    return run
+
+
+@benchmark("single_run_clone[turn_25x100]", repeat=20, setup=_mid_game_run)
+def bench_clone(run):
+    for seed in range(100):
+        run.clone(seed=seed)
+
+
+@benchmark("campaign[100_turns]", repeat=5, setup=lambda: new_headless_run(SEED))
+def bench_campaign(run):
+    run.simulate(100)
+
+
+def run_benchmark(name):
+    func, setup, repeat = BENCHMARKS[name]
+
+    random.seed(SEED)
+    np.random.seed(SEED)
+
+    timings = []
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        "repeat": repeat,
+        "min_s": min(timings),
+        "median_s": median,
+        "mean_s": statistics.fmean(timings),
+        "stdev_s": statistics.stdev(timings) if repeat > 1 else 0.0,
+        "ops_per_s": 1 / median if median else float("inf"),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, baseline, threshold):
+    """Prints the median ratio per benchmark and returns the regressed names"""
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["median_s"]
+        ratio = result["median_s"] / before if before else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  << REGRESSION"
+            regressions.append(name)
+        print(
+            f"{name:<40} {before * 1e3:>10.3f}ms {result['median_s'] * 1e3:>10.3f}ms"
+            f" {ratio:>7.2f}x{flag}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--filter", type=str, default="", help="Run matching names only")
+    ap.add_argument("--output", type=str, required=False)
+    ap.add_argument("--compare", type=str, required=False, help="Baseline JSON")
+    ap.add_argument(
+        "--threshold", type=float, default=0.10, help="Allowed median slowdown"
+    )
+    args = ap.parse_args(argv)
+
+    # The roulette's debug prints would dominate every timing
+    RouletteSelector.verbose = False
+
+    commit = _git_commit()
+    results = {}
+    for name in BENCHMARKS:
+        if args.filter not in name:
+            continue
+        results[name] = run_benchmark(name)
+        print(
+            f"{name:<40} median {results[name]['median_s'] * 1e3:>10.3f}ms"
+            f"  ({results[name]['ops_per_s']:.1f} ops/s)"
+        )
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "seed": SEED,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
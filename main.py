@@ -1,3 +1,4 @@
+from piratesim.common.profiler import PROFILER
 from piratesim.game import Game
 import argparse
 
@@ -7,11 +8,27 @@ if __name__ == "__main__":
     ap.add_argument('--quests', type=int, default=2)
     ap.add_argument('--gold', type=int, default=500)
     ap.add_argument('--seed', type=int, required=False)
+    ap.add_argument('--procedural-map', action='store_true',
+                    help='Sail an unbounded map generated from the seed')
+    ap.add_argument('--profile', type=str, required=False,
+                    help='Write a per-phase profile trace to this path on exit')
+    ap.add_argument('--profile-format', choices=['chrome', 'speedscope'],
+                    default='chrome')
 
     args = ap.parse_args()
     game = Game(
         n_quests=args.quests,
         starting_gold=args.gold,
         seed=args.seed,
+        procedural_map=args.procedural_map,
     )
-    game.run()
+
+    if args.profile:
+        PROFILER.enable()
+
+    try:
+        game.run()
+    finally:
+        if args.profile:
+            print(PROFILER.summary_table())
+            PROFILER.export(args.profile, args.profile_format)
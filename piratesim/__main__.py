@@ -0,0 +1,27 @@
+"""
+Command line tools, e.g.
+
+    python -m piratesim sweep --help
+"""
+
+import argparse
+
+from piratesim import sweep
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="piratesim")
+    commands = ap.add_subparsers(dest="command", required=True)
+
+    sweep_parser = commands.add_parser(
+        "sweep", help="Play a grid of headless games, caching results on disk"
+    )
+    sweep.add_arguments(sweep_parser)
+    sweep_parser.set_defaults(func=sweep.main)
+
+    args = ap.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
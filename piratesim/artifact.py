@@ -1,3 +1,12 @@
+from piratesim.common.assets import get_asset
+from piratesim.common.shared_assets import Table, compiled_table, table_from_frame
+
+
+@compiled_table("artifacts")
+def artifact_table() -> Table:
+    return table_from_frame(get_asset("artifacts/artifacts.csv"))
+
+
 class Artifact:
     def __init__(
         self,
@@ -0,0 +1,207 @@
+"""
+Expected value of the quest chains in `quests.csv`.
+
+Every quest of a chain is solved exactly from the closed form success odds
+(see odds.py), averaging over the difficulties and rewards `from_dict` can
+roll for it, and its value is combined with the value of the next quest of
+the chain. Values are memoized per (template, stat bucket, trait), so
+solving every chain root for every archetype only solves each quest once.
+
+The model assumes the same pirate takes each quest of the chain as soon as
+it is unlocked, for the same bounty, and retries failed quests right away.
+Quests expiring on the board aren't modelled.
+
+    python -m piratesim.chains
+"""
+
+import math
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from piratesim.odds import STATS, stat_probabilities
+from piratesim.quests import load_quest_bank
+from piratesim.quests.quest import QuestType, is_cursed_name
+from piratesim.routing import navigation_bucket
+from piratesim.selection import QuestBoard
+from piratesim.trait import TraitFactory, minimum_bounty
+
+# Quests from the bank are always 3 leagues away, see QuestFactory.from_dict
+QUEST_DISTANCE = 3
+MORALE_BUCKET = 10
+# Combat quests at least this hard strand the pirate when failed
+STRANDING_DIFFICULTY = 4
+
+
+class Archetype(NamedTuple):
+    trait: str
+    navigation: int
+    combat: int
+    trickyness: int
+    morale: int = 50
+
+    @classmethod
+    def of(cls, pirate) -> "Archetype":
+        return cls(
+            pirate.trait.name,
+            pirate.navigation,
+            pirate.combat,
+            pirate.trickyness,
+            pirate.morale,
+        )
+
+    @property
+    def stat_bucket(self) -> tuple:
+        morale = int(round(self.morale / MORALE_BUCKET) * MORALE_BUCKET)
+        return tuple(getattr(self, stat) for stat in STATS) + (morale,)
+
+
+class ChainValue(NamedTuple):
+    # Net gold for the guild (rewards minus bounties)
+    gold: float
+    notoriety: float
+    turns: float
+    # Chance the pirate makes it to the end of the chain (isn't stranded)
+    completion: float
+
+
+_CHAIN_END = ChainValue(0.0, 0.0, 0.0, 1.0)
+
+
+def voyage_turns(navigation: int, distance: int = QUEST_DISTANCE) -> int:
+    """Turns from embarking to rolling for success (see Pirate.progress_quest)"""
+    return 1 + math.ceil(max(distance - 1, 0) / navigation_bucket(navigation)) + 1
+
+
+def incapacitation_turns(navigation: int, distance: int = QUEST_DISTANCE) -> int:
+    """Turns an incapacitated pirate spends on the idle quest they were given"""
+    return voyage_turns(navigation, distance) - 1
+
+
+def chain_value(
+    quest_id: int, archetype: Archetype, bounty: Optional[int] = None
+) -> ChainValue:
+    """
+    Expected outcome of a chain from `quest_id` on, for a pirate archetype.
+    By default the bounty is the lowest the archetype accepts.
+    """
+    trait_id = TraitFactory.get_trait(archetype.trait).trait_id
+    if bounty is None:
+        bounty = minimum_bounty(trait_id)
+    return _chain_value(int(quest_id), trait_id, archetype.stat_bucket, bounty)
+
+
+@lru_cache(maxsize=None)
+def _chain_value(quest_id, trait_id, stat_bucket, bounty) -> ChainValue:
+    if quest_id in _solving:
+        raise ValueError(f"Quest {quest_id} is part of a cycle of quests")
+    _solving.add(quest_id)
+    try:
+        return _solve_quest(quest_id, trait_id, stat_bucket, bounty)
+    finally:
+        _solving.discard(quest_id)
+
+
+_solving: set[int] = set()
+
+
+def _solve_quest(quest_id, trait_id, stat_bucket, bounty) -> ChainValue:
+    template = load_quest_bank().loc[quest_id]
+    qtype = QuestType[template["type"]]
+    *stats, morale = stat_bucket
+    navigation = stats[STATS.index("navigation")]
+
+    # Every (difficulty, reward) from_dict can roll is equally likely
+    difficulty, reward = (
+        a.ravel()
+        for a in np.meshgrid(
+            np.arange(template["difficulty_min"], template["difficulty_max"] + 1),
+            np.arange(template["reward_min"] // 10, template["reward_max"] // 10 + 1)
+            * 10,
+        )
+    )
+    board = QuestBoard.from_columns(
+        difficulty, bounty, reward, qtype.value, is_cursed_name(template["name"])
+    )
+    p = stat_probabilities([morale], [stats], [trait_id], board)[0]
+
+    success_notoriety = template.get("success_notoriety", 0)
+    failure_notoriety = template.get("failure_notoriety", 0)
+    if trait_id == TraitFactory.get_trait("cautious").trait_id:
+        success_notoriety = min(0, success_notoriety)
+        failure_notoriety = min(0, failure_notoriety)
+
+    next_in_chain = int(template.get("next_in_chain", -1))
+    following = (
+        _chain_value(next_in_chain, trait_id, stat_bucket, bounty)
+        if next_in_chain >= 0
+        else _CHAIN_END
+    )
+
+    turns = voyage_turns(navigation)
+    stranded = (qtype == QuestType.combat) & (difficulty >= STRANDING_DIFFICULTY)
+    incapacitated = ~stranded & (qtype in (QuestType.combat, QuestType.theft))
+
+    success = np.array(
+        [
+            np.maximum(reward, 0) - bounty + following.gold,
+            np.full(len(board), success_notoriety + following.notoriety),
+            np.full(len(board), turns + following.turns),
+            np.full(len(board), following.completion),
+        ]
+    )
+    failure = np.array(
+        [
+            np.minimum(reward, 0) - bounty,
+            np.full(len(board), failure_notoriety),
+            turns + incapacitated * incapacitation_turns(navigation),
+            np.zeros(len(board)),
+        ]
+    )
+
+    # One attempt, and with retries V = p S + (1 - p) (F + V) until success,
+    # unless the failure stranded the pirate
+    once = p * success + (1 - p) * failure
+    retries = bool(template.get("retry", 1)) & ~stranded
+    with np.errstate(divide="ignore", invalid="ignore"):
+        retried = once / p
+    retried[3] = np.where(p > 0, following.completion, 0.0)
+    value = np.where(retries, retried, once)
+
+    return ChainValue(*(float(v) for v in value.mean(axis=1)))
+
+
+def chain_table(archetypes=None, bounty: Optional[int] = None) -> pd.DataFrame:
+    """
+    Expected gold, notoriety, turns and completion of every chain root, for
+    each archetype (by default one per pirate of the bank)
+    """
+    if archetypes is None:
+        from piratesim.pirate import load_pirate_bank
+
+        archetypes = {p.name: Archetype.of(p) for p in load_pirate_bank()}
+    elif not isinstance(archetypes, dict):
+        archetypes = {str(a): a for a in archetypes}
+
+    quest_bank = load_quest_bank()
+    roots = quest_bank[quest_bank["is_chain_root"] == 1]
+
+    rows = []
+    for quest_id, template in roots.iterrows():
+        for name, archetype in archetypes.items():
+            value = chain_value(quest_id, archetype, bounty)
+            rows.append(
+                {"quest": template["name"], "archetype": name, **value._asdict()}
+            )
+    return pd.DataFrame(rows)
+
+
+def main():
+    pd.set_option("display.width", 200)
+    print(chain_table().round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
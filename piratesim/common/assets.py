@@ -1,10 +1,33 @@
+import hashlib
+from functools import lru_cache
 from pathlib import Path
 
 import pandas as pd
 
+from piratesim.common.profiler import profiled
 
+ASSETS_DIR = Path(__file__).parents[1] / "assets"
+
+
+@profiled("get_asset")
 def get_asset(path):
-    asset_path: Path = Path(__file__).parents[1] / "assets" / path
+    """
+    Loads an asset table. Tables are parsed once per process and the same
+    DataFrame is handed to every caller (and every hosted session), so callers
+    must not modify it in place.
+    """
+    return _load_asset(path)
+
+
+def preload_assets():
+    """Parses every asset table up front, e.g. before serving many sessions"""
+    for asset_path in sorted(ASSETS_DIR.rglob("*.csv")):
+        get_asset(asset_path.relative_to(ASSETS_DIR).as_posix())
+
+
+@lru_cache(maxsize=None)
+def _load_asset(path):
+    asset_path: Path = ASSETS_DIR / path
     suffix = asset_path.suffix.lower()
     if suffix.lower() == ".csv":
         try:
@@ -14,3 +37,28 @@ def get_asset(path):
         return output
     else:
         raise NotImplementedError(f"{suffix} assets are not supported.")
+
+
+def asset_bundle_hash(paths=None) -> str:
+    """
+    Digest of the asset tables at `paths` (all of them by default), for caches
+    of values derived from the assets. Each file is only re-read when its size
+    or modification time changes.
+    """
+    if paths is None:
+        paths = [
+            path.relative_to(ASSETS_DIR).as_posix()
+            for path in ASSETS_DIR.rglob("*.csv")
+        ]
+
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(paths):
+        stat = (ASSETS_DIR / path).stat()
+        digest.update(path.encode())
+        digest.update(_hash_asset(path, stat.st_size, stat.st_mtime_ns))
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=64)
+def _hash_asset(path, size, mtime_ns) -> bytes:
+    return hashlib.blake2b((ASSETS_DIR / path).read_bytes(), digest_size=16).digest()
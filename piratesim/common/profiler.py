@@ -0,0 +1,190 @@
+import json
+import sys
+import time
+from contextlib import nullcontext
+from functools import wraps
+from pathlib import Path
+
+_NULL_SECTION = nullcontext()
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "start", "blocks")
+
+    def __init__(self, profiler, name) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        blocks = sys.getallocatedblocks() - self.blocks
+        self.profiler._record(self.name, self.start, end, blocks)
+        return False
+
+
+class Profiler:
+    """
+    Collects wall time and allocation counts for named sections of the engine.
+
+    Allocations are measured as the net change in allocated memory blocks
+    (`sys.getallocatedblocks`) while a section is open, so nested sections also
+    count towards their parents. While disabled, `section()` hands out a shared
+    null context and `profiled` functions call straight through.
+    """
+
+    def __init__(self, max_events: int = 1_000_000) -> None:
+        self.enabled = False
+        self.max_events = max_events
+        self.reset()
+
+    def reset(self):
+        # name -> [calls, total_ns, total_blocks]
+        self.stats: dict[str, list] = {}
+        self.events: list[tuple[str, int, int, int]] = []
+        self.dropped_events = 0
+        self._origin = time.perf_counter_ns()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def section(self, name: str):
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def _record(self, name, start, end, blocks):
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = [0, 0, 0]
+        stat[0] += 1
+        stat[1] += end - start
+        stat[2] += blocks
+
+        if len(self.events) < self.max_events:
+            self.events.append((name, start, end, blocks))
+        else:
+            self.dropped_events += 1
+
+    def summary(self) -> list[dict]:
+        rows = []
+        for name, (calls, total_ns, blocks) in self.stats.items():
+            rows.append(
+                {
+                    "name": name,
+                    "calls": calls,
+                    "total_ms": total_ns / 1e6,
+                    "mean_us": total_ns / calls / 1e3,
+                    "alloc_blocks": blocks,
+                    "alloc_blocks_per_call": blocks / calls,
+                }
+            )
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+    def summary_table(self) -> str:
+        header = (
+            f"{'section':<32} {'calls':>9} {'total ms':>11} {'mean us':>10}"
+            f" {'blocks':>10} {'blocks/call':>12}"
+        )
+        lines = [header, "-" * len(header)]
+        for row in self.summary():
+            lines.append(
+                f"{row['name']:<32} {row['calls']:>9} {row['total_ms']:>11.3f}"
+                f" {row['mean_us']:>10.2f} {row['alloc_blocks']:>10}"
+                f" {row['alloc_blocks_per_call']:>12.2f}"
+            )
+        if self.dropped_events:
+            lines.append(f"({self.dropped_events} trace events dropped)")
+        return "\n".join(lines)
+
+    def _sorted_events(self):
+        # Parents first when two sections open at the same instant
+        return sorted(self.events, key=lambda e: (e[1], -e[2]))
+
+    def to_chrome_trace(self) -> dict:
+        trace_events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._origin) / 1e3,
+                "dur": (end - start) / 1e3,
+                "pid": 0,
+                "tid": 0,
+                "args": {"alloc_blocks": blocks},
+            }
+            for name, start, end, blocks in self._sorted_events()
+        ]
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def to_speedscope(self, profile_name: str = "piratesim") -> dict:
+        frames = []
+        frame_index = {}
+        events = []
+        stack = []
+
+        def close_until(timestamp):
+            while stack and stack[-1][1] <= timestamp:
+                frame, end = stack.pop()
+                events.append({"type": "C", "frame": frame, "at": end})
+
+        for name, start, end, _ in self._sorted_events():
+            if name not in frame_index:
+                frame_index[name] = len(frames)
+                frames.append({"name": name})
+
+            start_us = (start - self._origin) / 1e3
+            end_us = (end - self._origin) / 1e3
+            close_until(start_us)
+            events.append({"type": "O", "frame": frame_index[name], "at": start_us})
+            stack.append((frame_index[name], end_us))
+
+        close_until(float("inf"))
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "evented",
+                    "name": profile_name,
+                    "unit": "microseconds",
+                    "startValue": events[0]["at"] if events else 0,
+                    "endValue": events[-1]["at"] if events else 0,
+                    "events": events,
+                }
+            ],
+            "exporter": "piratesim",
+        }
+
+    def export(self, path, fmt: str = "chrome"):
+        exporters = {"chrome": self.to_chrome_trace, "speedscope": self.to_speedscope}
+        if fmt not in exporters:
+            raise ValueError(f"Unknown profile format '{fmt}', use {list(exporters)}")
+
+        Path(path).write_text(json.dumps(exporters[fmt]()))
+
+
+PROFILER = Profiler()
+
+
+def profiled(name: str):
+    """Decorator that records every call to the wrapped function as a section."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with _Section(PROFILER, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
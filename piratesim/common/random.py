@@ -1,8 +1,13 @@
+import hashlib
 import random
 import time
 from collections import OrderedDict
 from typing import Iterable, Optional
 
+import numpy as np
+
+from piratesim.common.profiler import profiled
+
 
 def get_seed():
     large_prime1 = 314105291
@@ -16,9 +21,66 @@ def get_seed():
     return seed
 
 
+class RandomStreams:
+    """
+    Independent generators keyed by what they drive (a pirate, a region, the
+    encounters of a pirate...), all derived from one seed. Runs sharing a seed
+    draw the same numbers for the same entity however differently they play
+    out, so variants of the game can be compared with common random numbers.
+    """
+
+    def __init__(self, seed: int) -> None:
+        self.seed = seed
+        self._streams: dict[tuple, random.Random] = {}
+
+    def seed_for(self, *key) -> int:
+        digest = hashlib.blake2b(repr((self.seed,) + key).encode(), digest_size=8)
+        return int.from_bytes(digest.digest(), "little")
+
+    def clone(self) -> "RandomStreams":
+        """A copy whose streams carry on from where these are"""
+        clone = RandomStreams(self.seed)
+        for key, stream in self._streams.items():
+            clone._streams[key] = random.Random(0)
+            clone._streams[key].setstate(stream.getstate())
+        return clone
+
+    def stream(self, *key) -> random.Random:
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = self._streams[key] = random.Random(self.seed_for(*key))
+        return stream
+
+
+class LazyGenerator:
+    """
+    Mixin for classes rolling on a NumPy generator `rng`, which is only built
+    when first used. Seeding one costs about as much as cloning a whole run,
+    and cloned runs get reseeded (see SingleRun.clone).
+    """
+
+    _rng: Optional[np.random.Generator] = None
+    _rng_seed: Optional[int] = None
+
+    @property
+    def rng(self) -> np.random.Generator:
+        if self._rng is None:
+            self._rng = np.random.default_rng(self._rng_seed)
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng: np.random.Generator):
+        self._rng = rng
+
+    def reseed(self, seed: Optional[int]):
+        self._rng, self._rng_seed = None, seed
+
+
 class RouletteSelector:
-    def __init__(self, items: Optional[Iterable] = None) -> None:
+    def __init__(self, items: Optional[Iterable] = None, verbose: bool = False) -> None:
         self.roulette: OrderedDict = OrderedDict()
+        # Prints every roll, turned on by runs in debug mode
+        self.verbose = verbose
 
         if items:
             for item in items:
@@ -68,24 +130,26 @@ class RouletteSelector:
             item: chance / self.total_chances for item, chance in self.roulette.items()
         }
 
-    def roll(self):
+    @profiled("RouletteSelector.roll")
+    def roll(self, rng=random):
         self._remove_impossible_items()
-        roll = random.random()
+        roll = rng.random()
 
         lower_bound = 0.0
         for item, chance in self.roulette.items():
             upper_bound = lower_bound + chance / self.total_chances
             # NOTE Debug only
-            print(
-                lower_bound,
-                "<=",
-                roll,
-                "<",
-                upper_bound,
-                ":",
-                item,
-                "✔️" if lower_bound <= roll < upper_bound else "",
-            )
+            if self.verbose:
+                print(
+                    lower_bound,
+                    "<=",
+                    roll,
+                    "<",
+                    upper_bound,
+                    ":",
+                    item,
+                    "✔️" if lower_bound <= roll < upper_bound else "",
+                )
             if lower_bound <= roll < upper_bound:
                 return item
             lower_bound = upper_bound
@@ -115,7 +179,7 @@ class Deck(RouletteSelector):
 
         self.initial_deck = self.roulette.copy()
 
-    def draw(self, n_draws: int = 1, reshuffle: bool = False):
+    def draw(self, n_draws: int = 1, reshuffle: bool = False, rng=random):
         assert n_draws >= 1, "n_draws must be >= 1"
 
         drawn_items = []
@@ -124,7 +188,7 @@ class Deck(RouletteSelector):
                 # Restart the deck
                 self.roulette = self.initial_deck.copy()
 
-            drawn_item = self.roll()
+            drawn_item = self.roll(rng)
             if drawn_item:
                 self.apply_modifier(drawn_item, -1)
 
@@ -0,0 +1,240 @@
+"""
+Compiled asset tables, shared between the processes of a worker pool.
+
+What the engine compiles from the asset CSVs (the quest bank, encounter
+records, pirate, idle quest and artifact templates) is kept as tables of
+equal length NumPy columns, numbers as they are and text as fixed width
+unicode, declared with `compiled_table`. A process compiles each table once
+and its columns are read-only.
+
+A sweep compiles every table in the parent process and publishes them in one
+`multiprocessing.shared_memory` block. Pool workers attach to the block by
+name in their initializer, and from then on compiled tables are read-only
+views of it, so the tables exist once however many workers there are.
+
+    with SharedAssets.publish() as shared:
+        with multiprocessing.Pool(
+            64, initializer=attach_assets, initargs=(shared.name,)
+        ) as pool:
+            ...
+"""
+
+import json
+import sys
+from collections.abc import Mapping, Sequence
+from functools import lru_cache, wraps
+from multiprocessing import shared_memory
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Column name -> values, with one entry per row along the first axis
+Table = dict[str, np.ndarray]
+
+# Arrays start at multiples of this, so views are aligned for any dtype
+ALIGNMENT = 64
+_HEADER_SIZE = np.dtype("<u8").itemsize
+
+# Every table declared with compiled_table, by name
+_TABLES: dict[str, Callable[[], Table]] = {}
+# The block compiled tables are read from, once the process attached to one
+_attached: Optional["SharedAssets"] = None
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _read_only(table: Table) -> Table:
+    for values in table.values():
+        values.flags.writeable = False
+    return table
+
+
+def table_from_frame(frame: pd.DataFrame) -> Table:
+    """The columns of a parsed asset table, text as fixed width unicode"""
+    table = {}
+    for name, column in frame.items():
+        if column.dtype.kind in "biuf":
+            table[name] = column.to_numpy(copy=True)
+        else:
+            assert not column.isna().any(), f"Text column {name} has missing values"
+            table[name] = np.array(column.tolist(), dtype=str)
+    return table
+
+
+def compiled_table(name: str):
+    """
+    Declares the function compiling the table `name`. The decorated function
+    compiles it once per process, or returns views of the attached block when
+    the block has it.
+    """
+
+    def decorator(compile: Callable[[], Table]) -> Callable[[], Table]:
+        @lru_cache(maxsize=None)
+        @wraps(compile)
+        def table() -> Table:
+            if _attached is not None and name in _attached:
+                return _attached.table(name)
+            return _read_only(compile())
+
+        _TABLES[name] = table
+        return table
+
+    return decorator
+
+
+class TableRow(Mapping):
+    """A row of a table, as a mapping of column names to Python values"""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: Table, row: int) -> None:
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, column):
+        return self._table[column][self._row].item()
+
+    def __iter__(self):
+        return iter(self._table)
+
+    def __len__(self):
+        return len(self._table)
+
+
+class TableRows(Sequence):
+    """The rows of a table, each read from the columns as it's accessed"""
+
+    def __init__(self, table: Table) -> None:
+        self._table = table
+        self._n_rows = len(next(iter(table.values()))) if table else 0
+
+    def __getitem__(self, row: int) -> TableRow:
+        return TableRow(self._table, range(self._n_rows)[row])
+
+    def __len__(self):
+        return self._n_rows
+
+
+class _SharedBlock(shared_memory.SharedMemory):
+    def close(self):
+        try:
+            super().close()
+        except BufferError:
+            # Views of the block are still around, it's unmapped with them
+            pass
+
+    def __del__(self):
+        self.close()
+
+
+class SharedAssets:
+    """
+    Compiled tables in a shared memory block: a JSON layout followed by the
+    columns. The process that publishes the block owns it and unlinks it on
+    `close`, attached processes only detach.
+    """
+
+    def __init__(self, block: _SharedBlock, owner: bool) -> None:
+        self._block = block
+        self.owner = owner
+        size = int(np.frombuffer(block.buf, dtype="<u8", count=1)[0])
+        self.layout = json.loads(bytes(block.buf[_HEADER_SIZE : _HEADER_SIZE + size]))
+        self._start = _align(_HEADER_SIZE + size)
+
+    @classmethod
+    def publish(cls, names=None) -> "SharedAssets":
+        """
+        Compiles the tables called `names` (every declared one by default) in
+        this process and copies them into a new block
+        """
+        names = sorted(_TABLES) if names is None else names
+
+        layout, arrays, offset = {}, [], 0
+        for name in names:
+            columns = []
+            for column, values in _TABLES[name]().items():
+                values = np.ascontiguousarray(values)
+                columns.append(
+                    {
+                        "name": column,
+                        "dtype": values.dtype.str,
+                        "shape": values.shape,
+                        "offset": offset,
+                    }
+                )
+                arrays.append((offset, values))
+                offset = _align(offset + values.nbytes)
+            layout[name] = columns
+
+        header = json.dumps(layout).encode()
+        start = _align(_HEADER_SIZE + len(header))
+        block = _SharedBlock(create=True, size=start + offset)
+        block.buf[:_HEADER_SIZE] = np.uint64(len(header)).tobytes()
+        block.buf[_HEADER_SIZE : _HEADER_SIZE + len(header)] = header
+        for array_offset, values in arrays:
+            at = start + array_offset
+            block.buf[at : at + values.nbytes] = values.tobytes()
+        return cls(block, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedAssets":
+        if sys.version_info >= (3, 13):
+            block = _SharedBlock(name, track=False)
+        else:
+            # Pool workers share the resource tracker of the process that
+            # published the block, which only forgets it once it's unlinked
+            block = _SharedBlock(name)
+        return cls(block, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._block.name
+
+    def __contains__(self, name) -> bool:
+        return name in self.layout
+
+    def table(self, name) -> Table:
+        """Read-only views of the columns of the table `name`"""
+        table = {}
+        for column in self.layout[name]:
+            dtype = np.dtype(column["dtype"])
+            shape = tuple(column["shape"])
+            table[column["name"]] = np.frombuffer(
+                self._block.buf,
+                dtype=dtype,
+                count=int(np.prod(shape)),
+                offset=self._start + column["offset"],
+            ).reshape(shape)
+        return _read_only(table)
+
+    def close(self):
+        if self.owner:
+            self._block.unlink()
+        self._block.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def compile_tables():
+    """Compiles every declared table that this process hasn't yet"""
+    for table in _TABLES.values():
+        table()
+
+
+def attach_assets(name: str):
+    """
+    Makes compiled tables read from the shared block `name`, e.g. as the
+    initializer of a pool's workers. Tables compiled before can't be replaced,
+    so this must run before any is used.
+    """
+    global _attached
+    compiled = [table for table, load in _TABLES.items() if load.cache_info().currsize]
+    assert not compiled, f"Tables {compiled} were compiled before attaching"
+    _attached = SharedAssets.attach(name)
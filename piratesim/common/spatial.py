@@ -0,0 +1,174 @@
+import math
+from collections import defaultdict
+from typing import Callable, Hashable, Optional
+
+# Compass headings in degrees, counter-clockwise from EAST (+x), NORTH is +y
+COMPASS_ANGLES = {
+    "EAST": 0.0,
+    "NORTHEAST": 45.0,
+    "NORTH": 90.0,
+    "NORTHWEST": 135.0,
+    "WEST": 180.0,
+    "SOUTHWEST": 225.0,
+    "SOUTH": 270.0,
+    "SOUTHEAST": 315.0,
+}
+_DIRECTIONS_BY_SECTOR = list(COMPASS_ANGLES)
+
+
+def compass_direction(dx: float, dy: float) -> str:
+    """The compass direction (one of 8 sectors) of a displacement"""
+    angle = math.degrees(math.atan2(dy, dx)) % 360
+    return _DIRECTIONS_BY_SECTOR[round(angle / 45) % 8]
+
+
+def compass_vector(direction: str) -> tuple[float, float]:
+    angle = math.radians(COMPASS_ANGLES[direction])
+    return math.cos(angle), math.sin(angle)
+
+
+class GridIndex:
+    """
+    Uniform grid over 2D points for nearest, within-radius and by-direction
+    queries. Items are hashed into square cells of `cell_size`, so a query only
+    visits the cells around the point instead of every item.
+    """
+
+    def __init__(self, cell_size: float = 1.0) -> None:
+        assert cell_size > 0, "cell_size must be positive"
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], list] = defaultdict(list)
+        self.positions: dict[Hashable, tuple[float, float]] = {}
+        # Cell bounding box (min_x, max_x, min_y, max_y), only ever grows
+        self._bounds = None
+
+    def __len__(self):
+        return len(self.positions)
+
+    def copy(self) -> "GridIndex":
+        index = GridIndex(self.cell_size)
+        index.cells.update((cell, list(items)) for cell, items in self.cells.items())
+        index.positions = dict(self.positions)
+        index._bounds = self._bounds
+        return index
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def _cell(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def insert(self, item, x: float, y: float):
+        assert item not in self.positions, f"{item} is already indexed"
+        self.positions[item] = (x, y)
+        cell = self._cell(x, y)
+        self.cells[cell].append(item)
+
+        if self._bounds is None:
+            self._bounds = (cell[0], cell[0], cell[1], cell[1])
+        else:
+            min_x, max_x, min_y, max_y = self._bounds
+            self._bounds = (
+                min(min_x, cell[0]),
+                max(max_x, cell[0]),
+                min(min_y, cell[1]),
+                max(max_y, cell[1]),
+            )
+
+    def remove(self, item):
+        x, y = self.positions.pop(item)
+        cell = self._cell(x, y)
+        self.cells[cell].remove(item)
+        if not self.cells[cell]:
+            del self.cells[cell]
+
+    def within_radius(self, x: float, y: float, radius: float) -> list:
+        """Items at most `radius` away, closest first"""
+        cx0, cy0 = self._cell(x - radius, y - radius)
+        cx1, cy1 = self._cell(x + radius, y + radius)
+
+        found = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for item in self.cells.get((cx, cy), ()):
+                    ix, iy = self.positions[item]
+                    distance = math.hypot(ix - x, iy - y)
+                    if distance <= radius:
+                        found.append((distance, item))
+
+        found.sort(key=lambda d: d[0])
+        return [item for _, item in found]
+
+    def nearest(
+        self,
+        x: float,
+        y: float,
+        k: int = 1,
+        predicate: Optional[Callable] = None,
+        max_distance: float = math.inf,
+    ) -> list:
+        """The `k` closest items (accepted by `predicate`), closest first"""
+        if not self.cells:
+            return []
+
+        center = self._cell(x, y)
+        min_x, max_x, min_y, max_y = self._bounds
+        max_ring = max(
+            abs(center[0] - min_x),
+            abs(center[0] - max_x),
+            abs(center[1] - min_y),
+            abs(center[1] - max_y),
+        )
+
+        best: list[tuple[float, object]] = []
+        for ring in range(max_ring + 1):
+            for cell in self._ring(center, ring):
+                for item in self.cells.get(cell, ()):
+                    ix, iy = self.positions[item]
+                    distance = math.hypot(ix - x, iy - y)
+                    if distance > max_distance:
+                        continue
+                    if predicate is not None and not predicate(item):
+                        continue
+                    best.append((distance, item))
+
+            best.sort(key=lambda d: d[0])
+            del best[k:]
+
+            # Anything beyond this ring is at least `ring` cells away
+            reach = ring * self.cell_size
+            if reach > max_distance or (len(best) == k and best[-1][0] <= reach):
+                break
+
+        return [item for _, item in best]
+
+    def in_direction(
+        self,
+        x: float,
+        y: float,
+        direction: str,
+        k: int = 1,
+        max_distance: float = math.inf,
+    ) -> list:
+        """The `k` closest items lying in a compass sector as seen from (x, y)"""
+
+        def in_sector(item):
+            ix, iy = self.positions[item]
+            if (ix, iy) == (x, y):
+                return False
+            return compass_direction(ix - x, iy - y) == direction
+
+        return self.nearest(x, y, k, predicate=in_sector, max_distance=max_distance)
+
+    @staticmethod
+    def _ring(center, ring):
+        cx, cy = center
+        if ring == 0:
+            yield center
+            return
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cy - ring
+            yield cx + dx, cy + ring
+        for dy in range(-ring + 1, ring):
+            yield cx - ring, cy + dy
+            yield cx + ring, cy + dy
@@ -20,3 +20,10 @@ def clear_terminal():
         clear_output(wait=True)
     else:
         os.system("cls" if os.name == "nt" else "clear")
+
+
+def shallow_copy(obj):
+    """Same as copy.copy for plain objects, without its dispatch overhead"""
+    clone = object.__new__(type(obj))
+    clone.__dict__.update(obj.__dict__)
+    return clone
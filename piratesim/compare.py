@@ -0,0 +1,148 @@
+"""
+Comparing two variants of the game (a trait tweak, a new quest...) with
+common random numbers.
+
+Both variants play the same seeds, and with RandomStreams every pirate,
+region and pirate's encounters draw the same numbers in both, so the per
+seed differences only carry the effect of the change plus whatever noise the
+change itself introduces. Their mean is reported with a paired confidence
+interval, which is much tighter than comparing independent runs.
+
+    def baseline(seed):
+        return new_headless_run(seed, common_random_numbers=True)
+
+    def greedier(seed):
+        run = new_headless_run(seed, common_random_numbers=True)
+        # Tweaks must be in place while the run plays
+        modifiers = ((1.0, False), (-0.5, False))
+        with patch.object(GreedyTrait, "resolution_modifiers", modifiers):
+            run.simulate(100)
+        return run
+
+    compare_variants(baseline, greedier, seeds=range(1, 201))
+"""
+
+import math
+from statistics import NormalDist
+from typing import Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+METRICS = ("gold", "notoriety", "turn")
+
+
+class PairedDifference(NamedTuple):
+    mean: float
+    low: float
+    high: float
+    # How many times fewer runs the pairing needs than independent samples
+    # for an interval this wide
+    variance_reduction: float
+
+
+# Below this many degrees of freedom the Cornish-Fisher expansion is off by
+# more than 1e-4 (by 3.0 at 97.5% with one), so the t CDF is inverted instead
+_EXPANSION_MIN_DOF = 10
+
+
+def t_cdf(t: float, dof: int) -> float:
+    """Student's t CDF, in closed form for integer degrees of freedom"""
+    theta = math.atan(t / math.sqrt(dof))
+    cos2 = math.cos(theta) ** 2
+    # Series of Abramowitz & Stegun 26.7.3/26.7.4 for P(-t < T < t)
+    term, total = 1.0, 1.0
+    for k in range(2 if dof % 2 else 1, dof - 1, 2):
+        term *= cos2 * k / (k + 1)
+        total += term
+    if dof % 2:
+        inner = math.sin(theta) * math.cos(theta) * total if dof > 1 else 0.0
+        central = 2 / math.pi * (theta + inner)
+    else:
+        central = math.sin(theta) * total
+    return 0.5 + central / 2
+
+
+def t_quantile(p: float, dof: int) -> float:
+    """
+    Student's t quantile, from the Cornish-Fisher expansion of the normal with
+    enough degrees of freedom and by bisection of t_cdf below that
+    """
+    if dof < _EXPANSION_MIN_DOF:
+        low, high = -1.0, 1.0
+        while t_cdf(low, dof) > p:
+            low *= 2
+        while t_cdf(high, dof) < p:
+            high *= 2
+        for _ in range(100):
+            middle = (low + high) / 2
+            low, high = (middle, high) if t_cdf(middle, dof) < p else (low, middle)
+        return (low + high) / 2
+
+    z = NormalDist().inv_cdf(p)
+    return (
+        z
+        + (z**3 + z) / (4 * dof)
+        + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * dof**2)
+        + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * dof**3)
+    )
+
+
+def paired_difference(a, b, confidence: float = 0.95) -> PairedDifference:
+    """Mean of b - a over paired samples, with its confidence interval"""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    assert len(a) == len(b) and len(a) > 1, "Need at least two pairs of samples"
+
+    differences = b - a
+    mean = float(differences.mean())
+    paired_variance = float(differences.var(ddof=1))
+    half_width = t_quantile(0.5 + confidence / 2, len(a) - 1) * math.sqrt(
+        paired_variance / len(a)
+    )
+
+    independent_variance = float(a.var(ddof=1) + b.var(ddof=1))
+    variance_reduction = (
+        independent_variance / paired_variance if paired_variance > 0 else math.inf
+    )
+    return PairedDifference(
+        mean, mean - half_width, mean + half_width, variance_reduction
+    )
+
+
+def compare_variants(
+    variant_a: Callable,
+    variant_b: Callable,
+    seeds,
+    max_turns: int = 100,
+    metrics=METRICS,
+    confidence: float = 0.95,
+) -> pd.DataFrame:
+    """
+    Plays both variants on every seed and reports, per metric, the mean of
+    each and their paired difference (b - a). Variants are functions of the
+    seed returning a headless SingleRun, which should use common random
+    numbers; they are simulated for up to `max_turns` turns unless already
+    over.
+    """
+    samples = {variant: {metric: [] for metric in metrics} for variant in "ab"}
+    for seed in seeds:
+        for variant, make_run in (("a", variant_a), ("b", variant_b)):
+            run = make_run(seed)
+            if run.turn == 0:
+                run.simulate(max_turns)
+            for metric in metrics:
+                samples[variant][metric].append(getattr(run, metric))
+
+    rows = []
+    for metric in metrics:
+        a, b = samples["a"][metric], samples["b"][metric]
+        difference = paired_difference(a, b, confidence)
+        rows.append(
+            {
+                "metric": metric,
+                "a": float(np.mean(a)),
+                "b": float(np.mean(b)),
+                **difference._asdict(),
+            }
+        )
+    return pd.DataFrame(rows)
@@ -0,0 +1,138 @@
+"""
+Player decisions requested by the engine.
+
+`Game.play`, `SingleRun.play` and `SingleRun.play_turn` are generators that
+yield a decision whenever the player has to choose something and are resumed
+with the answer. The same flow can then be answered from the terminal, by a
+policy or by a remote client awaiting a socket.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from piratesim.common.utils import clear_terminal
+
+
+@dataclass
+class Decision:
+    # The Game or SingleRun that asked, which knows how to prompt for it
+    source: Any = field(repr=False)
+
+    kind = "decision"
+
+    def options(self) -> list[str]:
+        return []
+
+    def parse(self, choice: int):
+        """Validates a numeric choice from a remote player, returning the answer"""
+        if choice not in range(len(self.options())):
+            raise ValueError(f"Invalid option {choice}")
+        return choice
+
+
+@dataclass
+class PirateSelectionDecision(Decision):
+    """Toggle a pirate for the next run (1..n) or start it (0)"""
+
+    pirates: list = field(default_factory=list)
+    selected: list = field(default_factory=list)
+    max_pirates: int = 1
+
+    kind = "select_pirate"
+
+    def options(self):
+        return ["Next"] + [
+            f'[{"x" if p in self.selected else " "}] {p.name}' for p in self.pirates
+        ]
+
+
+@dataclass
+class ArtifactDecision(Decision):
+    """Equip one of the artifacts (1..n) on a pirate, or none (0)"""
+
+    pirate: Any = None
+    artifacts: list = field(default_factory=list)
+    crew: list = field(default_factory=list)
+
+    kind = "select_artifact"
+
+    def options(self):
+        return ["None"] + [a.name for a in self.artifacts]
+
+
+@dataclass
+class PinQuestDecision(Decision):
+    """Pin one of the available quests, answered with the quest or None"""
+
+    available_quests: list = field(default_factory=list)
+
+    kind = "pin_quest"
+
+    def options(self):
+        return ["Next turn"] + [str(q) for q in self.available_quests]
+
+    def parse(self, choice):
+        if choice not in range(len(self.available_quests) + 1):
+            raise ValueError(f"Invalid option {choice}")
+        return self.available_quests[choice - 1] if choice > 0 else None
+
+
+@dataclass
+class BountyDecision(Decision):
+    """The pirate's cut for a quest that is being pinned"""
+
+    quest: Any = None
+
+    kind = "bounty"
+
+    def parse(self, choice):
+        if not isinstance(choice, int) or choice < 0:
+            raise ValueError("The bounty must be a non negative integer")
+        return choice
+
+
+@dataclass
+class EncounterDecision(Decision):
+    """Choose a (zero based) course of action for an encounter"""
+
+    encounter: Any = None
+    pirate: Any = None
+
+    kind = "encounter"
+
+    def options(self):
+        return list(self.encounter.options)
+
+
+@dataclass
+class Notice(Decision):
+    """Something the player should read, the answer is ignored"""
+
+    lines: list[str] = field(default_factory=list)
+    clear_screen: bool = False
+
+    kind = "notice"
+
+
+def answer_in_terminal(decision: Decision):
+    if isinstance(decision, Notice):
+        if decision.clear_screen:
+            clear_terminal()
+        print()
+        for line in decision.lines:
+            print(line)
+            print()
+        input("> Press Enter to continue <")
+        return None
+
+    return decision.source.answer_interactively(decision)
+
+
+def drive(steps, decide):
+    """Runs a decision generator to completion answering with `decide`"""
+    try:
+        decision = next(steps)
+        while True:
+            decision = steps.send(decide(decision))
+    except StopIteration as stop:
+        return stop.value
@@ -1,3 +1,5 @@
+import random
+
 from piratesim.common.random import RouletteSelector
 from piratesim.common.utils import clear_terminal
 from piratesim.encounters.encounter_effect import EncounterEffect
@@ -26,42 +28,57 @@ class Encouter:
         self.success_texts = success_texts
         self.failure_texts = failure_texts
 
-    def trigger(self, quest_taker):
-        description = self.description.format(name=quest_taker.name)
+    def trigger(self, quest_taker, option=None):
+        """
+        Resolves the encounter for a pirate, prompting for the course of action
+        and printing the outcome unless an `option` is given.
+        """
+        interactive = option is None
+        if interactive:
+            option = self.prompt(quest_taker)
+
+        encounter_log = self.resolve(quest_taker, option)
 
+        if interactive:
+            print()
+            for line in encounter_log[1:]:
+                print(line)
+                print()
+            input('> Press Enter to continue <')
+
+        return encounter_log
+
+    def prompt(self, quest_taker):
         clear_terminal()
         print(f" --- ⁉️ {self.title.upper()} ⁉️ --- ")
-        print(description + "\n")
+        print(self.description.format(name=quest_taker.name) + "\n")
 
         for i, option in enumerate(self.options):
             print(f"{i + 1}) {option}")
 
-        ans = self._handle_option_selection()
+        return self._handle_option_selection()
+
+    def resolve(self, quest_taker, option, rng=random, verbose=False):
+        description = self.description.format(name=quest_taker.name)
 
-        roulette = RouletteSelector(items=[True, False])
-        roulette.set_chance(True, self.success_odds[ans])
-        success = roulette.roll()
+        roulette = RouletteSelector(items=[True, False], verbose=verbose)
+        roulette.set_chance(True, self.success_odds[option])
+        success = roulette.roll(rng)
 
         encounter_log = ["\t" + description]
         if success:
             encounter_log.append(
-                "\t" + self.success_texts[ans].format(name=quest_taker.name)
+                "\t" + self.success_texts[option].format(name=quest_taker.name)
             )
-            for effect in self.success_effects[ans]:
+            for effect in self.success_effects[option]:
                 encounter_log.extend(["\t\t" + s for s in effect.resolve(quest_taker)])
         else:
             encounter_log.append(
-                "\t" + self.failure_texts[ans].format(name=quest_taker.name)
+                "\t" + self.failure_texts[option].format(name=quest_taker.name)
             )
-            for effect in self.failure_effects[ans]:
+            for effect in self.failure_effects[option]:
                 encounter_log.extend(["\t\t" + s for s in effect.resolve(quest_taker)])
 
-        print()
-        for line in encounter_log[1:]:
-            print(line)
-            print()
-        input('> Press Enter to continue <')
-
         return encounter_log
 
     def _handle_option_selection(self):
@@ -1,50 +1,120 @@
 import random
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
 
 from piratesim.common.assets import get_asset
+from piratesim.common.shared_assets import Table, compiled_table
 from piratesim.encounters.effects import MoraleEffect
 from piratesim.encounters.encounter import Encouter
 
 
-class EncounterManager:
-    def __init__(self) -> None:
-        self.encounter_bank = get_asset("encounters/encounters.csv")
-        self.option_columns = sorted(
-            [
-                c
-                for c in self.encounter_bank.columns
-                if c.startswith("option_") and "success" not in c and "failure" not in c
-            ]
-        )
+class EncounterRecord(NamedTuple):
+    title: str
+    description: str
+    options: tuple[str, ...]
+    success_odds: tuple[float, ...]
+    success_texts: tuple[str, ...]
+    failure_texts: tuple[str, ...]
 
-        self.odds_columns = sorted(
-            [c for c in self.encounter_bank.columns if c.endswith("success_odds")]
-        )
 
-        self.success_text_columns = sorted(
-            [c for c in self.encounter_bank.columns if c.endswith("success_text")]
-        )
+@compiled_table("encounters")
+def encounter_table() -> Table:
+    """
+    The encounter bank with the options of each encounter side by side, the
+    first `n_options` of a row are set
+    """
+    encounter_bank = get_asset("encounters/encounters.csv")
+    option_columns = sorted(
+        [
+            c
+            for c in encounter_bank.columns
+            if c.startswith("option_") and "success" not in c and "failure" not in c
+        ]
+    )
+    odds_columns = sorted(
+        [c for c in encounter_bank.columns if c.endswith("success_odds")]
+    )
+    success_text_columns = sorted(
+        [c for c in encounter_bank.columns if c.endswith("success_text")]
+    )
+    failure_text_columns = sorted(
+        [c for c in encounter_bank.columns if c.endswith("failure_text")]
+    )
+
+    rows = encounter_bank.to_dict("records")
+    n_options = [sum(pd.notna(row[c]) for c in option_columns) for row in rows]
+
+    def side_by_side(columns, fill):
+        values = []
+        for row, n in zip(rows, n_options):
+            present = [row[c] for c in columns if pd.notna(row[c])]
+            assert len(present) == n, f"Encounter {row['title']} misses options"
+            values.append(present + [fill] * (len(columns) - n))
+        return np.array(values, dtype=type(fill)).reshape(len(rows), len(columns))
+
+    return {
+        "title": np.array([row["title"] for row in rows], dtype=str),
+        "description": np.array([row["description"] for row in rows], dtype=str),
+        "n_options": np.array(n_options, dtype=int),
+        "options": side_by_side(option_columns, ""),
+        "success_odds": side_by_side(odds_columns, np.nan),
+        "success_texts": side_by_side(success_text_columns, ""),
+        "failure_texts": side_by_side(failure_text_columns, ""),
+    }
+
+
+class EncounterRecords(Sequence):
+    """The rows of an encounter_table, as EncounterRecords built on access"""
 
-        self.failure_text_columns = sorted(
-            [c for c in self.encounter_bank.columns if c.endswith("failure_text")]
+    def __init__(self, table: Table) -> None:
+        self.table = table
+
+    def __getitem__(self, i: int) -> EncounterRecord:
+        table = self.table
+        n = int(table["n_options"][i])
+        return EncounterRecord(
+            title=table["title"][i].item(),
+            description=table["description"][i].item(),
+            options=tuple(table["options"][i, :n].tolist()),
+            success_odds=tuple(table["success_odds"][i, :n].tolist()),
+            success_texts=tuple(table["success_texts"][i, :n].tolist()),
+            failure_texts=tuple(table["failure_texts"][i, :n].tolist()),
         )
 
-    def create_encounter(self):
-        """Creates a random encounter"""
-        random_index = random.randint(0, len(self.encounter_bank) - 1)
-        encounter_data = self.encounter_bank.iloc[random_index]
+    def __len__(self):
+        return len(self.table["title"])
+
+
+@lru_cache(maxsize=None)
+def compile_encounters() -> EncounterRecords:
+    """The encounter records, indexed like the rows of the encounter bank"""
+    return EncounterRecords(encounter_table())
+
 
-        options = encounter_data[self.option_columns].dropna().tolist()
-        odds = encounter_data[self.odds_columns].dropna().tolist()
-        success_texts = encounter_data[self.success_text_columns].dropna().tolist()
-        failure_texts = encounter_data[self.failure_text_columns].dropna().tolist()
+class EncounterManager:
+    def __init__(self) -> None:
+        self.encounters = compile_encounters()
+
+        # Morale effects hold no state, so every encounter can share them
+        self._success_effects = [MoraleEffect(5)]
+        self._failure_effects = [MoraleEffect(-5)]
+
+    def create_encounter(self, rng=random):
+        """Creates a random encounter"""
+        record = self.encounters[rng.randint(0, len(self.encounters) - 1)]
+        n_options = len(record.options)
 
         return Encouter(
-            title=encounter_data["title"],
-            description=encounter_data["description"],
-            options=options,
-            success_odds=odds,
-            success_texts=success_texts,
-            failure_texts=failure_texts,
-            success_effects=[[MoraleEffect(5)]] * len(options),
-            failure_effects=[[MoraleEffect(-5)]] * len(options),
+            title=record.title,
+            description=record.description,
+            options=record.options,
+            success_odds=record.success_odds,
+            success_texts=record.success_texts,
+            failure_texts=record.failure_texts,
+            success_effects=[self._success_effects] * n_options,
+            failure_effects=[self._failure_effects] * n_options,
         )
@@ -0,0 +1,99 @@
+from collections import defaultdict
+from typing import Any, Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from piratesim.common.random import LazyGenerator
+from piratesim.encounters.effects import MoraleEffect
+from piratesim.encounters.encounter import Encouter
+
+
+class EncounterOutcome(NamedTuple):
+    pirate: Any
+    title: str
+    option: int
+    success: bool
+    probability: float
+    morale_delta: int
+    text: str
+    effect_log: tuple[str, ...]
+
+    def to_log(self) -> list[str]:
+        return [f"\t{self.text}"] + [f"\t\t{s}" for s in self.effect_log]
+
+
+class EncounterResolver(LazyGenerator):
+    """
+    Resolves many encounters at once for policy-driven runs.
+
+    All success rolls of a batch come from a single vectorized draw, morale
+    changes are summed per pirate and applied once, and the results are
+    returned as `EncounterOutcome`s instead of being printed.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.reseed(seed)
+
+    @staticmethod
+    def success_probabilities(odds: np.ndarray) -> np.ndarray:
+        # Same as Encouter.resolve's roulette, where True weighs `odds` and
+        # False weighs 1, and items without a positive chance are dropped
+        return np.where(odds > 0, odds / (np.maximum(odds, 0) + 1.0), 0.0)
+
+    def resolve_batch(
+        self, batch: Iterable[tuple[Encouter, Any, int]], rolls=None
+    ) -> list[EncounterOutcome]:
+        """Resolves every encounter, with the given uniform `rolls` if any"""
+        batch = list(batch)
+        if not batch:
+            return []
+
+        odds = np.fromiter(
+            (encounter.success_odds[option] for encounter, _, option in batch),
+            dtype=float,
+            count=len(batch),
+        )
+        probabilities = self.success_probabilities(odds)
+        if rolls is None:
+            rolls = self.rng.random(len(batch))
+        successes = np.asarray(rolls) < probabilities
+
+        morale_deltas = defaultdict(int)
+        outcomes = []
+        for (encounter, pirate, option), success, probability in zip(
+            batch, successes.tolist(), probabilities.tolist()
+        ):
+            if success:
+                text = encounter.success_texts[option]
+                effects = encounter.success_effects[option]
+            else:
+                text = encounter.failure_texts[option]
+                effects = encounter.failure_effects[option]
+
+            morale_delta = 0
+            effect_log = []
+            for effect in effects:
+                if isinstance(effect, MoraleEffect):
+                    morale_delta += effect.morale_value
+                    effect_log.extend(effect.describe())
+                else:
+                    effect_log.extend(effect.resolve(pirate))
+            morale_deltas[pirate] += morale_delta
+
+            outcomes.append(
+                EncounterOutcome(
+                    pirate=pirate,
+                    title=encounter.title,
+                    option=option,
+                    success=success,
+                    probability=probability,
+                    morale_delta=morale_delta,
+                    text=text.format(name=pirate.name),
+                    effect_log=tuple(effect_log),
+                )
+            )
+
+        for pirate, morale_delta in morale_deltas.items():
+            pirate.morale += morale_delta
+
+        return outcomes
@@ -1,14 +1,30 @@
 import random
 
 from piratesim.single_run import SingleRun
-from piratesim.artifact import Artifact
-from piratesim.common.assets import get_asset
-from piratesim.common.random import get_seed
+from piratesim.artifact import Artifact, artifact_table
+from piratesim.common.random import RandomStreams, get_seed
+from piratesim.common.shared_assets import TableRows
 from piratesim.common.utils import clear_terminal
-from piratesim.pirate import load_pirate_bank
+from piratesim.decisions import (
+    ArtifactDecision,
+    Notice,
+    PirateSelectionDecision,
+    answer_in_terminal,
+    drive,
+)
+from piratesim.pirate import PirateRoster, load_pirate_bank
+from piratesim.world_map import ProceduralWorldMap
 
 
 class Game:
+    """
+    With `common_random_numbers` the game and its runs draw from RandomStreams
+    of the seed, and the global generator is left alone, so many games can be
+    played at once in one process (see host/server.py). With `procedural_map`
+    runs sail an unbounded ProceduralWorldMap of the seed instead of the
+    compass map.
+    """
+
     def __init__(
         self,
         max_pirates_per_run=2,
@@ -17,21 +33,33 @@ class Game:
         seed=None,
         random_encounter_chance=1.0,
         debug=True,
+        common_random_numbers=False,
+        procedural_map=False,
     ) -> None:
         self.runs = []
         self.max_pirates_per_run = max_pirates_per_run
         self.random_encounter_chance = random_encounter_chance
         self.n_quests = n_quests
         self.gold = starting_gold
-
-        self.pirate_bank = load_pirate_bank()
+        self.procedural_map = procedural_map
 
         self._debug = debug
         self._seed = seed if seed else get_seed()
-        random.seed(self._seed)
+        self.streams = None
+        if common_random_numbers:
+            self.streams = RandomStreams(self._seed)
+            rng = self.streams.stream("pirate_bank")
+        else:
+            random.seed(self._seed)
+            rng = random
+
+        self.pirate_bank = load_pirate_bank(rng)
 
         # Starting pirates
-        self.pirates = [p for p in self.pirate_bank if p.level == 0]
+        self.roster = PirateRoster(
+            self.pirate_bank, unlocked=[p for p in self.pirate_bank if p.level == 0]
+        )
+        self.pirates = self.roster.unlocked
 
         # Starting artifacts
         self.artifacts = [
@@ -42,34 +70,92 @@ class Game:
                 combat_modifier=row['combat_modifier'],
                 trickyness_modifier=row['trickyness_modifier'],
                 )
-            for _, row in get_asset("artifacts/artifacts.csv").iterrows()
+            for row in TableRows(artifact_table())
         ]
 
-    def launch_run(self, selected_pirates):
-        run = SingleRun(
+    def create_run(
+        self,
+        selected_pirates,
+        policy=None,
+        observers=(),
+        streams=None,
+        assignment_mode="sequential",
+    ):
+        world_map = None
+        if self.procedural_map:
+            world_map = ProceduralWorldMap(seed=self._seed)
+        return SingleRun(
             selected_pirates,
             gold=self.gold,
             n_quests=self.n_quests,
             unlocked_pirates=self.pirates,
+            roster=self.roster,
             random_encounter_chance=self.random_encounter_chance,
             seed=self._seed,
             debug=self._debug,
+            policy=policy,
+            observers=observers,
+            world_map=world_map,
+            streams=streams if streams is not None else self.streams,
+            assignment_mode=assignment_mode,
         )
+
+    def launch_run(self, selected_pirates):
+        run = self.create_run(selected_pirates)
         self.runs.append(run)
         run.run()
+        self._finish_run(run)
 
+    def _finish_run(self, run):
         self.gold = run.gold
         for pirate in run.pirates:
             if pirate.artifact:
                 self.artifacts.append(pirate.artifact)
                 pirate.unequip_artifact()
 
-            if pirate not in self.pirates:
-                self.pirates.append(pirate)
+            self.roster.unlock(pirate)
 
-    def main_menu(self):
+    def play(self, max_runs=None):
+        """
+        Main menu loop, yielding whenever the player has to decide something.
+        Runs launched from here bubble their own decisions up the same way.
+        """
         selected_pirates = []
-        while True:
+        while max_runs is None or len(self.runs) < max_runs:
+            ans = yield PirateSelectionDecision(
+                self, self.pirates, selected_pirates, self.max_pirates_per_run
+            )
+
+            if ans != 0:
+                selected_pirate = self.pirates[ans - 1]
+                if selected_pirate in selected_pirates:
+                    selected_pirates.remove(selected_pirate)
+                else:
+                    selected_pirates.append(selected_pirate)
+                continue
+
+            error = self._validate_pirate_selection(selected_pirates)
+            if error:
+                yield Notice(self, [error])
+                continue
+
+            for pirate in selected_pirates:
+                ans = yield ArtifactDecision(
+                    self, pirate, self.artifacts, selected_pirates
+                )
+                if ans != 0:
+                    art = self.artifacts[ans - 1]
+                    pirate.equip_artifact(art)
+                    self.artifacts.remove(art)
+
+            run = self.create_run(selected_pirates)
+            self.runs.append(run)
+            yield from run.play()
+            self._finish_run(run)
+            selected_pirates = []
+
+    def answer_interactively(self, decision):
+        if isinstance(decision, PirateSelectionDecision):
             clear_terminal()
             print(
                 f"-- 🔄 RUNS {len(self.runs)} | 💰 GOLD {self.gold}  | 🌱 SEED"
@@ -80,41 +166,26 @@ class Game:
             print("0) Next")
             for i, pirate in enumerate(self.pirates):
                 print(
-                    f'{i + 1}) [{"x" if pirate in selected_pirates else " "}]', pirate
+                    f'{i + 1}) [{"x" if pirate in decision.selected else " "}]',
+                    pirate,
                 )
 
-            ans = self._handle_pirate_selection()
-
-            if ans != 0:
-                selected_pirate = self.pirates[ans - 1]
-                if selected_pirate in selected_pirates:
-                    selected_pirates.remove(selected_pirate)
-                else:
-                    selected_pirates.append(selected_pirate)
-
-            elif self._validate_pirate_selection(selected_pirates):
-                self._handle_artifact_equipping(selected_pirates)
-                self.launch_run(selected_pirates)
-                selected_pirates = []
+            return self._handle_pirate_selection()
 
-    def _handle_artifact_equipping(self, selected_pirates):
-        for pirate in selected_pirates:
+        if isinstance(decision, ArtifactDecision):
             clear_terminal()
 
             print("-- SELECTED PIRATES --")
-            [print(pirate) for pirate in selected_pirates]
+            [print(pirate) for pirate in decision.crew]
 
             print("\n-- YOUR ARTIFACTS --")
             print("0) None")
             for i, artifact in enumerate(self.artifacts):
                 print(f'{i + 1}) "{artifact.name}" {artifact.description}')
 
-            ans = self._handle_artifact_selection(pirate)
+            return self._handle_artifact_selection(decision.pirate)
 
-            if ans != 0:
-                art = self.artifacts[ans - 1]
-                pirate.equip_artifact(art)
-                self.artifacts.remove(art)
+        raise TypeError(f"{type(decision).__name__} is not asked by the game")
 
     def _handle_artifact_selection(self, pirate):
         ans = input(f"\n⚙️  Select an artifact for {pirate.name}: ")
@@ -133,16 +204,12 @@ class Game:
 
     def _validate_pirate_selection(self, selected_pirates):
         if len(selected_pirates) == 0:
-            print("> You must select at least 1 pirate!")
-            input("Press Enter to continue...")
-            return False
+            return "> You must select at least 1 pirate!"
 
         elif len(selected_pirates) > self.max_pirates_per_run:
-            print(f"> Only {self.max_pirates_per_run} pirates allowed!")
-            input("Press Enter to continue...")
-            return False
+            return f"> Only {self.max_pirates_per_run} pirates allowed!"
 
-        return True
+        return None
 
     def _handle_pirate_selection(self):
         ans = input(f"\n📢  Select up to {self.max_pirates_per_run} pirates: ")
@@ -159,5 +226,4 @@ class Game:
         return ans
 
     def run(self):
-        while True:
-            self.main_menu()
\ No newline at end of file
+        drive(self.play(), answer_in_terminal)
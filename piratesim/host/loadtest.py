@@ -0,0 +1,147 @@
+"""
+Load test for the session host.
+
+By default the host runs in this process (so its CPU time can be measured) and
+a number of scripted players connect to it concurrently, answering every
+decision at random. Reports sessions per core and decision latency percentiles.
+
+    python -m piratesim.host.loadtest --sessions 200 --concurrency 50
+    python -m piratesim.host.loadtest --connect /tmp/piratesim.sock
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from piratesim.host.server import SessionHost
+
+
+def choose(message: dict, rng: random.Random) -> int:
+    kind = message["kind"]
+    options = message["options"]
+
+    if kind == "select_pirate":
+        unselected = [i for i, o in enumerate(options) if o.startswith("[ ]")]
+        selected = len(options) - 1 - len(unselected)
+        if selected < message["max_pirates"] and unselected:
+            return rng.choice(unselected)
+        return 0
+    if kind == "pin_quest":
+        if len(options) > 1 and rng.random() < 0.5:
+            return rng.randrange(1, len(options))
+        return 0
+    if kind == "bounty":
+        return rng.choice([0, 10, 20, 50, 100])
+    if kind == "encounter":
+        return rng.randrange(len(options))
+    return 0
+
+
+async def play_session(socket_path: str, seed: int, latencies: list[float]):
+    rng = random.Random(seed)
+    # The game over notice carries the whole turn log
+    reader, writer = await asyncio.open_unix_connection(socket_path, limit=2**22)
+    answered_at = None
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return False
+
+            message = json.loads(line)
+            if message["type"] in ("decision", "end") and answered_at is not None:
+                latencies.append(time.perf_counter() - answered_at)
+                answered_at = None
+
+            if message["type"] == "end":
+                return True
+            if message["type"] == "decision":
+                writer.write(json.dumps({"choice": choose(message, rng)}).encode())
+                writer.write(b"\n")
+                await writer.drain()
+                answered_at = time.perf_counter()
+    finally:
+        writer.close()
+
+
+async def load_test(socket_path, n_sessions, concurrency, host=None):
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(seed):
+        async with semaphore:
+            return await play_session(socket_path, seed, latencies)
+
+    server = await host.start(socket_path) if host else None
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    results = await asyncio.gather(*(bounded(seed) for seed in range(n_sessions)))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    if server:
+        server.close()
+        await server.wait_closed()
+
+    completed = sum(results)
+    report = {
+        "sessions": completed,
+        "concurrency": concurrency,
+        "wall_s": wall,
+        "sessions_per_s": completed / wall,
+        "decisions": len(latencies),
+    }
+    if host:
+        # The host is a single event loop, so its CPU seconds are core seconds
+        report["cpu_s"] = cpu
+        report["sessions_per_core_s"] = completed / cpu if cpu else float("inf")
+    else:
+        report["sessions_per_s_per_core"] = completed / wall / (os.cpu_count() or 1)
+
+    if latencies:
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1e3
+        report.update(
+            latency_p50_ms=p50,
+            latency_p90_ms=p90,
+            latency_p99_ms=p99,
+            latency_max_ms=max(latencies) * 1e3,
+        )
+    return report
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Load test the piratesim session host")
+    ap.add_argument("--sessions", type=int, default=100)
+    ap.add_argument("--concurrency", type=int, default=25)
+    ap.add_argument("--runs-per-session", type=int, default=1)
+    ap.add_argument(
+        "--connect", type=str, required=False, help="Socket of an external host"
+    )
+    args = ap.parse_args(argv)
+
+    if args.connect:
+        report = asyncio.run(load_test(args.connect, args.sessions, args.concurrency))
+    else:
+        host = SessionHost(max_runs=args.runs_per_session)
+        with tempfile.TemporaryDirectory() as tmp:
+            socket_path = str(Path(tmp) / "piratesim.sock")
+            report = asyncio.run(
+                load_test(socket_path, args.sessions, args.concurrency, host)
+            )
+
+    for key, value in report.items():
+        if isinstance(value, float):
+            value = f"{value:.3f}"
+        print(f"{key:<24} {value}")
+
+
+if __name__ == "__main__":
+    main()
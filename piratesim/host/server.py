@@ -0,0 +1,168 @@
+"""
+Hosts many concurrent games in one process behind a local Unix socket.
+
+Every connection gets its own `Game` whose decision generator (`Game.play`) is
+advanced one step at a time: the session sends the pending decision as a JSON
+line and awaits the player's answer, so no session ever blocks the others.
+
+Protocol (one JSON object per line):
+    server -> client  {"type": "decision", "kind": ..., "options": [...], ...}
+                      {"type": "notice", "lines": [...]}
+                      {"type": "error", "message": ...}
+                      {"type": "end"}
+    client -> server  {"choice": <int>}
+
+    python -m piratesim.host.server --socket /tmp/piratesim.sock
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+from typing import Optional
+
+from piratesim.common.assets import preload_assets
+from piratesim.decisions import (
+    BountyDecision,
+    Decision,
+    EncounterDecision,
+    Notice,
+    PirateSelectionDecision,
+)
+from piratesim.game import Game
+
+
+def decision_message(decision: Decision) -> dict:
+    message = {
+        "type": "decision",
+        "kind": decision.kind,
+        "prompt": type(decision).__doc__,
+        "options": decision.options(),
+    }
+
+    source = decision.source
+    if hasattr(source, "turn"):
+        message["state"] = {
+            "turn": source.turn,
+            "gold": source.gold,
+            "notoriety": source.notoriety,
+            "max_notoriety": source.max_notoriety,
+        }
+    if isinstance(decision, PirateSelectionDecision):
+        message["max_pirates"] = decision.max_pirates
+    elif isinstance(decision, BountyDecision):
+        message["quest"] = str(decision.quest)
+    elif isinstance(decision, EncounterDecision):
+        message["title"] = decision.encounter.title
+        message["description"] = decision.encounter.description.format(
+            name=decision.pirate.name
+        )
+    return message
+
+
+class Session:
+    """A single game played over one connection"""
+
+    def __init__(self, session_id: int, game: Game, max_runs: Optional[int]) -> None:
+        self.session_id = session_id
+        self.game = game
+        self.steps = game.play(max_runs)
+        self.decisions = 0
+
+    async def run(self, reader, writer):
+        try:
+            decision = next(self.steps)
+            while True:
+                if isinstance(decision, Notice):
+                    await self._send(
+                        writer, {"type": "notice", "lines": decision.lines}
+                    )
+                    answer = None
+                else:
+                    answer = await self._ask(reader, writer, decision)
+                    self.decisions += 1
+
+                decision = self.steps.send(answer)
+        except StopIteration:
+            await self._send(writer, {"type": "end"})
+        finally:
+            self.steps.close()
+
+    async def _ask(self, reader, writer, decision):
+        await self._send(writer, decision_message(decision))
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionResetError("Player left the session")
+
+            try:
+                return decision.parse(json.loads(line)["choice"])
+            except (ValueError, KeyError, TypeError) as e:
+                await self._send(writer, {"type": "error", "message": str(e)})
+
+    @staticmethod
+    async def _send(writer, message):
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+
+
+class SessionHost:
+    def __init__(self, max_runs: Optional[int] = None, **game_kwargs) -> None:
+        self.max_runs = max_runs
+        self.game_kwargs = game_kwargs
+        self.sessions: dict[int, Session] = {}
+        self.completed_sessions = 0
+        self._ids = itertools.count(1)
+
+        # Asset tables and pirate prototypes are parsed once and shared by
+        # every session hosted by this process
+        preload_assets()
+
+    def new_session(self) -> Session:
+        # Every session rolls on its own streams, sessions never reseed or
+        # draw from a generator another one is using
+        game = Game(debug=False, common_random_numbers=True, **self.game_kwargs)
+        session = Session(next(self._ids), game, self.max_runs)
+        self.sessions[session.session_id] = session
+        return session
+
+    async def handle_connection(self, reader, writer):
+        session = self.new_session()
+        try:
+            await session.run(reader, writer)
+            self.completed_sessions += 1
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            # A broken game only takes down its own session
+            writer.write(json.dumps({"type": "error", "message": repr(e)}).encode())
+            writer.write(b"\n")
+        finally:
+            self.sessions.pop(session.session_id, None)
+            writer.close()
+
+    async def start(self, socket_path: str):
+        return await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+
+    async def serve_forever(self, socket_path: str):
+        server = await self.start(socket_path)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Host concurrent piratesim sessions")
+    ap.add_argument("--socket", type=str, default="/tmp/piratesim.sock")
+    ap.add_argument("--max-runs", type=int, required=False)
+    ap.add_argument("--quests", type=int, default=2)
+    ap.add_argument("--gold", type=int, default=500)
+    args = ap.parse_args(argv)
+
+    host = SessionHost(
+        max_runs=args.max_runs, n_quests=args.quests, starting_gold=args.gold
+    )
+    asyncio.run(host.serve_forever(args.socket))
+
+
+if __name__ == "__main__":
+    main()
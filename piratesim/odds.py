@@ -0,0 +1,249 @@
+"""
+Exact quest success odds.
+
+A quest's outcome is a roulette between success, weighing `w`, and failure,
+weighing 1, so the success probability is w / (w + 1) (and 0 when w <= 0).
+The weight is the base odds adjusted by morale, then by the pirate's trait,
+then multiplied by the compounding bonus of the relevant stat over the
+quest's difficulty. Impulsive pirates add uniform noise to the trait step,
+which is integrated analytically.
+
+`OddsSurface` tabulates those odds once, so displays can look them up per
+pirate and quest instead of solving them on every redraw. Pirates the table
+doesn't cover have their odds solved as above.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from piratesim.quests.quest import Quest, QuestType
+from piratesim.selection import QuestBoard, QuestSelector
+from piratesim.trait import TRAITS
+
+# Base success weight against a failure weight of 1, i.e. 66%
+BASE_SUCCESS_WEIGHT = 2.0
+# Compounding bonus per stat point above the quest difficulty
+STAT_BONUS = 0.10
+
+STATS = ("navigation", "combat", "trickyness")
+RELEVANT_STAT = {
+    QuestType.rescue: "trickyness",
+    QuestType.treasure: "trickyness",
+    QuestType.smuggling: "trickyness",
+    QuestType.theft: "trickyness",
+    QuestType.exploration: "navigation",
+    QuestType.delivery: "navigation",
+    QuestType.fetch: "navigation",
+    QuestType.combat: "combat",
+    QuestType.escort: "combat",
+}
+
+# Axes of the OddsSurface, every whole morale and stat surplus up to these
+MAX_MORALE = 100
+MAX_STAT_SURPLUS = 10
+
+# Column of STATS relevant for each QuestType value, -1 when none is
+_STAT_BY_QTYPE = np.full(max(qtype.value for qtype in QuestType) + 1, -1)
+for _qtype, _stat in RELEVANT_STAT.items():
+    _STAT_BY_QTYPE[_qtype.value] = STATS.index(_stat)
+
+
+def morale_weight(morale):
+    """The success weight before the trait and stat modifiers"""
+    return BASE_SUCCESS_WEIGHT + (np.asarray(morale, dtype=float) - 40) / 100
+
+
+def stat_multiplier(stat_diff):
+    return 1 + np.maximum(np.asarray(stat_diff, dtype=float), 0) * STAT_BONUS
+
+
+def weight_probability(weight, multiplier=1.0, noise=0.0):
+    """
+    P(success) for a pre stat `weight` scaled by the stat `multiplier`, where
+    the weight is uniformly spread by +-`noise` (all arguments broadcast)
+    """
+    weight, multiplier, noise = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (weight, multiplier, noise))
+    )
+    scaled = np.maximum(weight * multiplier, 0.0)
+    exact = scaled / (scaled + 1)
+
+    # E[g(k X)] with X ~ U(w - h, w + h) and g(y) = y / (y + 1) for y > 0
+    low = np.maximum(weight - noise, 0.0)
+    high = np.maximum(weight + noise, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        integral = (high - low) - (
+            np.log1p(multiplier * high) - np.log1p(multiplier * low)
+        ) / multiplier
+        spread = integral / (2 * noise)
+
+    return np.where(noise > 0, spread, exact)
+
+
+def success_probabilities(pirates, quests: Sequence[Quest]) -> np.ndarray:
+    """P(success) of every pirate (rows) on every quest (columns)"""
+    board = quests if isinstance(quests, QuestBoard) else QuestBoard(quests)
+    stats = np.array(
+        [[getattr(p, stat) for stat in STATS] for p in pirates], dtype=float
+    ).reshape(len(pirates), len(STATS))
+
+    return stat_probabilities(
+        morale=[p.morale for p in pirates],
+        stats=stats,
+        trait_ids=[p.trait.trait_id for p in pirates],
+        board=board,
+    )
+
+
+def stat_probabilities(morale, stats, trait_ids, board: QuestBoard) -> np.ndarray:
+    """
+    P(success) on every quest of the board for pirates given by their morale,
+    their STATS (one row each) and trait ids, e.g. archetypes that aren't
+    actual Pirates
+    """
+    morale = np.asarray(morale, dtype=float)
+    stats = np.asarray(stats, dtype=float)
+    trait_ids = np.asarray(trait_ids, dtype=int)
+
+    stat_column = _STAT_BY_QTYPE[board.qtype]
+    relevant = np.where(stat_column >= 0, stats[:, np.maximum(stat_column, 0)], 0.0)
+    multiplier = stat_multiplier(relevant - board.difficulty)
+
+    modifier = np.zeros((len(trait_ids), len(board)))
+    multiplicative = np.zeros((len(trait_ids), len(board)), dtype=bool)
+    noise = np.zeros((len(trait_ids), 1))
+    for trait_id in np.unique(trait_ids).tolist():
+        rows = np.flatnonzero(trait_ids == trait_id)
+        trait = TRAITS[trait_id]
+        modifier[rows], multiplicative[rows] = trait.resolution_arrays(board)
+        noise[rows] = trait.resolution_noise
+
+    base = morale_weight(morale)[:, None]
+    weight = np.where(multiplicative, base * modifier, base + modifier)
+    probabilities = weight_probability(weight, multiplier, noise)
+
+    # Idling always succeeds
+    return np.where(board.qtype == QuestType.idle.value, 1.0, probabilities)
+
+
+def success_probability(pirate, quest: Quest) -> float:
+    """P(success) of a pirate on a quest, without rolling for it"""
+    return float(success_probabilities([pirate], [quest])[0, 0])
+
+
+class OddsSurface:
+    """
+    Success odds tabulated by (trait id, whether the quest matches the trait's
+    resolution_mask, stat surplus over the difficulty, morale). The quest
+    type only matters through the relevant stat and the trait's mask, so
+    looking up a pirate x quest cell is O(1) once those are known. Pirates
+    with a fractional or out of range morale or surplus on some quest get
+    the exact stat_probabilities instead.
+    """
+
+    def __init__(self) -> None:
+        self.morale = np.arange(MAX_MORALE + 1)
+        self.surplus = np.arange(MAX_STAT_SURPLUS + 1)
+        base = morale_weight(self.morale)[None, :]
+        multiplier = stat_multiplier(self.surplus)[:, None]
+
+        self.table = np.empty((len(TRAITS), 2, len(self.surplus), len(self.morale)))
+        for trait in TRAITS:
+            # The first resolution modifier is for quests matching the mask
+            for match, (modifier, multiplicative) in zip(
+                (1, 0), trait.resolution_modifiers
+            ):
+                weight = base * modifier if multiplicative else base + modifier
+                self.table[trait.trait_id, match] = weight_probability(
+                    weight, multiplier, trait.resolution_noise
+                )
+
+    def success_odds(self, pirates, quests) -> np.ndarray:
+        """Looked up P(success) of every pirate (rows) on every quest (columns)"""
+        board = quests if isinstance(quests, QuestBoard) else QuestBoard(quests)
+        trait_ids = np.array([p.trait.trait_id for p in pirates], dtype=int)
+        stats = np.array(
+            [[getattr(p, stat) for stat in STATS] for p in pirates], dtype=float
+        ).reshape(len(pirates), len(STATS))
+
+        stat_column = _STAT_BY_QTYPE[board.qtype]
+        relevant = np.where(stat_column >= 0, stats[:, np.maximum(stat_column, 0)], 0.0)
+        # Deficits all weigh like no surplus
+        surplus = np.maximum(relevant - board.difficulty, 0)
+
+        match = np.zeros((len(pirates), len(board)), dtype=int)
+        for trait_id in np.unique(trait_ids).tolist():
+            rows = np.flatnonzero(trait_ids == trait_id)
+            match[rows] = TRAITS[trait_id].resolution_mask(board)
+
+        morale = np.array([p.morale for p in pirates], dtype=float)
+        whole_morale = (morale == np.round(morale)) & (morale >= 0)
+        whole_surplus = (surplus == np.round(surplus)) & (surplus <= MAX_STAT_SURPLUS)
+        tabulated = whole_morale & (morale <= MAX_MORALE) & whole_surplus.all(axis=1)
+
+        odds = np.empty((len(pirates), len(board)))
+        rows = np.flatnonzero(tabulated)
+        odds[rows] = self.table[
+            trait_ids[rows, None],
+            match[rows],
+            surplus[rows].astype(int),
+            morale[rows].astype(int)[:, None],
+        ]
+        rows = np.flatnonzero(~tabulated)
+        if len(rows):
+            odds[rows] = stat_probabilities(
+                morale[rows], stats[rows], trait_ids[rows], board
+            )
+        return np.where(board.qtype == QuestType.idle.value, 1.0, odds)
+
+    @staticmethod
+    def selection_odds(pirates, quests) -> np.ndarray:
+        """
+        Chance of each pirate (rows) picking each quest (columns) if they were
+        the only one picking, their idle quest taking the rest. Idling is
+        weighed as the easiest idle quest, and impulsive pirates' whims come
+        from a fixed seed so the odds don't flicker between redraws.
+        """
+        board = quests if isinstance(quests, QuestBoard) else QuestBoard(quests)
+        idle_board = QuestBoard.from_columns(
+            np.ones(len(pirates)), 0, 0, QuestType.idle.value, False
+        )
+        chances, idle_chances, _ = QuestSelector(seed=0).weights(
+            pirates, board, idle_board
+        )
+        chances = np.maximum(chances, 0.0)
+        totals = chances.sum(axis=1) + np.maximum(idle_chances, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(totals[:, None] > 0, chances / totals[:, None], 0.0)
+
+
+_surface: Optional[OddsSurface] = None
+_surface_version = None
+
+
+def surface_version() -> tuple:
+    """What the odds surface is built from: the odds constants and traits"""
+    traits = tuple(
+        (type(t).__name__, t.resolution_modifiers, t.resolution_noise) for t in TRAITS
+    )
+    return BASE_SUCCESS_WEIGHT, STAT_BONUS, traits
+
+
+def odds_surface(check: bool = False) -> OddsSurface:
+    """
+    The OddsSurface. With `check` it's rebuilt if the traits changed since it
+    was built, which callers do once per turn rather than on every redraw.
+    """
+    global _surface, _surface_version
+    if _surface is None or check:
+        version = surface_version()
+        if _surface is None or version != _surface_version:
+            _surface, _surface_version = OddsSurface(), version
+    return _surface
+
+
+def invalidate_odds_surface() -> None:
+    """Drops the OddsSurface so the next odds_surface() builds a fresh one"""
+    global _surface
+    _surface = None
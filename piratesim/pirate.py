@@ -1,24 +1,49 @@
 import random
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import numpy as np
 
 from piratesim.common.assets import get_asset
 from piratesim.common.random import RouletteSelector
+from piratesim.common.shared_assets import (
+    Table,
+    TableRows,
+    compiled_table,
+    table_from_frame,
+)
+from piratesim.common.utils import shallow_copy
+from piratesim.odds import success_probability
 from piratesim.quests.quest import QuestType
 from piratesim.quests.quest_factory import QuestFactory
-from piratesim.trait import BaseTrait, TraitFactory
+from piratesim.selection import QuestBoard
+from piratesim.trait import BaseTrait, TraitFactory, minimum_bounty
 
 
 class Pirate:
-    def __init__(self, name, description, trait, navigation, combat, trickyness, level):
+    def __init__(
+        self,
+        name,
+        description,
+        trait,
+        navigation,
+        combat,
+        trickyness,
+        level,
+        rng=random,
+    ):
         self.name: str = name
         self.description: str = description
         self.trait: BaseTrait = trait
         self.navigation: int = navigation
         self.combat: int = combat
         self.trickyness: int = trickyness
-        self.gold: int = random.randint(5, 15) * 10
+        self.gold: int = rng.randint(5, 15) * 10
         self.level: int = level
         self.morale: int = 50
-        self.flavor: str = random.choice(
+        # Position in the game's PirateRoster
+        self.pirate_id: Optional[int] = None
+        self.flavor: str = rng.choice(
             [
                 "buccaneer",
                 "scallywag",
@@ -37,18 +62,31 @@ class Pirate:
             "figured this island would be a good place to find work.",
             "had a terrible accident with a fish and a potato once.",
         ]
-        self.captains_log = [f"{self.name} {random.choice(potential_openers)}"]
+        self.captains_log = [f"{self.name} {rng.choice(potential_openers)}"]
 
         self.current_quest = None
 
-        self.idle_quest_bank = self.generate_idle_quests()
+        self.idle_quest_bank = self.generate_idle_quests(rng)
 
-    def generate_idle_quests(self):
+    def generate_idle_quests(self, rng=random):
         quests = []
-        for _, row in get_asset("quests/idle_quests.csv").iterrows():
-            quests.append(QuestFactory().from_dict(row.to_dict()))
+        for template in _idle_quest_templates():
+            quests.append(QuestFactory().from_dict(template, rng=rng))
         return quests
 
+    def clone(self, memo: dict) -> "Pirate":
+        """
+        A copy of the pirate for a cloned run, see SingleRun.clone. The idle
+        quest bank is shared since it is replaced rather than changed.
+        """
+        clone = memo.get(id(self))
+        if clone is None:
+            clone = memo[id(self)] = shallow_copy(self)
+            clone.captains_log = list(self.captains_log)
+            if self.current_quest is not None:
+                clone.current_quest = self.current_quest.clone(memo)
+        return clone
+
     def equip_artifact(self, artifact):
         self.artifact = artifact
         artifact.on_equip(self)
@@ -61,7 +99,7 @@ class Pirate:
         self.artifact = None
 
     @classmethod
-    def from_dict(cls, pirate_dict):
+    def from_dict(cls, pirate_dict, rng=random):
         return cls(
             name=pirate_dict["name"],
             description=pirate_dict["description"],
@@ -70,16 +108,16 @@ class Pirate:
             combat=pirate_dict["combat"],
             trickyness=pirate_dict["trickyness"],
             level=pirate_dict["level"],
+            rng=rng,
         )
 
     @property
     def minimum_bounty(self):
-        thresh = 10
-        return thresh + self.trait.apply_to_minimum_bounty()
+        return minimum_bounty(self.trait.trait_id)
 
-    def get_random_idle_quest(self):
-        self.idle_quest_bank = self.generate_idle_quests()
-        return random.choice(self.idle_quest_bank)
+    def get_random_idle_quest(self, rng=random):
+        self.idle_quest_bank = self.generate_idle_quests(rng)
+        return rng.choice(self.idle_quest_bank)
 
     def assign_quest(self, quest):
         if self.current_quest:
@@ -88,21 +126,57 @@ class Pirate:
                 f' "{quest.name}"'
             )
         self.current_quest = quest
+        quest.on_selected(self)
 
-    def select_quest(self, quests, allow_idle=True):
+    def select_quest(self, quests, allow_idle=True, rng=random):
         """Selects a quest based on the pirate's traits."""
         if not quests:
-            return self.get_random_idle_quest()
+            return self.get_random_idle_quest(rng)
+
+        idle_quest = self.get_random_idle_quest(rng) if allow_idle else None
+        roulette = self.selection_roulette(quests, idle_quest, rng)
+        selected_quest = roulette.roll(rng)
+
+        if selected_quest.qtype == QuestType.idle:
+            self.captains_log.append(
+                f'Took some time for myself to go "{selected_quest.name}"'
+            )
+        elif selected_quest is roulette.get_most_likely():
+            self.captains_log.append(
+                f'My crew will love to go "{selected_quest.name}"!'
+            )
+        else:
+            self.captains_log.append(
+                "I'd normally prefer other stuff, but let's try to go"
+                f' "{selected_quest.name}"'
+            )
+
+        return selected_quest
 
+    def selection_roulette(
+        self, quests, idle_quest=None, rng=random
+    ) -> RouletteSelector:
+        """
+        The roulette select_quest rolls, see selection.QuestSelector. Whims of
+        traits with selection_noise are drawn with `rng`.
+        """
         roulette = RouletteSelector(quests)
 
-        if allow_idle:
+        if idle_quest is not None:
             # There's a chance the pirate will just idle
-            roulette.add_item(self.get_random_idle_quest(), 0.5)
-
-        modifier_dict = self.trait.apply_to_quest_selection(roulette.get_items())
-        for quest, modifier in modifier_dict.items():
-            roulette.apply_modifier(quest, *modifier)
+            roulette.add_item(idle_quest, 0.5)
+
+        items = roulette.get_items()
+        noise = 0.0
+        if self.trait.selection_noise is not None:
+            noise = np.array([rng.uniform(*self.trait.selection_noise) for _ in items])
+        chances = self.trait.apply_to_board(
+            np.array([roulette.roulette[item] for item in items]),
+            QuestBoard(items),
+            noise,
+        )
+        for item, chance in zip(items, chances.tolist()):
+            roulette.set_chance(item, chance)
 
         # Bounty influence on quest selection (TODO Extract to trait class)
         for quest in quests:
@@ -116,23 +190,11 @@ class Pirate:
                 )
                 roulette.set_chance(quest, 0.0)
 
-        selected_quest = roulette.roll()
-
-        if selected_quest.qtype == QuestType.idle:
-            self.captains_log.append(
-                f'Took some time for myself to go "{selected_quest.name}"'
-            )
-        elif selected_quest is roulette.get_most_likely():
-            self.captains_log.append(
-                f'My crew will love to go "{selected_quest.name}"!'
-            )
-        else:
-            self.captains_log.append(
-                "I'd normally prefer other stuff, but let's try to go"
-                f' "{selected_quest.name}"'
-            )
+        return roulette
 
-        return selected_quest
+    def success_probability(self, quest) -> float:
+        """The exact chance of succeeding at a quest, without rolling for it"""
+        return success_probability(self, quest)
 
     @property
     def on_a_quest(self):
@@ -141,10 +203,10 @@ class Pirate:
         else:
             return False
 
-    def progress_quest(self):
+    def progress_quest(self, rng=random):
         """
-        Progress a quest for one turn, and roll for success if it's voyage
-        length has been concluded.
+        Progress a quest for one turn, and roll for success (with `rng`) if it's
+        voyage length has been concluded.
         Returns:
          - None if the quest is still in progress.
          - A boolean indicating quest success if concluded.
@@ -163,36 +225,9 @@ class Pirate:
             if self.current_quest.qtype is QuestType.idle:
                 return True, self.current_quest.success_effects
 
-            roulette = RouletteSelector([True, False])
-            roulette.set_chance(True, 2.0)  # Base success chance is 66%
-
-            # Morale modifier
-            roulette.apply_modifier(True, (self.morale - 40) / 100)
-
-            modifier = self.trait.apply_to_quest_resolution(self.current_quest)
-            roulette.apply_modifier(True, *modifier)
-
-            # Modify based on stats (assuming the quest has a primary relevant stat)
-            relevant_stat = {
-                QuestType.rescue: self.trickyness,
-                QuestType.treasure: self.trickyness,
-                QuestType.smuggling: self.trickyness,
-                QuestType.theft: self.trickyness,
-                QuestType.exploration: self.navigation,
-                QuestType.delivery: self.navigation,
-                QuestType.fetch: self.navigation,
-                QuestType.combat: self.combat,
-                QuestType.escort: self.combat,
-            }.get(self.current_quest.qtype, 0)
-
-            # Each stat point above quest difficulty gives a
-            # compouding 10% bonus to odds
-            diff = max(0, relevant_stat - self.current_quest.difficulty)
-            roulette.apply_modifier(True, 1 + (diff * 0.10), True)
-
-            # NOTE DEBUG ONLY
-            p = roulette.get_probabilities()[True]
-            success = roulette.roll()
+            # Same as a roulette of success against failure, see odds.py
+            p = self.success_probability(self.current_quest)
+            success = rng.random() < p
             self.captains_log.append(
                 f'{"Succeeded" if success else "Failed"} the quest'
                 f' "{self.current_quest.name}" with probability {round(p * 100, 1)}%'
@@ -219,8 +254,106 @@ class Pirate:
         )
 
 
-def load_pirate_bank() -> list[Pirate]:
-    pirates = []
-    for _, row in get_asset("pirates/pirates.csv").iterrows():
-        pirates.append(Pirate.from_dict(row.to_dict()))
-    return pirates
+@compiled_table("idle_quests")
+def idle_quest_table() -> Table:
+    return table_from_frame(get_asset("quests/idle_quests.csv"))
+
+
+@compiled_table("pirates")
+def pirate_table() -> Table:
+    return table_from_frame(get_asset("pirates/pirates.csv"))
+
+
+@lru_cache(maxsize=None)
+def _idle_quest_templates() -> TableRows:
+    return TableRows(idle_quest_table())
+
+
+@lru_cache(maxsize=None)
+def _pirate_prototypes() -> TableRows:
+    # Compiled once and shared by every game in the process, each game still
+    # gets its own Pirate instances since those are mutated during runs
+    return TableRows(pirate_table())
+
+
+def load_pirate_bank(rng=random) -> list[Pirate]:
+    return [Pirate.from_dict(prototype, rng) for prototype in _pirate_prototypes()]
+
+
+class PirateRoster:
+    """
+    Every pirate of a game under a stable `pirate_id`, split into the ones
+    already sailing for the player (`unlocked`, in unlock order) and the ones
+    that can still be recruited.
+
+    Locked ids are kept in a list with their positions indexed, so a locked
+    pirate is sampled or unlocked in constant time.
+    """
+
+    def __init__(self, pirates: Iterable[Pirate], unlocked: Iterable[Pirate] = ()):
+        self.pirates: list[Pirate] = list(pirates)
+        for pirate_id, pirate in enumerate(self.pirates):
+            pirate.pirate_id = pirate_id
+
+        self.unlocked: list[Pirate] = []
+        self._locked_ids: list[int] = list(range(len(self.pirates)))
+        self._locked_positions: dict[int, int] = {i: i for i in self._locked_ids}
+        # Whether locked pirates may be shared with a clone of the roster
+        self._shares_locked = False
+
+        for pirate in unlocked:
+            self.unlock(pirate)
+
+    def __len__(self):
+        return len(self.pirates)
+
+    def __getitem__(self, pirate_id: int) -> Pirate:
+        return self.pirates[pirate_id]
+
+    @property
+    def n_locked(self) -> int:
+        return len(self._locked_ids)
+
+    def is_unlocked(self, pirate: Pirate) -> bool:
+        return pirate.pirate_id not in self._locked_positions
+
+    def unlock(self, pirate: Pirate) -> bool:
+        """Returns False if the pirate had already been unlocked"""
+        position = self._locked_positions.pop(pirate.pirate_id, None)
+        if position is None:
+            return False
+
+        # Swap with the last locked id so removing it is O(1)
+        last = self._locked_ids.pop()
+        if last != pirate.pirate_id:
+            self._locked_ids[position] = last
+            self._locked_positions[last] = position
+
+        self.unlocked.append(pirate)
+        return True
+
+    def sample_locked(self, rng=random) -> Optional[Pirate]:
+        """A uniformly chosen pirate still to be recruited, None if there's none"""
+        if not self._locked_ids:
+            return None
+        pirate_id = self._locked_ids[rng.randrange(len(self._locked_ids))]
+        if self._shares_locked:
+            # Copied on the way out, as the pirate is about to set sail
+            self.pirates[pirate_id] = self.pirates[pirate_id].clone({})
+        return self.pirates[pirate_id]
+
+    def clone(self, memo: dict) -> "PirateRoster":
+        """
+        A copy of the roster for a cloned run, see SingleRun.clone. Pirates
+        already copied in `memo` are swapped in, locked pirates aren't changed
+        until they are recruited so both rosters share them until then.
+        """
+        clone = shallow_copy(self)
+        clone.pirates = list(self.pirates)
+        clone.unlocked = [memo.get(id(p), p) for p in self.unlocked]
+        for pirate in clone.unlocked:
+            clone.pirates[pirate.pirate_id] = pirate
+        clone._locked_ids = list(self._locked_ids)
+        clone._locked_positions = dict(self._locked_positions)
+        self._shares_locked = clone._shares_locked = True
+        return clone
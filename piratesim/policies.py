@@ -0,0 +1,110 @@
+import random
+from typing import Optional
+
+import numpy as np
+
+from piratesim.decisions import (
+    ArtifactDecision,
+    BountyDecision,
+    EncounterDecision,
+    Notice,
+    PinQuestDecision,
+    PirateSelectionDecision,
+)
+from piratesim.odds import success_probabilities
+from piratesim.quests.quest import Quest
+
+
+class BasePolicy:
+    """
+    Makes the player's decisions for headless runs.
+
+    Each method mirrors one of the interactive prompts of a run, so a run
+    driven by a policy never blocks on `input()`. `decide` answers any of the
+    decisions yielded by `Game.play` and `SingleRun.play`.
+    """
+
+    def decide(self, decision):
+        if isinstance(decision, PinQuestDecision):
+            return self.select_quest_to_pin(decision.source)
+        if isinstance(decision, BountyDecision):
+            return self.select_bounty(decision.source, decision.quest)
+        if isinstance(decision, EncounterDecision):
+            return self.select_encounter_option(decision.encounter, decision.pirate)
+        if isinstance(decision, PirateSelectionDecision):
+            return self.select_pirate(decision)
+        if isinstance(decision, ArtifactDecision):
+            return 0
+        if isinstance(decision, Notice):
+            return None
+        raise TypeError(f"Unknown decision {type(decision).__name__}")
+
+    def reseed(self, seed: int):
+        """Restarts the policy's random generator, if it has one"""
+
+    @staticmethod
+    def success_odds(run, quests) -> np.ndarray:
+        """Exact P(success) of each of the run's pirates (rows) on each quest"""
+        return success_probabilities(run.pirates, quests)
+
+    def select_pirate(self, decision: PirateSelectionDecision) -> int:
+        """Picks the first pirates on the roster and starts the run"""
+        crew_size = min(decision.max_pirates, len(decision.pirates))
+        if len(decision.selected) < crew_size:
+            for i, pirate in enumerate(decision.pirates):
+                if pirate not in decision.selected:
+                    return i + 1
+        return 0
+
+    def select_quest_to_pin(self, run) -> Optional[Quest]:
+        """Returns an available quest to pin, or None to end the turn"""
+        raise NotImplementedError()
+
+    def select_bounty(self, run, quest: Quest) -> int:
+        """Returns the pirate's cut for a quest that is about to be pinned"""
+        raise NotImplementedError()
+
+    def select_encounter_option(self, encounter, pirate) -> int:
+        """Returns the (zero based) index of the chosen encounter option"""
+        raise NotImplementedError()
+
+
+class RandomPolicy(BasePolicy):
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        pin_chance: float = 0.5,
+        bounties: tuple[int, ...] = (0, 10, 20, 50, 100),
+    ) -> None:
+        # A private generator keeps the policy from shifting the game's rolls
+        self.rng = random.Random(seed)
+        self.pin_chance = pin_chance
+        self.bounties = bounties
+
+    def reseed(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def select_quest_to_pin(self, run) -> Optional[Quest]:
+        if not run.available_quests or self.rng.random() >= self.pin_chance:
+            return None
+        return self.rng.choice(run.available_quests)
+
+    def select_bounty(self, run, quest: Quest) -> int:
+        return self.rng.choice(self.bounties)
+
+    def select_encounter_option(self, encounter, pirate) -> int:
+        return self.rng.randrange(len(encounter.options))
+
+
+def _search_policy(seed: Optional[int] = None):
+    from piratesim.search import SearchPolicy
+
+    return SearchPolicy(seed)
+
+
+# Policies by the name sweeps and other tools refer to them, each is built
+# from a seed
+POLICIES = {
+    "random": RandomPolicy,
+    "search": _search_policy,
+}
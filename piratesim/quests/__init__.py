@@ -1,4 +1,17 @@
+from functools import lru_cache
+
+import pandas as pd
+
 from piratesim.common.assets import get_asset
+from piratesim.common.shared_assets import Table, compiled_table, table_from_frame
+
+
+@compiled_table("quest_bank")
+def quest_bank_table() -> Table:
+    return table_from_frame(get_asset("quests/quests.csv"))
+
 
+@lru_cache(maxsize=None)
 def load_quest_bank():
-    return get_asset("quests/quests.csv").set_index("quest_id")
\ No newline at end of file
+    # Numeric columns stay views of the (possibly shared) compiled table
+    return pd.DataFrame(quest_bank_table(), copy=False).set_index("quest_id")
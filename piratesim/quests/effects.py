@@ -1,6 +1,6 @@
 from piratesim.common.random import Deck
 from piratesim.quests.quest import Quest, QuestType
-from piratesim.quests.quest_effect import QuestEffect
+from piratesim.quests.quest_effect import EffectBinding, QuestEffect
 from piratesim.trait import TraitFactory
 
 
@@ -8,7 +8,7 @@ class RewardEffect(QuestEffect):
     def __init__(self, reward_value) -> None:
         self.reward_value = reward_value
 
-    def resolve(self, game) -> list[str]:
+    def resolve(self, game, binding: EffectBinding) -> list[str]:
         game.gold += self.reward_value
 
         quest_log = []
@@ -29,12 +29,13 @@ class IncapacitateQuestTakerEffect(QuestEffect):
         self.n_turns = n_turns
         self.quest_name = quest_name
 
-    def resolve(self, game):
+    def resolve(self, game, binding: EffectBinding):
         from piratesim.quests.quest_factory import QuestFactory
 
         quest_log = []
 
-        self.target_pirate.assign_quest(
+        rng = game._stream("pirate", binding.quest_taker.name)
+        binding.quest_taker.assign_quest(
             quest=QuestFactory().from_dict(
                 {
                     "name": self.quest_name,
@@ -43,24 +44,21 @@ class IncapacitateQuestTakerEffect(QuestEffect):
                     "difficulty_max": self.n_turns,
                     "reward_min": 0,
                     "reward_max": 0,
-                }
+                },
+                rng=rng,
             )
         )
         quest_log.append(
-            f'{self.target_pirate.name} needs some time to "{self.quest_name}"'
+            f'{binding.quest_taker.name} needs some time to "{self.quest_name}"'
             f" ({self.n_turns} turns)"
         )
         return quest_log
 
-    def on_selected(self, quest_taker):
-        self.target_pirate = quest_taker
-        return None
-
 
 class IncapacitateRandomPiratesEffect(QuestEffect):
     def __init__(
         self,
-        exclude=[],
+        exclude=(),
         n_pirates: int = 1,
         n_turns: int = 1,
         condition=None,
@@ -72,7 +70,7 @@ class IncapacitateRandomPiratesEffect(QuestEffect):
         self.n_turns = n_turns
         self.quest_name = quest_name
 
-    def resolve(self, game):
+    def resolve(self, game, binding: EffectBinding):
         from piratesim.quests.quest_factory import QuestFactory
 
         deck = Deck()
@@ -80,11 +78,14 @@ class IncapacitateRandomPiratesEffect(QuestEffect):
             if self.condition(pirate) and pirate not in self.exclude:
                 deck.add_item(pirate)
 
-        self.target_pirates = deck.draw(self.n_pirates)
+        # The deck runs dry when there are fewer eligible pirates than draws
+        rng = game._stream("incapacitate", binding.quest.name)
+        drawn = deck.draw(self.n_pirates, rng=rng)
+        target_pirates = [p for p in drawn if p is not None]
 
         quest_log = []
 
-        for pirate in self.target_pirates:
+        for pirate in target_pirates:
             pirate.assign_quest(
                 quest=QuestFactory().from_dict(
                     {
@@ -94,7 +95,8 @@ class IncapacitateRandomPiratesEffect(QuestEffect):
                         "difficulty_max": self.n_turns,
                         "reward_min": 0,
                         "reward_max": 0,
-                    }
+                    },
+                    rng=game._stream("pirate", pirate.name),
                 )
             )
             quest_log.append(
@@ -109,7 +111,7 @@ class NewQuestEffect(QuestEffect):
         self.new_quests = new_quests
         super().__init__()
 
-    def resolve(self, game):
+    def resolve(self, game, binding: EffectBinding):
         quest_log = []
 
         quests_to_add = []
@@ -120,66 +122,58 @@ class NewQuestEffect(QuestEffect):
         if quests_to_add:
             quest_log.append("❕ New quests unlocked:")
             for q in quests_to_add:
-                game.available_quests.append(q)
+                # The quests here are templates, shared by cloned runs
+                game.available_quests.append(q.clone({}))
                 quest_log.append("\t" + q.name)
 
         return quest_log
 
 
 class BountyEffect(QuestEffect):
-    def __init__(self) -> None:
-        self.bounty_value = None
-        self.quest_taker = None
-
-    def resolve(self, game) -> str:
-        if self.bounty_value:
-            self.quest_taker.gold += self.bounty_value
-            game.gold -= self.bounty_value
+    def resolve(self, game, binding: EffectBinding) -> str:
+        if binding.bounty_value:
+            binding.quest_taker.gold += binding.bounty_value
+            game.gold -= binding.bounty_value
 
             quest_log = [
-                f"You paid them {self.bounty_value} gold pieces for their troubles"
+                f"You paid them {binding.bounty_value} gold pieces for their troubles"
             ]
 
             return quest_log
         return []
 
-    def on_pinned(self, quest):
-        self.bounty_value = quest.bounty
-
-    def on_selected(self, pirate):
-        self.quest_taker = pirate
-
 
 class NotorietyEffect(QuestEffect):
     def __init__(self, notoriety_value) -> None:
         self.notoriety_value = notoriety_value
 
-    def resolve(self, game) -> str:
-        if self.notoriety_value:
+    def resolve(self, game, binding: EffectBinding) -> str:
+        notoriety_value = self.notoriety_value
+        if notoriety_value:
             quest_log = []
 
-            if self.quest_taker.trait == TraitFactory.get_trait("cautious"):
-                self.notoriety_value = min(0, self.notoriety_value)
+            if binding.quest_taker.trait is TraitFactory.get_trait("cautious"):
+                notoriety_value = min(0, notoriety_value)
 
-            game.notoriety += self.notoriety_value
+            game.notoriety += notoriety_value
 
-            if self.notoriety_value > 0:
-                quest_log.append(f"⚠️ 🔼  Notoriety increased by {self.notoriety_value}")
-            elif self.notoriety_value < 0:
-                quest_log.append(f"⚠️ 🔽  Notoriety decreased by {self.notoriety_value}")
+            if notoriety_value > 0:
+                quest_log.append(f"⚠️ 🔼  Notoriety increased by {notoriety_value}")
+            elif notoriety_value < 0:
+                quest_log.append(f"⚠️ 🔽  Notoriety decreased by {notoriety_value}")
 
             return quest_log
         return []
 
-    def on_selected(self, pirate):
-        self.quest_taker = pirate
-
 
 class NewPirateEffect(QuestEffect):
     def __init__(self, pirate) -> None:
         self.pirate = pirate
 
-    def resolve(self, game) -> str:
+    def clone(self, memo: dict) -> "NewPirateEffect":
+        return NewPirateEffect(self.pirate.clone(memo))
+
+    def resolve(self, game, binding: EffectBinding) -> str:
         game.pirates.append(self.pirate)
 
         quest_log = [f"{self.pirate.name} is ready for sailing!"]
@@ -187,14 +181,12 @@ class NewPirateEffect(QuestEffect):
 
 
 class NewRandomPirateEffect(QuestEffect):
-    def resolve(self, game) -> str:
-        import random
-
-        unlocked_pirate_names = [p.name for p in game.unlocked_pirates]
-        new_pirate = random.choice(
-            [p for p in game.pirate_bank if p.name not in unlocked_pirate_names]
-        )
+    def resolve(self, game, binding: EffectBinding) -> str:
+        new_pirate = game.roster.sample_locked(game._stream("recruits"))
+        if new_pirate is None:
+            return ["There was no one left to recruit"]
 
+        game.roster.unlock(new_pirate)
         game.pirates.append(new_pirate)
 
         quest_log = [f"{new_pirate.name} is ready for sailing!"]
@@ -202,23 +194,22 @@ class NewRandomPirateEffect(QuestEffect):
 
 
 class NewQuestRescueQuestTakerEffect(QuestEffect):
-    def on_selected(self, pirate):
-        self.quest_taker = pirate
-
-    def resolve(self, game) -> str:
+    def resolve(self, game, binding: EffectBinding) -> str:
         from piratesim.quests.quest import Quest
 
-        game.pirates.remove(self.quest_taker)
+        quest_taker = binding.quest_taker
+        game.pirates.remove(quest_taker)
         rescue_quest = Quest(
-            name=f"Rescue {self.quest_taker.name}",
+            name=f"Rescue {quest_taker.name}",
             difficulty=1,
+            distance=3,
             expiration=10,
             qtype=QuestType["rescue"],
-            success_effects=[NewPirateEffect(self.quest_taker)],
+            success_effects=[NewPirateEffect(quest_taker)],
         )
 
         quest_log = [
-            f"❕ {self.quest_taker.name} is stranded! New rescue quest available"
+            f"❕ {quest_taker.name} is stranded! New rescue quest available"
         ]
         game.available_quests.append(rescue_quest)
 
@@ -229,20 +220,20 @@ class RegionDiscoveredEffect(QuestEffect):
     def __init__(self, region) -> None:
         self.region = region
 
-    def resolve(self, game) -> str:
+    def resolve(self, game, binding: EffectBinding) -> str:
         quest_log = [f'🗺️  {self.region.island_name} discovered!']
-        self.region.explore()
+        rng = game._stream("region", self.region.region_id)
+        new_quest = game.world_map.explore(self.region, rng)
+        if new_quest is not None:
+            quest_log += NewQuestEffect(new_quests=[new_quest]).resolve(game, binding)
         
         return quest_log
 
 
 class RetryQuestEffect(QuestEffect):
-    def on_pinned(self, quest):
-        self.parent_quest = quest
-    
-    def resolve(self, game) -> str:
+    def resolve(self, game, binding: EffectBinding) -> str:
         quest_log = [f'The quest can be retried']
-        self.parent_quest.reset()
-        game.available_quests.append(self.parent_quest)
+        binding.quest.reset()
+        game.available_quests.append(binding.quest)
 
         return quest_log
\ No newline at end of file
@@ -1,7 +1,8 @@
 from enum import Enum, auto
 from typing import Optional
 
-from piratesim.quests.quest_effect import QuestEffect
+from piratesim.common.utils import shallow_copy
+from piratesim.quests.quest_effect import RUN_STATE_EFFECTS, EffectBinding, QuestEffect
 
 
 class QuestType(Enum):
@@ -17,6 +18,22 @@ class QuestType(Enum):
     idle = auto()
 
 
+CURSED_WORDS = (
+    "magic",
+    "curse",
+    "kraken",
+    "monster",
+    "ghost",
+    "haunted",
+    "mermaid",
+    "strange",
+)
+
+
+def is_cursed_name(name: str) -> bool:
+    return any([w in name.lower() for w in CURSED_WORDS])
+
+
 class Quest:
     def __init__(
         self,
@@ -29,6 +46,7 @@ class Quest:
         reward: int = 0,
         notoriety: int = 1,
         expiration: Optional[int] = None,
+        region=None,
     ) -> None:
         self.name = name
         self.qtype = qtype
@@ -41,20 +59,16 @@ class Quest:
         self.failure_effects = failure_effects
         self.notoriety = notoriety
         self.expiration = expiration
+        # The world map region this quest explores, if any
+        self.region = region
+        # The routing.Route sailed to the region, set when a pirate embarks
+        self.route = None
+        # Who took the quest and for which bounty, what the effects resolve with
+        self.binding = EffectBinding(self)
 
     @property
     def is_cursed(self) -> bool:
-        cursed_words = [
-            "magic",
-            "curse",
-            "kraken",
-            "monster",
-            "ghost",
-            "haunted",
-            "mermaid",
-            "strange",
-        ]
-        return any([w in self.name.lower() for w in cursed_words])
+        return is_cursed_name(self.name)
 
     @property
     def bounty(self) -> int:
@@ -80,14 +94,32 @@ class Quest:
             f"D {self.difficulty} - R {self.reward}\t[{self.qtype.name}]\t| {self.name}"
         )
     
+    def clone(self, memo: dict) -> "Quest":
+        """
+        A copy of the quest for a cloned run, see SingleRun.clone. `memo` maps
+        the ids of the run's quests and pirates to their copies, so each is
+        copied only once.
+        """
+        clone = memo.get(id(self))
+        if clone is None:
+            clone = memo[id(self)] = shallow_copy(self)
+            clone.success_effects = _clone_effects(self.success_effects, memo)
+            clone.failure_effects = _clone_effects(self.failure_effects, memo)
+            clone.binding = self.binding.clone(clone, memo)
+        return clone
+
     def reset(self):
         self.progress = self._distance
         self.bounty = 0
 
-    def on_selected(self, *args):
-        for effect in self.all_effects:
-            effect.on_selected(*args)
+    def on_selected(self, pirate):
+        self.binding.quest_taker = pirate
 
     def on_pinned(self):
-        for effect in self.all_effects:
-            effect.on_pinned(self)
+        self.binding = EffectBinding(self, bounty_value=self.bounty)
+
+
+def _clone_effects(effects: list[QuestEffect], memo: dict) -> list[QuestEffect]:
+    if RUN_STATE_EFFECTS.isdisjoint(map(type, effects)):
+        return effects
+    return [effect.clone(memo) for effect in effects]
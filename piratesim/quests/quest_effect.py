@@ -1,13 +1,94 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Optional
+
+# Effects that hold on to a run's pirates, see QuestEffect.clone
+RUN_STATE_EFFECTS: set[type] = set()
+
+
+class EffectBinding:
+    """
+    The per quest state effects resolve against. A new binding is made every
+    time a quest is pinned, so the effects themselves can be shared.
+    """
+
+    __slots__ = ("quest", "quest_taker", "bounty_value")
+
+    def __init__(self, quest, bounty_value: int = 0) -> None:
+        self.quest = quest
+        self.bounty_value = bounty_value
+        self.quest_taker = None
+
+    def clone(self, quest, memo: dict) -> "EffectBinding":
+        """The binding of `quest`, a clone of this one's quest (see Quest.clone)"""
+        clone = EffectBinding(quest, self.bounty_value)
+        if self.quest_taker is not None:
+            clone.quest_taker = self.quest_taker.clone(memo)
+        return clone
 
 
 class QuestEffect(ABC):
+    """
+    Effect definitions are immutable, anything that depends on who took the
+    quest or for how much comes from the `EffectBinding` passed to `resolve`.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "clone" in vars(cls):
+            RUN_STATE_EFFECTS.add(cls)
+
+    @classmethod
+    def shared(cls, *args):
+        """One instance per distinct set of (hashable) arguments"""
+        return _shared_effect(cls, args)
+
+    def clone(self, memo: dict) -> "QuestEffect":
+        """
+        The effect as seen by a cloned run (see SingleRun.clone). Effects are
+        shared, only those holding on to a run's pirates need a copy.
+        """
+        return self
+
     @abstractmethod
-    def resolve(self, game) -> str:
+    def resolve(self, game, binding: EffectBinding) -> list[str]:
         raise NotImplementedError()
 
-    def on_pinned(self, quest):
-        pass
 
-    def on_selected(self, *args):
-        pass
+@lru_cache(maxsize=None)
+def _shared_effect(cls, args):
+    return cls(*args)
+
+
+class EffectBuffer:
+    """
+    Quest effects queued during a turn, applied in one pass at its end in the
+    order the quests concluded.
+    """
+
+    def __init__(self) -> None:
+        self.commands: list[tuple[Optional[str], list[QuestEffect], Any]] = []
+
+    def __len__(self):
+        return len(self.commands)
+
+    def push(self, effects: list[QuestEffect], binding, header: Optional[str] = None):
+        self.commands.append((header, effects, binding))
+
+    def apply(self, game, on_applied=None) -> list[str]:
+        """
+        Resolves every queued effect, returning the log lines. `on_applied` is
+        called with each binding and the gold and notoriety its effects added.
+        """
+        commands, self.commands = self.commands, []
+
+        quest_log = []
+        for header, effects, binding in commands:
+            if header is not None:
+                quest_log.append(header)
+            gold, notoriety = game.gold, game.notoriety
+            for effect in effects:
+                quest_log.extend([f"\t{s}" for s in effect.resolve(game, binding)])
+            if on_applied is not None:
+                on_applied(binding, game.gold - gold, game.notoriety - notoriety)
+        return quest_log
@@ -1,6 +1,7 @@
 import random
 
-from piratesim.common.assets import get_asset
+from piratesim.common.profiler import profiled
+from piratesim.quests import load_quest_bank
 from piratesim.quests.effects import (
     BountyEffect,
     IncapacitateQuestTakerEffect,
@@ -16,11 +17,16 @@ from piratesim.quests.effects import (
 from piratesim.quests.quest import Quest, QuestType
 
 
+def _not_on_a_quest(pirate):
+    return not pirate.on_a_quest
+
+
 class QuestFactory:
     def __init__(self) -> None:
-        self.quest_bank = get_asset("quests/quests.csv").set_index("quest_id")
+        self.quest_bank = load_quest_bank()
 
-    def build_quest(self,
+    def build_quest(
+        self,
         name,
         qtype,
         expiration,
@@ -29,6 +35,7 @@ class QuestFactory:
         reward=0,
         success_effects=[],
         failure_effects=[],
+        region=None,
     ):
         return Quest(
             name=name,
@@ -39,18 +46,20 @@ class QuestFactory:
             reward=reward,
             success_effects=success_effects,
             failure_effects=failure_effects,
+            region=region,
         )
 
-    def from_dict(self, template_dict, parent_region=None):
-        difficulty = random.randint(
+    @profiled("QuestFactory.from_dict")
+    def from_dict(self, template_dict, parent_region=None, rng=random):
+        difficulty = rng.randint(
             template_dict["difficulty_min"], template_dict["difficulty_max"]
         )
         min_reward = template_dict["reward_min"] // 10
         max_reward = template_dict["reward_max"] // 10
 
 
-        reward = random.randint(min_reward, max_reward) * 10
-        reward_effect = RewardEffect(reward)
+        reward = rng.randint(min_reward, max_reward) * 10
+        reward_effect = RewardEffect.shared(reward)
 
         success_effects = []
         failure_effects = []
@@ -58,11 +67,8 @@ class QuestFactory:
         # Handle region discovery
         if parent_region:
             if not parent_region.discovered:
+                # The region's own quest is only built once it is discovered
                 success_effects.append(RegionDiscoveredEffect(region=parent_region))
-                if parent_region.available_quest:
-                    success_effects.append(
-                        NewQuestEffect(new_quests=[parent_region.available_quest])
-                    )
 
         # Handle reward
         if reward > 0 or QuestType[template_dict["type"]] == QuestType.idle:
@@ -72,7 +78,7 @@ class QuestFactory:
 
         # Handle retry
         if template_dict.get('retry', 1):
-            failure_effects.append(RetryQuestEffect())
+            failure_effects.append(RetryQuestEffect.shared())
 
         # Handle chains
         if template_dict.get("next_in_chain", -1) >= 0:
@@ -82,7 +88,8 @@ class QuestFactory:
                         self.from_dict(
                             self.quest_bank.loc[
                                 template_dict["next_in_chain"]
-                            ].to_dict()
+                            ].to_dict(),
+                            rng=rng,
                         )
                     ]
                 )
@@ -90,35 +97,36 @@ class QuestFactory:
 
         # Handle unlockable pirates
         if template_dict['name'] == 'Rescue the Stranded Pirate':
-            success_effects.append(NewRandomPirateEffect())
+            success_effects.append(NewRandomPirateEffect.shared())
 
         # Handle bounty and notoriety
         if QuestType[template_dict["type"]] != QuestType.idle:
-            success_effects.append(NotorietyEffect(template_dict["success_notoriety"]))
-            failure_effects.append(NotorietyEffect(template_dict["failure_notoriety"]))
+            success_effects.append(
+                NotorietyEffect.shared(template_dict.get("success_notoriety", 0))
+            )
+            failure_effects.append(
+                NotorietyEffect.shared(template_dict.get("failure_notoriety", 0))
+            )
 
-            bounty_effect = BountyEffect()
-            success_effects.append(bounty_effect)
-            failure_effects.append(bounty_effect)
+            success_effects.append(BountyEffect.shared())
+            failure_effects.append(BountyEffect.shared())
 
         # Handle combat failure states
         if QuestType[template_dict["type"]] == QuestType.combat:
             if difficulty >= 4:
-                failure_effects.append(
-                    NewQuestRescueQuestTakerEffect()
-                )
+                failure_effects.append(NewQuestRescueQuestTakerEffect.shared())
             else:
                 failure_effects.append(
-                    IncapacitateQuestTakerEffect(
-                        n_turns=random.randint(1, 3), quest_name="Fix the holes in the hull"
+                    IncapacitateQuestTakerEffect.shared(
+                        rng.randint(1, 3), "Fix the holes in the hull"
                     )
                 )
 
         # Handle other incapacitated states
         elif QuestType[template_dict["type"]] == QuestType.theft:
             failure_effects.append(
-                IncapacitateQuestTakerEffect(
-                    n_turns=random.randint(1, 3), quest_name="Be locked up for a while"
+                IncapacitateQuestTakerEffect.shared(
+                    rng.randint(1, 3), "Be locked up for a while"
                 )
             )
         elif (
@@ -126,8 +134,8 @@ class QuestFactory:
             and "drink" in template_dict["name"].lower()
         ):
             success_effects.append(
-                IncapacitateQuestTakerEffect(
-                    n_turns=random.randint(1, 3), quest_name="Get over the hangover"
+                IncapacitateQuestTakerEffect.shared(
+                    rng.randint(1, 3), "Get over the hangover"
                 )
             )
         elif (
@@ -135,11 +143,12 @@ class QuestFactory:
             and "fight" in template_dict["name"].lower()
         ):
             success_effects.append(
-                IncapacitateRandomPiratesEffect(
-                    n_pirates=random.randint(1, 2),
-                    n_turns=random.randint(1, 3),
-                    quest_name="Heal the wounds",
-                    condition=lambda p: not p.on_a_quest,
+                IncapacitateRandomPiratesEffect.shared(
+                    (),
+                    rng.randint(1, 2),
+                    rng.randint(1, 3),
+                    _not_on_a_quest,
+                    "Heal the wounds",
                 )
             )
 
@@ -152,4 +161,5 @@ class QuestFactory:
             reward=reward,
             success_effects=success_effects,
             failure_effects=failure_effects,
+            region=parent_region,
         )
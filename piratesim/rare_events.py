@@ -0,0 +1,166 @@
+"""
+Probabilities of rare game overs, by multilevel splitting.
+
+Plain Monte Carlo needs about 100 / p runs to see a game over of probability
+p a handful of times. Splitting instead sets intermediate levels on a score
+that grows as the run gets closer to the game over (e.g. notoriety over the
+maximum notoriety) and estimates the chance of climbing from each level to
+the next. Runs that reach a level are cloned to start the next stage, so the
+effort concentrates on the runs that are heading there.
+
+With a fixed number of runs per stage and fixed levels (fixed effort
+splitting), the product of the stage frequencies is an unbiased estimate of
+the probability. Error bars come from independent replications.
+
+    estimate = splitting_estimate(
+        lambda: new_headless_run(seed=1), NOTORIETY, horizon=100
+    )
+"""
+
+import math
+import random
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+
+class RareEvent(NamedTuple):
+    """
+    One of the game overs of SingleRun._check_game_over. `score(run, start)`
+    grows towards 1 as a run gets closer to it, `start` being the run the
+    estimation started from.
+    """
+
+    name: str
+    score: Callable
+    reached: Callable
+
+
+NOTORIETY = RareEvent(
+    "notoriety",
+    score=lambda run, start: run.notoriety / run.max_notoriety,
+    reached=lambda run: run.notoriety >= run.max_notoriety,
+)
+BANKRUPTCY = RareEvent(
+    "bankruptcy",
+    score=lambda run, start: 1 - run.gold / max(start.gold, 1),
+    reached=lambda run: run.gold < 0,
+)
+CREW_LOST = RareEvent(
+    "crew_lost",
+    score=lambda run, start: 1 - len(run.pirates) / max(len(start.pirates), 1),
+    reached=lambda run: not run.pirates,
+)
+RARE_EVENTS = {event.name: event for event in (NOTORIETY, BANKRUPTCY, CREW_LOST)}
+
+
+class SplittingEstimate(NamedTuple):
+    probability: float
+    stderr: float
+    # Mean conditional probability of reaching each level from the previous
+    stage_probabilities: tuple[float, ...]
+    replications: int
+    turns_simulated: int
+
+    def brute_force_turns(self, turns_per_run: float) -> float:
+        """Turns plain Monte Carlo would need for the same relative error"""
+        if self.stderr == 0 or self.probability == 0:
+            return math.inf
+        relative_error = self.stderr / self.probability
+        p = self.probability
+        return turns_per_run * (1 - p) / (p * relative_error**2)
+
+
+def _advance(run, start, level, event: RareEvent, horizon: int) -> tuple[bool, int]:
+    """
+    Plays a run until its score reaches `level` (or the event happens), which
+    is a success, or it can't anymore. Returns the outcome and turns played.
+    """
+    turns = 0
+    game_over = False
+    while True:
+        if event.reached(run) or event.score(run, start) >= level:
+            return True, turns
+        if game_over or run.turn >= horizon:
+            return False, turns
+        game_over, _ = run.next_turn()
+        turns += 1
+
+
+def _replicate(make_run, event, levels, horizon, n_per_stage, rng):
+    start = make_run()
+    starts = [start]
+
+    stage_probabilities = []
+    turns = 0
+    for level in list(levels) + [math.inf]:
+        survivors = []
+        for _ in range(n_per_stage):
+            run = rng.choice(starts).clone(seed=rng.getrandbits(64))
+            reached, played = _advance(run, start, level, event, horizon)
+            turns += played
+            if reached:
+                survivors.append(run)
+
+        stage_probabilities.append(len(survivors) / n_per_stage)
+        if not survivors:
+            break
+        starts = survivors
+
+    stage_probabilities += [0.0] * (len(levels) + 1 - len(stage_probabilities))
+    return float(np.prod(stage_probabilities)), stage_probabilities, turns
+
+
+def splitting_estimate(
+    make_run: Callable,
+    event: RareEvent = NOTORIETY,
+    horizon: int = 100,
+    levels=(0.2, 0.4, 0.6, 0.8),
+    n_per_stage: int = 100,
+    replications: int = 10,
+    seed: Optional[int] = None,
+) -> SplittingEstimate:
+    """
+    P(`event` happens by turn `horizon`) for runs built by `make_run`, which
+    must return a headless run (with a policy). `levels` are the increasing
+    score thresholds below 1 between stages; the last stage is the event.
+    """
+    assert replications > 1, "Error bars need several replications"
+    assert list(levels) == sorted(levels), "Levels must be increasing"
+    rng = random.Random(seed)
+
+    estimates, stages, turns = [], [], 0
+    for _ in range(replications):
+        estimate, stage_probabilities, played = _replicate(
+            make_run, event, levels, horizon, n_per_stage, rng
+        )
+        estimates.append(estimate)
+        stages.append(stage_probabilities)
+        turns += played
+
+    estimates = np.array(estimates)
+    return SplittingEstimate(
+        probability=float(estimates.mean()),
+        stderr=float(estimates.std(ddof=1) / math.sqrt(replications)),
+        stage_probabilities=tuple(np.mean(stages, axis=0).tolist()),
+        replications=replications,
+        turns_simulated=turns,
+    )
+
+
+def monte_carlo_estimate(
+    make_run: Callable,
+    event: RareEvent = NOTORIETY,
+    horizon: int = 100,
+    n_runs: int = 1000,
+    seed: Optional[int] = None,
+) -> SplittingEstimate:
+    """The plain Monte Carlo estimate, as a reference for splitting_estimate"""
+    p, _, turns = _replicate(make_run, event, (), horizon, n_runs, random.Random(seed))
+    return SplittingEstimate(
+        probability=p,
+        stderr=math.sqrt(p * (1 - p) / n_runs),
+        stage_probabilities=(p,),
+        replications=1,
+        turns_simulated=turns,
+    )
@@ -0,0 +1,209 @@
+"""
+Sea routes between regions of the world map.
+
+Crews don't sail in a straight line: they hop between nearby islands and
+steer around hazardous waters when they can afford to. `SeaRouter` finds
+those routes with A* over a graph linking every region to its closest
+neighbours, and keeps recent routes in a bounded cache so assigning a quest
+doesn't re-run the search for destinations that were already charted.
+"""
+
+import heapq
+import math
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+from piratesim.common.utils import shallow_copy
+
+# The home port every voyage departs from
+HOME = "HOME"
+
+
+def navigation_bucket(navigation: int) -> int:
+    """Leagues a ship covers per turn, same as Pirate.progress_quest"""
+    return 1 if navigation <= 3 else 2
+
+
+class Route(NamedTuple):
+    origin: Hashable
+    destination: Hashable
+    path: tuple
+    leagues: float
+    # Length weighted mean hazard of the legs sailed
+    hazard: float
+
+    @property
+    def voyage_length(self) -> int:
+        return max(1, round(self.leagues))
+
+    @property
+    def exposure(self) -> float:
+        """How much more likely than in open sea an encounter is on this route"""
+        return 1.0 + self.hazard
+
+
+class SeaRouter:
+    """
+    Shortest sea routes over a `WorldMap`, cached by (origin, destination,
+    navigation bucket).
+
+    Ships only sail between each region and its `neighbours` closest ones, so
+    long voyages hop between islands. A leg costs its length, inflated by the
+    hazard of the region it sails to. Better navigators (a higher bucket) are
+    less put off by hazards, so they may take a different, shorter route. The
+    neighbour graph is rebuilt lazily whenever the map's regions change, cached
+    routes are kept since they are still valid voyages.
+    """
+
+    def __init__(self, world_map, neighbours: int = 8, cache_size: int = 1024) -> None:
+        self.world_map = world_map
+        self.neighbours = neighbours
+        self.cache_size = cache_size
+        self._routes: OrderedDict[tuple, Route] = OrderedDict()
+        self._graph: dict[Hashable, list[Hashable]] = {}
+        self._graph_version = None
+        self.hits = 0
+        self.misses = 0
+
+    def route(self, origin, destination, navigation: int = 1) -> Route:
+        """The route between two regions (or HOME), given as regions or ids"""
+        origin = getattr(origin, "region_id", origin)
+        destination = getattr(destination, "region_id", destination)
+        key = (origin, destination, navigation_bucket(navigation))
+
+        route = self._routes.get(key)
+        if route is not None:
+            self.hits += 1
+            self._routes.move_to_end(key)
+            return route
+
+        self.misses += 1
+        route = self._search(*key)
+        self._routes[key] = route
+        if len(self._routes) > self.cache_size:
+            self._routes.popitem(last=False)
+        return route
+
+    def clone(self, world_map) -> "SeaRouter":
+        """A router for a clone of the map, starting with the same cached routes"""
+        clone = shallow_copy(self)
+        clone.world_map = world_map
+        clone._routes = OrderedDict(self._routes)
+        clone._graph = dict(self._graph)
+        return clone
+
+    def clear(self):
+        self._routes.clear()
+        self._graph.clear()
+
+    def _position(self, node):
+        if node == HOME:
+            return 0.0, 0.0
+        return self.world_map.index.positions[node]
+
+    def _hazard(self, node) -> float:
+        if node == HOME:
+            return 0.0
+        return self.world_map.regions[node].hazard
+
+    def _neighbours(self, node) -> list:
+        if self._graph_version != self.world_map.version:
+            self._graph.clear()
+            self._graph_version = self.world_map.version
+
+        if node not in self._graph:
+            x, y = self._position(node)
+            nearby = [
+                n
+                for n in self.world_map.index.nearest(x, y, self.neighbours + 1)
+                if n != node
+            ][: self.neighbours]
+            # The home port isn't indexed, link it like any other close island
+            if node != HOME and (
+                len(nearby) < self.neighbours
+                or math.hypot(x, y) <= math.dist((x, y), self._position(nearby[-1]))
+            ):
+                nearby.append(HOME)
+            self._graph[node] = nearby
+        return self._graph[node]
+
+    def _leg_cost(self, distance, node, bucket) -> float:
+        return distance * (1.0 + self._hazard(node) / bucket)
+
+    def _search(self, origin, destination, bucket) -> Route:
+        index = self.world_map.index
+        if origin == destination:
+            return Route(origin, destination, (origin,), 0.0, 0.0)
+        if any(n != HOME and n not in index for n in (origin, destination)):
+            # Dropped from the map, e.g. an evicted chunk, sail straight there
+            return self._direct(origin, destination)
+
+        goal = self._position(destination)
+        start = self._position(origin)
+
+        # A*, the straight line is admissible as hazards only add to a leg
+        frontier = [(math.dist(start, goal), 0.0, 0, origin)]
+        came_from = {origin: None}
+        cost_so_far = {origin: 0.0}
+        tie = 0
+        while frontier:
+            _, cost, _, node = heapq.heappop(frontier)
+            if node == destination:
+                break
+            if cost > cost_so_far[node]:
+                continue
+
+            position = self._position(node)
+            for neighbour in self._neighbours(node):
+                leg = math.dist(position, self._position(neighbour))
+                new_cost = cost + self._leg_cost(leg, neighbour, bucket)
+                if new_cost < cost_so_far.get(neighbour, math.inf):
+                    cost_so_far[neighbour] = new_cost
+                    came_from[neighbour] = node
+                    tie += 1
+                    estimate = new_cost + math.dist(self._position(neighbour), goal)
+                    heapq.heappush(frontier, (estimate, new_cost, tie, neighbour))
+
+        if destination not in came_from:
+            return self._direct(origin, destination)
+
+        path = [destination]
+        while came_from[path[-1]] is not None:
+            path.append(came_from[path[-1]])
+        path.reverse()
+        return self._summarize(origin, destination, path)
+
+    def _direct(self, origin, destination) -> Route:
+        return self._summarize(origin, destination, [origin, destination])
+
+    def _summarize(self, origin, destination, path) -> Route:
+        leagues = 0.0
+        weighted_hazard = 0.0
+        for a, b in zip(path, path[1:]):
+            leg = math.dist(self._node_position(a), self._node_position(b))
+            leagues += leg
+            weighted_hazard += leg * self._node_hazard(b)
+        hazard = weighted_hazard / leagues if leagues else 0.0
+        return Route(origin, destination, tuple(path), leagues, hazard)
+
+    def _node_position(self, node):
+        if node == HOME or node in self.world_map.index:
+            return self._position(node)
+        region = self._region(node)
+        return region.x, region.y
+
+    def _node_hazard(self, node) -> float:
+        if node == HOME or node in self.world_map.regions:
+            return self._hazard(node)
+        return self._region(node).hazard
+
+    def _region(self, region_id):
+        # Only procedural maps drop regions, and can always rebuild them
+        return self.world_map.chunk(*region_id[:2])[region_id[2]]
+
+
+def voyage_route(router: Optional[SeaRouter], quest, pirate) -> Optional[Route]:
+    """The route a pirate sails for a quest, None if it isn't tied to a region"""
+    if router is None or quest.region is None:
+        return None
+    return router.route(HOME, quest.region, pirate.navigation)
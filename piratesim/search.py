@@ -0,0 +1,283 @@
+"""
+A reference search policy, the automated strong player used to stress the
+balance of quests.csv and the traits.
+
+At every pin decision `SearchPolicy` weighs pinning each available quest at
+each bounty of its menu against ending the turn. Each candidate action is
+scored by rollouts: the run is cloned (see SingleRun.clone), the action is
+played, and a cheap rollout policy plays on for `horizon` turns. Rollouts go
+to the actions by UCB1 until the decision's time budget is spent, in parallel
+on a thread or process pool, and the action with the best mean return is
+played. Its bounty is then offered when the run asks for one.
+
+    run = new_headless_run(seed=1, policy=SearchPolicy(seed=1, workers=4))
+    run.simulate(100)
+    print(run.policy.stats)
+"""
+
+import math
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from piratesim.common.random import RandomStreams
+from piratesim.decisions import drive
+from piratesim.policies import POLICIES, BasePolicy
+from piratesim.quests.quest import Quest
+
+BACKENDS = ("thread", "process")
+
+# Pinning the index-th available quest for a bounty, None ends the turn
+Action = Optional[tuple[int, int]]
+
+
+def evaluate(
+    run, start, notoriety_cost: float = 20.0, game_over_cost: float = 1000.0
+) -> float:
+    """
+    The return of a rollout from `start` to `run`: gold earned, less the
+    notoriety gained at `notoriety_cost` gold per point, and `game_over_cost`
+    if the run is over.
+    """
+    value = (run.gold - start.gold) - notoriety_cost * (run.notoriety - start.notoriety)
+    if run._check_game_over()[0]:
+        value -= game_over_cost
+    return value
+
+
+def play_action(run, action: Action):
+    """Plays `action` at a pin decision, then the rest of the turn"""
+    if action is not None:
+        index, bounty = action
+        quest = run.available_quests[index]
+        quest.bounty = bounty
+        run.pin_quest(quest)
+        drive(run.select_quests(), run.decide)
+    return drive(run.finish_turn(), run.decide)
+
+
+def rollouts(root, jobs, horizon: int, rollout_policy: str, weights) -> list:
+    """
+    Plays a rollout per (action, seed) of `jobs` from `root`, a run stopped
+    at a pin decision. Returns each one's return and the turns it played.
+    """
+    results = []
+    for action, seed in jobs:
+        run = root.clone(seed)
+        run.policy = POLICIES[rollout_policy](seed)
+
+        game_over, _ = play_action(run, action)
+        depth = 1
+        while not game_over and depth < horizon:
+            game_over, _ = run.next_turn()
+            depth += 1
+        results.append((evaluate(run, root, *weights), depth))
+    return results
+
+
+class SearchStats:
+    """What the search did over all of a policy's decisions"""
+
+    def __init__(self) -> None:
+        self.decisions = 0
+        self.rollouts = 0
+        self.turns = 0
+        self.max_depth = 0
+        self.seconds = 0.0
+
+    @property
+    def decisions_per_second(self) -> float:
+        return self.decisions / self.seconds if self.seconds else 0.0
+
+    @property
+    def rollouts_per_decision(self) -> float:
+        return self.rollouts / self.decisions if self.decisions else 0.0
+
+    @property
+    def mean_depth(self) -> float:
+        """Turns played per rollout, fewer than the horizon when runs end"""
+        return self.turns / self.rollouts if self.rollouts else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.decisions} decisions ({self.decisions_per_second:.1f}/s),"
+            f" {self.rollouts_per_decision:.1f} rollouts per decision,"
+            f" depth {self.mean_depth:.1f} turns (max {self.max_depth})"
+        )
+
+
+class SearchPolicy(BasePolicy):
+    """
+    Pins quests and sets bounties by rollouts, see the module docstring.
+
+    Each decision lasts `time_budget` seconds, or `max_rollouts` rollouts if
+    there's no budget (which makes single worker searches reproducible).
+    Rollouts are handed out `batch_size` at a time per worker. Bounties of the
+    menu below every pirate's minimum bounty are never tried, since no one
+    would take the quest. Encounters are answered with the likeliest option.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        time_budget: Optional[float] = 0.25,
+        max_rollouts: Optional[int] = None,
+        horizon: int = 8,
+        bounties: tuple[int, ...] = (0, 10, 20, 50, 100),
+        workers: int = 1,
+        backend: str = "thread",
+        batch_size: int = 4,
+        exploration: float = math.sqrt(2),
+        rollout_policy: str = "random",
+        notoriety_cost: float = 20.0,
+        game_over_cost: float = 1000.0,
+    ) -> None:
+        assert backend in BACKENDS, f"Unknown backend {backend}"
+        assert time_budget or max_rollouts, "Need a time budget or a rollout cap"
+        self.rng = random.Random(seed)
+        self.time_budget = time_budget
+        self.max_rollouts = max_rollouts
+        self.horizon = horizon
+        self.bounties = bounties
+        self.workers = workers
+        self.backend = backend
+        self.batch_size = batch_size
+        self.exploration = exploration
+        self.rollout_policy = rollout_policy
+        self.weights = (notoriety_cost, game_over_cost)
+
+        self.stats = SearchStats()
+        self._bounty = 0
+        self._executor = None
+
+    def reseed(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __getstate__(self):
+        # Pools don't travel to other processes
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def candidate_actions(self, run) -> list[Action]:
+        if not run.pirates:
+            return [None]
+        least_demanding = min(p.minimum_bounty for p in run.pirates)
+        bounties = [b for b in self.bounties if b >= least_demanding]
+        return [None] + [
+            (index, bounty)
+            for index in range(len(run.available_quests))
+            for bounty in bounties
+        ]
+
+    def select_quest_to_pin(self, run) -> Optional[Quest]:
+        actions = self.candidate_actions(run)
+        action = self.search(run, actions) if len(actions) > 1 else None
+        if action is None:
+            return None
+
+        index, self._bounty = action
+        return run.available_quests[index]
+
+    def select_bounty(self, run, quest: Quest) -> int:
+        return self._bounty
+
+    def select_encounter_option(self, encounter, pirate) -> int:
+        odds = encounter.success_odds
+        return max(range(len(encounter.options)), key=odds.__getitem__)
+
+    def search(self, run, actions: list[Action]) -> Action:
+        """The action of `actions` with the best mean rollout return"""
+        started = time.perf_counter()
+        deadline = started + self.time_budget if self.time_budget else math.inf
+
+        # Rollouts start from a copy, so workers never touch the live run, and
+        # draw from their own streams rather than the global generator
+        root = run.clone(self.rng.getrandbits(64))
+        root.policy = None
+        root.streams = RandomStreams(self.rng.getrandbits(64))
+
+        visits = [0] * len(actions)
+        totals = [0.0] * len(actions)
+        returns = []
+        while len(returns) < (self.max_rollouts or math.inf):
+            jobs = self._assign(actions, visits, totals, returns)
+            for action_ids, results in self._play(root, actions, jobs):
+                for i, (value, depth) in zip(action_ids, results):
+                    visits[i] += 1
+                    totals[i] += value
+                    returns.append(value)
+                    self.stats.turns += depth
+                    self.stats.max_depth = max(self.stats.max_depth, depth)
+            if time.perf_counter() >= deadline:
+                break
+
+        self.stats.decisions += 1
+        self.stats.rollouts += len(returns)
+        self.stats.seconds += time.perf_counter() - started
+
+        best = max(
+            range(len(actions)),
+            key=lambda i: totals[i] / visits[i] if visits[i] else -math.inf,
+        )
+        return actions[best]
+
+    def _assign(self, actions, visits, totals, returns) -> list[list[int]]:
+        """
+        The actions (by position) each worker rolls out next, picked by UCB1.
+        Actions already handed out in this round count as visited.
+        """
+        # Returns are in gold, so exploration is scaled by their spread
+        spread = statistics.stdev(returns) if len(returns) > 1 else 0.0
+        c = self.exploration * max(spread, 1.0)
+        means = [t / n if n else 0.0 for t, n in zip(totals, visits)]
+        pending = list(visits)
+        n_jobs = self.workers * self.batch_size
+        if self.max_rollouts:
+            n_jobs = min(n_jobs, self.max_rollouts - len(returns))
+
+        picked = []
+        for _ in range(n_jobs):
+            log_visits = math.log(max(sum(pending), 1))
+            scores = [
+                mean + c * math.sqrt(log_visits / n) if n else math.inf
+                for mean, n in zip(means, pending)
+            ]
+            i = scores.index(max(scores))
+            pending[i] += 1
+            picked.append(i)
+        return [picked[w :: self.workers] for w in range(self.workers)]
+
+    def _play(self, root, actions, jobs):
+        jobs = [
+            (ids, [(actions[i], self.rng.getrandbits(64)) for i in ids])
+            for ids in jobs
+            if ids
+        ]
+        args = (self.horizon, self.rollout_policy, self.weights)
+        if self.workers == 1:
+            return [(ids, rollouts(root, batch, *args)) for ids, batch in jobs]
+
+        if self._executor is None:
+            if self.backend == "thread":
+                self._executor = ThreadPoolExecutor(self.workers)
+            else:
+                self._executor = ProcessPoolExecutor(self.workers)
+        futures = [
+            (ids, self._executor.submit(rollouts, root, batch, *args))
+            for ids, batch in jobs
+        ]
+        return [(ids, future.result()) for ids, future in futures]
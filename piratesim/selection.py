@@ -0,0 +1,307 @@
+"""
+Quest selection for every free pirate of a turn at once.
+
+`Pirate.select_quest` rolls a roulette per pirate and applies the trait and
+bounty modifiers one quest at a time. `QuestSelector` computes the same
+weights for the whole (pirate x board) matrix with NumPy and samples every
+pirate from it, removing quests from the board as they are taken.
+"""
+
+import random
+from typing import Optional, Sequence
+
+import numpy as np
+
+from piratesim.common.random import LazyGenerator
+from piratesim.quests.quest import Quest, QuestType
+from piratesim.trait import TRAITS, minimum_bounty
+
+# Chance of idling, relative to a plain quest, as in Pirate.select_quest
+IDLE_CHANCE = 0.5
+
+ASSIGNMENT_MODES = ("sequential", "simultaneous", "optimal")
+
+# Cost of a pirate taking a quest they would never pick, in optimal mode
+_FORBIDDEN = 1e9
+
+
+class QuestBoard:
+    """Columns of the quest attributes traits select on"""
+
+    def __init__(self, quests: Sequence[Quest]) -> None:
+        self.quests = list(quests)
+        self.difficulty = np.array([q.difficulty for q in quests], dtype=float)
+        self.bounty = np.array([q.bounty for q in quests], dtype=float)
+        self.reward = np.array([q.reward for q in quests], dtype=float)
+        self.qtype = np.array([q.qtype.value for q in quests], dtype=int)
+        self.is_cursed = np.array([q.is_cursed for q in quests], dtype=bool)
+
+    @classmethod
+    def from_columns(cls, difficulty, bounty, reward, qtype, is_cursed) -> "QuestBoard":
+        """A board of hypothetical quests, given their attributes"""
+        board = cls.__new__(cls)
+        board.difficulty = np.asarray(difficulty, dtype=float)
+        columns = np.broadcast_arrays(
+            board.difficulty,
+            np.asarray(bounty, dtype=float),
+            np.asarray(reward, dtype=float),
+            np.asarray(qtype, dtype=int),
+            np.asarray(is_cursed, dtype=bool),
+        )
+        _, board.bounty, board.reward, board.qtype, board.is_cursed = columns
+        board.quests = [None] * len(board.difficulty)
+        return board
+
+    def __len__(self):
+        return len(self.quests)
+
+    def take(self, rows: np.ndarray) -> "QuestBoard":
+        """The board restricted to the quests at `rows`"""
+        board = QuestBoard.__new__(QuestBoard)
+        board.quests = [self.quests[i] for i in rows.tolist()]
+        for column in ("difficulty", "bounty", "reward", "qtype", "is_cursed"):
+            setattr(board, column, getattr(self, column)[rows])
+        return board
+
+
+class QuestSelector(LazyGenerator):
+    """
+    Assigns quests to free pirates, in one of the ASSIGNMENT_MODES:
+
+    - "sequential": pirates roll in roster order, each one's pick is removed
+      from the board before the next one rolls (as Pirate.select_quest).
+    - "simultaneous": everyone rolls at once on the full board. When several
+      pirates roll the same quest, the one keenest on it (then the first in
+      the roster) takes it and the others re-roll without it.
+    - "optimal": no rolls, the matching of pirates to quests (or idling) with
+      the highest total selection weight.
+
+    Rolls come from the selector's generator, or with common random numbers
+    from each pirate's own generator (`rngs`, one per pirate), so a pirate's
+    rolls don't depend on who else is free.
+    """
+
+    def __init__(self, seed: Optional[int] = None, mode: str = "sequential") -> None:
+        assert mode in ASSIGNMENT_MODES, f"Unknown assignment mode {mode}"
+        self.reseed(seed)
+        self.mode = mode
+
+    def weights(self, pirates, board: QuestBoard, idle_board: QuestBoard, rngs=None):
+        """
+        The selection weights of every pirate for every quest of the board and
+        for their own idle quest (the i-th of `idle_board`), plus which quests
+        each pirate finds worth their bounty
+        """
+        trait_ids = np.array([p.trait.trait_id for p in pirates], dtype=int)
+        chances = np.ones((len(pirates), len(board)))
+        idle_chances = np.full(len(pirates), IDLE_CHANCE)
+        minimum_bounties = np.empty(len(pirates))
+
+        for trait_id in np.unique(trait_ids).tolist():
+            rows = np.flatnonzero(trait_ids == trait_id)
+            trait = TRAITS[trait_id]
+            minimum_bounties[rows] = minimum_bounty(trait_id)
+            noise = idle_noise = 0.0
+            if trait.selection_noise is not None:
+                noise = self._uniforms(rows, len(board), trait.selection_noise, rngs)
+                idle_noise = self._uniforms(rows, None, trait.selection_noise, rngs)
+            chances[rows] = trait.apply_to_board(chances[rows], board, noise)
+            idle_chances[rows] = trait.apply_to_board(
+                idle_chances[rows], idle_board.take(rows), idle_noise
+            )
+
+        # Quests under the pirate's minimum bounty are out, the rest are
+        # more likely the higher the bounty
+        worthy = board.bounty[None, :] >= minimum_bounties[:, None]
+        chances = np.where(worthy, chances + board.bounty / 100, 0.0)
+
+        return chances, idle_chances, worthy
+
+    def select(self, pirates, quests: Sequence[Quest], rngs=None) -> list[Quest]:
+        """
+        Picks a quest for each pirate, no quest of the board is given to more
+        than one pirate. Pirates may pick their own idle quest.
+        """
+        if not pirates:
+            return []
+
+        idle_quests = [
+            pirate.get_random_idle_quest(random if rngs is None else rngs[i])
+            for i, pirate in enumerate(pirates)
+        ]
+        board = QuestBoard(quests)
+        chances, idle_chances, worthy = self.weights(
+            pirates, board, QuestBoard(idle_quests), rngs
+        )
+
+        # Like the roulette, items without a positive chance can't be picked.
+        # The last column is each pirate's idle quest
+        weights = np.column_stack(
+            [np.maximum(chances, 0.0), np.maximum(idle_chances, 0.0)]
+        )
+
+        assign = {
+            "sequential": self._assign_sequential,
+            "simultaneous": self._assign_simultaneous,
+            "optimal": self._assign_optimal,
+        }[self.mode]
+        picks = assign(weights, rngs).tolist()
+
+        selected = []
+        favourites = np.argmax(weights, axis=1).tolist()
+        for i, (pirate, pick) in enumerate(zip(pirates, picks)):
+            quest = board.quests[pick] if pick < len(board) else idle_quests[i]
+            selected.append(quest)
+            self._log_selection(
+                pirate,
+                quest,
+                most_likely=favourites[i] == pick,
+                unworthy=len(board) - int(np.count_nonzero(worthy[i])),
+            )
+
+        return selected
+
+    def _uniforms(self, rows, n, bounds=(0.0, 1.0), rngs=None) -> np.ndarray:
+        """
+        `n` uniform draws within `bounds` (one if `n` is None) for each pirate
+        of `rows`, from their own generator when `rngs` are given
+        """
+        low, high = bounds
+        shape = (len(rows),) if n is None else (len(rows), n)
+        if rngs is None:
+            return self.rng.uniform(low, high, size=shape)
+        per_pirate = 1 if n is None else n
+        draws = [[rngs[i].uniform(low, high) for _ in range(per_pirate)] for i in rows]
+        return np.array(draws, dtype=float).reshape(shape)
+
+    def _assign_sequential(self, weights: np.ndarray, rngs=None) -> np.ndarray:
+        n_quests = weights.shape[1] - 1
+        available = np.ones(weights.shape[1], dtype=bool)
+        rolls = self._uniforms(range(len(weights)), None, rngs=rngs)
+
+        picks = np.empty(len(weights), dtype=int)
+        for i in range(len(weights)):
+            row = np.where(available, weights[i], 0.0)
+            picks[i] = _roll(row[None, :], rolls[[i]])[0]
+            if picks[i] < n_quests:
+                available[picks[i]] = False
+        return picks
+
+    def _assign_simultaneous(self, weights: np.ndarray, rngs=None) -> np.ndarray:
+        n_pirates, n_quests = len(weights), weights.shape[1] - 1
+        picks = np.full(n_pirates, n_quests)
+        taken = np.zeros(weights.shape[1], dtype=bool)
+        pending = np.arange(n_pirates)
+
+        while len(pending):
+            rows = np.where(taken, 0.0, weights[pending])
+            rolled = _roll(rows, self._uniforms(pending.tolist(), None, rngs=rngs))
+
+            # Idling never conflicts, of the pirates rolling the same quest
+            # the keenest one (then the first of the roster) gets it
+            idle = rolled == n_quests
+            picks[pending[idle]] = n_quests
+            claimants, claims = pending[~idle], rolled[~idle]
+            order = np.lexsort((claimants, -weights[claimants, claims], claims))
+            claimants, claims = claimants[order], claims[order]
+            winners = np.ones(len(claims), dtype=bool)
+            winners[1:] = claims[1:] != claims[:-1]
+
+            picks[claimants[winners]] = claims[winners]
+            taken[claims[winners]] = True
+            pending = np.sort(claimants[~winners])
+
+        return picks
+
+    def _assign_optimal(self, weights: np.ndarray, rngs=None) -> np.ndarray:
+        n_pirates, n_quests = len(weights), weights.shape[1] - 1
+
+        # One private idle column per pirate, which is always allowed
+        gains = np.full((n_pirates, n_quests + n_pirates), -np.inf)
+        quest_weights = weights[:, :n_quests]
+        gains[:, :n_quests] = np.where(quest_weights > 0, quest_weights, -np.inf)
+        gains[np.arange(n_pirates), n_quests + np.arange(n_pirates)] = weights[:, -1]
+
+        cost = np.where(np.isfinite(gains), -gains, _FORBIDDEN)
+        columns = _hungarian(cost)
+        return np.minimum(columns, n_quests)
+
+    @staticmethod
+    def _log_selection(pirate, quest, most_likely, unworthy):
+        if unworthy:
+            pirate.captains_log.append(
+                f"{pirate.name} thinks {unworthy} of the pinned quests are not worth"
+                " it for their bounty."
+            )
+
+        if quest.qtype == QuestType.idle:
+            pirate.captains_log.append(
+                f'Took some time for myself to go "{quest.name}"'
+            )
+        elif most_likely:
+            pirate.captains_log.append(f'My crew will love to go "{quest.name}"!')
+        else:
+            pirate.captains_log.append(
+                "I'd normally prefer other stuff, but let's try to go"
+                f' "{quest.name}"'
+            )
+
+
+def _roll(weights: np.ndarray, rolls: np.ndarray) -> np.ndarray:
+    """
+    One roulette roll per row of `weights`, given uniform `rolls`. Rows with
+    no positive weight pick their last column (idling).
+    """
+    cumulative = np.cumsum(weights, axis=1)
+    totals = cumulative[:, -1]
+    picks = (cumulative <= (rolls * totals)[:, None]).sum(axis=1)
+    last = weights.shape[1] - 1
+    return np.where(totals > 0, np.minimum(picks, last), last)
+
+
+def _hungarian(cost: np.ndarray) -> np.ndarray:
+    """
+    Minimum cost assignment of every row to a distinct column (rows <= columns)
+    with the O(n^2 m) shortest augmenting path Hungarian algorithm.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    # Row (1 based) assigned to each column, column 0 is a sentinel
+    row_of = np.zeros(m + 1, dtype=int)
+    way = np.zeros(m + 1, dtype=int)
+
+    for i in range(1, n + 1):
+        row_of[0] = i
+        j0 = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = row_of[j0]
+            free = ~used[1:]
+            slack = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (slack < min_slack[1:])
+            min_slack[1:][better] = slack[better]
+            way[1:][better] = j0
+
+            candidates = np.where(free, min_slack[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            u[row_of[used]] += delta
+            v[used] -= delta
+            min_slack[1:][free] -= delta
+
+            j0 = j1
+            if row_of[j0] == 0:
+                break
+
+        while j0:
+            j1 = way[j0]
+            row_of[j0] = row_of[j1]
+            j0 = j1
+
+    columns = np.empty(n, dtype=int)
+    assigned = np.flatnonzero(row_of[1:])
+    columns[row_of[assigned + 1] - 1] = assigned
+    return columns
@@ -0,0 +1,44 @@
+from typing import Optional
+
+from piratesim.game import Game
+from piratesim.policies import BasePolicy, RandomPolicy
+from piratesim.single_run import SingleRun
+
+
+def new_headless_run(
+    seed: int,
+    policy: Optional[BasePolicy] = None,
+    max_pirates_per_run: int = 2,
+    n_quests: int = 2,
+    starting_gold: int = 500,
+    random_encounter_chance: float = 1.0,
+    observers=(),
+    common_random_numbers: bool = False,
+    procedural_map: bool = False,
+    assignment_mode: str = "simultaneous",
+) -> SingleRun:
+    """
+    Sets up a run with the starting pirates whose decisions are made by a policy.
+    With `common_random_numbers`, runs of the same seed draw from the same
+    RandomStreams, so variants of the game can be compared run by run.
+    With `procedural_map` the run sails an unbounded ProceduralWorldMap.
+    Free pirates pick their quests together by default, unlike in the
+    interactive game, see QuestSelector for the `assignment_mode`s.
+    """
+    game = Game(
+        max_pirates_per_run=max_pirates_per_run,
+        n_quests=n_quests,
+        starting_gold=starting_gold,
+        seed=seed,
+        random_encounter_chance=random_encounter_chance,
+        debug=False,
+        common_random_numbers=common_random_numbers,
+        procedural_map=procedural_map,
+    )
+    policy = policy if policy is not None else RandomPolicy(seed)
+    return game.create_run(
+        game.pirates[:max_pirates_per_run],
+        policy=policy,
+        observers=observers,
+        assignment_mode=assignment_mode,
+    )
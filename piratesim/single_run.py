@@ -1,12 +1,29 @@
+import copy
 import random
+from typing import Optional
 
+from piratesim.common.random import RandomStreams
 from piratesim.quests.quest import Quest, QuestType
 from piratesim.quests import load_quest_bank
 from piratesim.quests.quest_factory import QuestFactory
 from piratesim.quests.effects import NewQuestEffect, RegionDiscoveredEffect, RetryQuestEffect
+from piratesim.quests.quest_effect import EffectBuffer
 from piratesim.encounters.encounter_manager import EncounterManager
-from piratesim.pirate import Pirate, load_pirate_bank
-from piratesim.common.utils import clear_terminal
+from piratesim.encounters.resolver import EncounterOutcome, EncounterResolver
+from piratesim.pirate import Pirate, PirateRoster, load_pirate_bank
+from piratesim.common.profiler import PROFILER, profiled
+from piratesim.common.utils import clear_terminal, shallow_copy
+from piratesim.decisions import (
+    BountyDecision,
+    EncounterDecision,
+    Notice,
+    PinQuestDecision,
+    answer_in_terminal,
+    drive,
+)
+from piratesim.odds import odds_surface
+from piratesim.routing import SeaRouter, voyage_route
+from piratesim.selection import QuestSelector
 from piratesim.world_map import WorldMap
 
 class SingleRun:
@@ -19,15 +36,40 @@ class SingleRun:
         seed,
         random_encounter_chance,
         debug=False,
+        policy=None,
+        world_map=None,
+        roster=None,
+        assignment_mode="sequential",
+        observers=(),
+        streams=None,
     ) -> None:
+        # With RandomStreams, pirates, regions and encounters each draw from
+        # their own stream (common random numbers, see compare.py)
+        self.streams = streams
+
         self.n_quests = n_quests
         self.quest_bank = load_quest_bank()
-        self.pirate_bank = load_pirate_bank()
+        if roster is None:
+            # A run on its own, anyone not sailing yet can be recruited
+            names = {p.name for p in unlocked_pirates}
+            pirate_bank = load_pirate_bank(self._stream("pirate_bank"))
+            roster = PirateRoster(
+                list(unlocked_pirates)
+                + [p for p in pirate_bank if p.name not in names],
+                unlocked=unlocked_pirates,
+            )
+        self.roster = roster
         self.turn = 0
         self.turn_log = {}
+        # The odds surface is checked against the assets on the first redraw
+        # of each turn
+        self._odds_checked_turn = None
         self._debug = debug
         self._seed = seed
-        self.world_map = WorldMap()
+        if world_map is None:
+            world_map = WorldMap(rng=self._stream("world_map"))
+        self.world_map = world_map
+        self.router = SeaRouter(self.world_map)
 
         self.gold = gold
 
@@ -38,11 +80,29 @@ class SingleRun:
         self.pinned_quests: list[Quest] = []
         self.pinned_quests_expiration: dict[Quest, int] = {}
         self.pirates: list[Pirate] = selected_pirates
-        self.unlocked_pirates: list[Pirate] = unlocked_pirates
+        self.unlocked_pirates: list[Pirate] = roster.unlocked
 
         self.encounter_manager = EncounterManager()
         self.random_encounter_chance = random_encounter_chance
 
+        # When set, player decisions are delegated to the policy (headless run)
+        self.policy = policy
+
+        # Headless runs resolve all of a turn's encounters in one batch
+        self.encounter_resolver = (
+            EncounterResolver(seed=self._seed_for("encounters")) if policy else None
+        )
+        self.encounter_outcomes: list[EncounterOutcome] = []
+
+        self.effect_buffer = EffectBuffer()
+        # Notified of concluded quests and turns, see telemetry.RunObserver
+        self.observers = list(observers)
+        self._outcomes: dict = {}
+        # Free pirates pick their quests together, see QuestSelector
+        self.quest_selector = QuestSelector(
+            seed=self._seed_for("selection"), mode=assignment_mode
+        )
+
     def print_state(self):
         print()
         print("-- 🗒️🖋️ PIRATE's LOG --")
@@ -68,20 +128,30 @@ class SingleRun:
                 print(pirate)
         print()
 
+        free_pirates = [pirate for pirate in self.pirates if not pirate.on_a_quest]
+        surface = odds_surface(check=self._odds_checked_turn != self.turn)
+        self._odds_checked_turn = self.turn
+
         print("-- 📌 Pinned quests --")
         if len(self.pinned_quests):
-            for quest in self.pinned_quests:
+            success = surface.success_odds(free_pirates, self.pinned_quests)
+            selection = surface.selection_odds(free_pirates, self.pinned_quests)
+            for j, quest in enumerate(self.pinned_quests):
                 print(
                     f"> {quest} | Expires in"
                     f" {self.pinned_quests_expiration[quest]} turn(s)"
                 )
+                self._print_odds(free_pirates, success[:, j], selection[:, j])
         else:
             print("> EMPTY BOARD")
         print()
 
         print("-- Available quests --")
-        for i, quest in enumerate(["Next turn"] + self.available_quests):
-            print(f"{i}) {quest}")
+        print("0) Next turn")
+        success = surface.success_odds(free_pirates, self.available_quests)
+        for j, quest in enumerate(self.available_quests):
+            print(f"{j + 1}) {quest}")
+            self._print_odds(free_pirates, success[:, j])
         print()
         print(
             f"-- 🔄 TURN {self.turn} | 💰 GOLD {self.gold}  | 🌱 SEED {self._seed} --"
@@ -89,6 +159,92 @@ class SingleRun:
             f" [{'/' * self.notoriety}{'_' * (self.max_notoriety - self.notoriety)}] --"  # noqa: E501
         )
 
+    def clone(self, seed: Optional[int] = None) -> "SingleRun":
+        """
+        An independent copy of the run as it stands, e.g. to play several
+        futures from the same state. Only what turns change is copied: the
+        run's pirates, the quests in play and the map's containers. Asset
+        tables, effects, logged turns and unchanged regions and recruits are
+        shared. Observers aren't carried over.
+
+        With `seed` the copy gets fresh generators (see reseed), which is much
+        cheaper than copying the current ones to replay the same rolls.
+        """
+        assert not self.effect_buffer, "Can't clone a run with effects pending"
+        memo = {}
+        clone = shallow_copy(self)
+        clone.pirates = [pirate.clone(memo) for pirate in self.pirates]
+        clone.available_quests = [q.clone(memo) for q in self.available_quests]
+        clone.pinned_quests = [q.clone(memo) for q in self.pinned_quests]
+        clone.pinned_quests_expiration = {
+            memo[id(q)]: turns for q, turns in self.pinned_quests_expiration.items()
+        }
+        clone.roster = self.roster.clone(memo)
+        clone.unlocked_pirates = clone.roster.unlocked
+
+        # Only the current turn's lines can still change
+        clone.turn_log = dict(self.turn_log)
+        if self.turn in self.turn_log:
+            clone.turn_log[self.turn] = list(self.turn_log[self.turn])
+        clone.encounter_outcomes = list(self.encounter_outcomes)
+
+        clone.world_map = self.world_map.clone()
+        clone.router = self.router.clone(clone.world_map)
+        clone.effect_buffer = EffectBuffer()
+        clone.observers = []
+        clone._outcomes = {}
+
+        clone.quest_selector = shallow_copy(self.quest_selector)
+        if self.encounter_resolver is not None:
+            clone.encounter_resolver = shallow_copy(self.encounter_resolver)
+        if seed is not None:
+            clone.policy = copy.copy(self.policy)
+            clone.reseed(seed)
+            return clone
+
+        clone.quest_selector.rng = copy.deepcopy(self.quest_selector.rng)
+        if self.encounter_resolver is not None:
+            clone.encounter_resolver.rng = copy.deepcopy(self.encounter_resolver.rng)
+        clone.policy = copy.deepcopy(self.policy)
+        if self.streams is not None:
+            clone.streams = self.streams.clone()
+        return clone
+
+    def reseed(self, seed: int):
+        """
+        Gives the run (and its policy) fresh random generators. The run draws
+        from streams of `seed` from then on, even if it used the global
+        generator before, so that runs reseeded alike play alike.
+        """
+        streams = self.streams = RandomStreams(seed)
+        self.quest_selector.reseed(streams.seed_for("selection"))
+        if self.encounter_resolver is not None:
+            self.encounter_resolver.reseed(streams.seed_for("encounters"))
+        if self.policy is not None:
+            self.policy.reseed(streams.seed_for("policy"))
+
+    def _stream(self, *key):
+        """The generator drawing for `key`, the global one without streams"""
+        return random if self.streams is None else self.streams.stream(*key)
+
+    def _seed_for(self, *key) -> int:
+        if self.streams is None:
+            return random.getrandbits(64)
+        return self.streams.seed_for(*key)
+
+    @staticmethod
+    def _print_odds(pirates, success, selection=None):
+        """One line of each free pirate's odds under a quest of the board"""
+        if not pirates:
+            return
+        cells = []
+        for i, pirate in enumerate(pirates):
+            cell = f"{pirate.name} ✅ {success[i]:.0%}"
+            if selection is not None:
+                cell += f" 👉 {selection[i]:.0%}"
+            cells.append(cell)
+        print(f"\t🎲 {' | '.join(cells)}")
+
     @property
     def quests_in_game(self):
         quests = []
@@ -103,46 +259,68 @@ class SingleRun:
         return quests
 
     def randomize_quests(self, n_quests):
+        # Only regions revealed since last turn (or whose quest expired) need
+        # a new exploration quest, the rest of the map is never scanned
         quests = []
-        for region in self.world_map.get_all_regions():
-            if not region.discovered:
-                quest_name = f'Explore the region {region.distance} leagues to the {region.direction}'
-                if quest_name not in [q.name for q in self.quests_in_game]:
-                    quest = QuestFactory().from_dict({
-                        'name': quest_name,
-                        'type': 'exploration',
-                        'difficulty_min': 1,
-                        'difficulty_max': 2,
-                        'reward_min': 0,
-                        'reward_max': 100,
-                        'success_notoriety': 0,
-                        'failure_notoriety': 0,
-                        'expiration': 10,
-                        'next_in_chain': -1,
-                        'retry': 1,
-                    }, parent_region=region)
-                    
-                    quests.append(quest)
+        for region in self.world_map.pop_newly_revealed():
+            quest_name = (
+                f'Explore the region {region.distance} leagues to the'
+                f' {region.direction}'
+            )
+            quest = QuestFactory().from_dict({
+                'name': quest_name,
+                'type': 'exploration',
+                'difficulty_min': 1,
+                'difficulty_max': 2,
+                'reward_min': 0,
+                'reward_max': 100,
+                'success_notoriety': 0,
+                'failure_notoriety': 0,
+                'expiration': 10,
+                'next_in_chain': -1,
+                'retry': 1,
+            }, parent_region=region, rng=self._stream("region", region.region_id))
+
+            quests.append(quest)
         
         return quests
 
     def select_quests(self):
+        """Lets the player pin quests and set their bounties until they pass"""
         while True:
+            quest = yield PinQuestDecision(self, list(self.available_quests))
+            if quest is None:
+                return
+
+            quest.bounty = yield BountyDecision(self, quest)
+            self.pin_quest(quest)
+
+    def answer_interactively(self, decision):
+        if isinstance(decision, PinQuestDecision):
             clear_terminal()
             self.print_state()
 
             if not self.available_quests:
                 input('\n> No available quests, press enter to continue... <')
-                return
+                return None
 
             quest = self._handle_quest_selected()
-            if quest:
-                quest = self._handle_bounty(quest)
-
-                self.pin_quest(quest)
-            else:
+            if quest is None:
                 self.print_state()
-                return
+            return quest
+
+        if isinstance(decision, BountyDecision):
+            return self._handle_bounty(decision.quest).bounty
+
+        if isinstance(decision, EncounterDecision):
+            return decision.encounter.prompt(decision.pirate)
+
+        raise TypeError(f"{type(decision).__name__} is not asked by a run")
+
+    def decide(self, decision):
+        if self.policy is not None:
+            return self.policy.decide(decision)
+        return answer_in_terminal(decision)
 
     def pin_quest(self, quest):
         self.available_quests.remove(quest)
@@ -194,30 +372,60 @@ class SingleRun:
         return False, None
 
     def _update_pinned_quests(self):
-        for quest in self.pinned_quests:
+        for quest in list(self.pinned_quests):
             turns_to_expire = self.pinned_quests_expiration[quest]
             if turns_to_expire > 1:
                 self.pinned_quests_expiration[quest] = turns_to_expire - 1
             else:
                 self.pinned_quests_expiration.pop(quest)
                 self.pinned_quests.remove(quest)
+                if quest.region is not None:
+                    self.world_map.requeue(quest.region)
 
+    @profiled("turn")
     def next_turn(self):
+        return drive(self.play_turn(), self.decide)
+
+    def play_turn(self):
+        """Plays one turn, yielding whenever the player has to decide something"""
+        self.start_turn()
+        yield from self.select_quests()
+        return (yield from self.finish_turn())
+
+    def start_turn(self):
+        """Pinned quests age and new ones are posted, before the player pins"""
         self.turn += 1
 
-        self._update_pinned_quests()
+        with PROFILER.section("turn.update_pinned_quests"):
+            self._update_pinned_quests()
 
-        self.available_quests += self.randomize_quests(self.n_quests)
-        self.select_quests()
+        with PROFILER.section("turn.randomize_quests"):
+            self.available_quests += self.randomize_quests(self.n_quests)
+
+    def finish_turn(self):
+        """The rest of the turn once the player is done pinning quests"""
         self.turn_log[self.turn] = []
+        pending_encounters = []
+
+        # Every free pirate picks from the board in one assignment stage
+        with PROFILER.section("turn.pirate_select_quest"):
+            free_pirates = [p for p in self.pirates if p.current_quest is None]
+            rngs = None
+            if self.streams is not None:
+                rngs = [self._stream("select", p.name) for p in free_pirates]
+            selections = dict(
+                zip(
+                    free_pirates,
+                    self.quest_selector.select(free_pirates, self.pinned_quests, rngs),
+                )
+            )
 
         for pirate in self.pirates:
             if pirate.current_quest is None:
-                selected_quest = pirate.select_quest(self.pinned_quests)
+                selected_quest = selections[pirate]
                 pirate.assign_quest(selected_quest)
-
-                for effect in selected_quest.all_effects:
-                    effect.on_selected(pirate)
+                for observer in self.observers:
+                    observer.on_quest_assigned(self, pirate, selected_quest)
 
                 if selected_quest.qtype is QuestType.idle:
                     self.turn_log[self.turn].append(
@@ -225,6 +433,13 @@ class SingleRun:
                         f" {selected_quest.difficulty} turns"
                     )
                 else:
+                    # Charted once, the voyage length and its hazards follow
+                    selected_quest.route = voyage_route(
+                        self.router, selected_quest, pirate
+                    )
+                    if selected_quest.route is not None:
+                        selected_quest.progress = selected_quest.route.voyage_length
+
                     self.pinned_quests.remove(selected_quest)
                     self.pinned_quests_expiration.pop(selected_quest)
                     self.turn_log[self.turn].append(
@@ -232,24 +447,29 @@ class SingleRun:
                         f" {selected_quest.name} [{selected_quest.qtype.name}]"
                     )
             else:
-                quest_result = pirate.progress_quest()
+                with PROFILER.section("turn.progress_quest"):
+                    quest_result = pirate.progress_quest(
+                        self._stream("pirate", pirate.name)
+                    )
 
                 if quest_result is not None:
                     # Quest is complete
                     success, quest_effects = quest_result
-                    self.turn_log[self.turn].append(
-                        f'{"✅" if success else "❌"} '
-                        f' {pirate.name} {"succeeded" if success else "failed"} the'
-                        f" quest {pirate.current_quest.name}"
+                    if self.observers:
+                        self._outcomes[pirate.current_quest.binding] = success
+                    # Effects are applied once every pirate has played
+                    self.effect_buffer.push(
+                        quest_effects,
+                        pirate.current_quest.binding,
+                        header=(
+                            f'{"✅" if success else "❌"} '
+                            f' {pirate.name} {"succeeded" if success else "failed"} the'
+                            f" quest {pirate.current_quest.name}"
+                        ),
                     )
 
                     pirate.current_quest = None
 
-                    for effect in quest_effects:
-                        self.turn_log[self.turn].extend(
-                            [f"\t{s}" for s in effect.resolve(self)]
-                        )
-
                 else:
                     # Quest is in progress
                     self.turn_log[self.turn].append(
@@ -257,28 +477,106 @@ class SingleRun:
                         f" [{pirate.current_quest.progress} turn(s) remaining]"
                     )
 
-                    if random.random() < self.random_encounter_chance and pirate.current_quest.qtype != QuestType['idle']:
-                        encounter = EncounterManager().create_encounter()
-                        encounter_log = encounter.trigger(pirate)
-                        self.turn_log[self.turn].extend(encounter_log)
+                    encounter_chance = self.random_encounter_chance
+                    if pirate.current_quest.route is not None:
+                        encounter_chance *= pirate.current_quest.route.exposure
+
+                    encounter_rng = self._stream("encounter", pirate.name)
+                    if (
+                        encounter_rng.random() < encounter_chance
+                        and pirate.current_quest.qtype != QuestType['idle']
+                    ):
+                        with PROFILER.section("turn.encounters"):
+                            encounter = self.encounter_manager.create_encounter(
+                                encounter_rng
+                            )
+
+                        option = yield EncounterDecision(self, encounter, pirate)
+
+                        if self.encounter_resolver is not None:
+                            pending_encounters.append((encounter, pirate, option))
+                        else:
+                            with PROFILER.section("turn.encounters"):
+                                encounter_log = encounter.resolve(
+                                    pirate, option, encounter_rng, verbose=self._debug
+                                )
+                            self.turn_log[self.turn].extend(encounter_log)
+                            for observer in self.observers:
+                                observer.on_encounter(
+                                    self, pirate, encounter, option, encounter_log
+                                )
+
+                            yield Notice(self, encounter_log[1:])
+
+        if pending_encounters:
+            with PROFILER.section("turn.encounters"):
+                rolls = None
+                if self.streams is not None:
+                    rolls = [
+                        self._stream("encounter", pirate.name).random()
+                        for _, pirate, _ in pending_encounters
+                    ]
+                outcomes = self.encounter_resolver.resolve_batch(
+                    pending_encounters, rolls
+                )
+
+            self.encounter_outcomes.extend(outcomes)
+            for (encounter, pirate, _), outcome in zip(pending_encounters, outcomes):
+                self.turn_log[self.turn].append(
+                    "\t" + encounter.description.format(name=pirate.name)
+                )
+                self.turn_log[self.turn].extend(outcome.to_log())
+                for observer in self.observers:
+                    observer.on_encounter(
+                        self, pirate, encounter, outcome.option, outcome.to_log()
+                    )
+
+        with PROFILER.section("turn.resolve_effects"):
+            self.turn_log[self.turn].extend(
+                self.effect_buffer.apply(
+                    self, self._quest_concluded if self.observers else None
+                )
+            )
 
         game_over = self._check_game_over()
+        for observer in self.observers:
+            observer.on_turn_ended(self, *game_over)
         return game_over
 
-    def run(self):
-        while True:
+    def _quest_concluded(self, binding, gold_delta, notoriety_delta):
+        success = self._outcomes.pop(binding)
+        for observer in self.observers:
+            observer.on_quest_concluded(
+                self, binding, success, gold_delta, notoriety_delta
+            )
+
+    def simulate(self, max_turns: int):
+        """Plays up to `max_turns` turns without any terminal output"""
+        assert self.policy is not None, "Headless runs need a policy"
+
+        game_over, reason = False, None
+        for _ in range(max_turns):
             game_over, reason = self.next_turn()
             if game_over:
-                clear_terminal()
-                print("TURN LOG:\n\n")
+                break
+
+        return game_over, reason
 
+    def play(self):
+        """Plays turns until the game is over, yielding the player's decisions"""
+        while True:
+            game_over, reason = yield from self.play_turn()
+            if game_over:
+                lines = ["TURN LOG:\n"]
                 for key in self.turn_log:
-                    print(f"-- TURN {key} --")
-                    for line in self.turn_log[key]:
-                        print(line)
-                        print()
-
-                print("\n\n     >------ GAME OVER ------<\n")
-                print("\t", reason)
-                input("\n\n> Press enter to continue...")
+                    lines.append(f"-- TURN {key} --")
+                    lines.extend(self.turn_log[key])
+
+                lines.append("\n     >------ GAME OVER ------<")
+                lines.append(f"\t {reason}")
+
+                yield Notice(self, lines, clear_screen=True)
                 return self
+
+    def run(self):
+        return drive(self.play(), self.decide)
@@ -0,0 +1,331 @@
+"""
+Parameter sweeps over headless games.
+
+Every cell of the grid (one combination of Game parameters and a policy)
+is played once per seed in a pool of worker processes. Results are cached
+on disk, keyed by the cell, the seed, ENGINE_VERSION and a hash of the asset
+tables the cell actually reads, so re-running a sweep after editing a CSV
+only replays the cells that depend on it.
+
+Runs are played by a pool of long lived workers that start with the engine
+imported and its compiled asset tables and templates at hand (see
+worker_pool), so a run reaches its first turn in milliseconds. The tables
+are compiled once by the sweep and shared with every worker. Workers are
+replaced after `max_runs_per_worker` runs, which caps what their caches can
+grow to.
+
+    python -m piratesim sweep --n-quests 2 3 --starting-gold 500 1000 \\
+        --seeds 1:200 --output sweep.csv
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+from piratesim.common.assets import asset_bundle_hash
+from piratesim.common.shared_assets import SharedAssets, attach_assets
+from piratesim.policies import POLICIES
+
+# Bump whenever the simulation changes outcomes for the same inputs, which
+# invalidates every cached result
+ENGINE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(".piratesim_cache") / "sweeps"
+
+DEFAULT_MAX_RUNS_PER_WORKER = 500
+
+# Tables every headless run reads, the encounters are only drawn from when
+# encounters can happen. Artifacts are only handed out by the Game's menu.
+_CORE_ASSETS = ("quests/quests.csv", "quests/idle_quests.csv", "pirates/pirates.csv")
+_ENCOUNTER_ASSETS = ("encounters/encounters.csv",)
+
+# Modules the forkserver imports once, before forking any worker
+_PRELOAD = ["__main__", "piratesim.sweep", "piratesim.simulation"]
+
+
+class SweepCell(NamedTuple):
+    n_quests: int = 2
+    starting_gold: int = 500
+    max_pirates_per_run: int = 2
+    random_encounter_chance: float = 1.0
+    policy: str = "random"
+
+
+SWEEP_PARAMETERS = SweepCell._fields
+
+
+def cell_assets(cell: SweepCell) -> tuple[str, ...]:
+    """The asset tables a cell's results depend on"""
+    if cell.random_encounter_chance > 0:
+        return _CORE_ASSETS + _ENCOUNTER_ASSETS
+    return _CORE_ASSETS
+
+
+def cache_key(cell: SweepCell, seed: int, max_turns: int) -> str:
+    assets = asset_bundle_hash(cell_assets(cell))
+    key = json.dumps([list(cell), seed, max_turns, assets, ENGINE_VERSION])
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """One small JSON file per result, written atomically"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR) -> None:
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            return json.loads(self._path(key).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, result: dict):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(result))
+        temporary.replace(path)
+
+
+def _check_seed(seed: int):
+    if seed <= 0:
+        # The Game picks a random seed for 0, which couldn't be replayed
+        raise ValueError(f"Seeds must be positive, got {seed}")
+
+
+def run_cell(cell: SweepCell, seed: int, max_turns: int) -> dict:
+    """Plays one seed of a cell and summarizes how the run went"""
+    from piratesim.simulation import new_headless_run
+
+    _check_seed(seed)
+    run = new_headless_run(
+        seed=seed,
+        policy=POLICIES[cell.policy](seed),
+        max_pirates_per_run=cell.max_pirates_per_run,
+        n_quests=cell.n_quests,
+        starting_gold=cell.starting_gold,
+        random_encounter_chance=cell.random_encounter_chance,
+    )
+    game_over, reason = run.simulate(max_turns)
+    return {
+        "turns": run.turn,
+        "gold": run.gold,
+        "notoriety": run.notoriety,
+        "game_over": game_over,
+        "reason": reason,
+    }
+
+
+def warm_up():
+    """
+    Imports the engine and fills the caches of compiled tables and templates,
+    so the next run started in this process doesn't pay for them
+    """
+    import piratesim.simulation  # noqa: F401
+    from piratesim.common.shared_assets import compile_tables
+    from piratesim.encounters.encounter_manager import compile_encounters
+    from piratesim.pirate import _idle_quest_templates, _pirate_prototypes
+    from piratesim.quests import load_quest_bank
+
+    compile_tables()
+    load_quest_bank()
+    compile_encounters()
+    _pirate_prototypes()
+    _idle_quest_templates()
+
+
+def _start_worker(shared_assets: Optional[str]):
+    if shared_assets is not None:
+        attach_assets(shared_assets)
+    warm_up()
+
+
+def _run_job(job):
+    key, cell, seed, max_turns = job
+    return key, run_cell(cell, seed, max_turns)
+
+
+def expand_grid(grid: dict) -> list[SweepCell]:
+    """Every combination of the values given per SWEEP_PARAMETERS name"""
+    unknown = set(grid) - set(SWEEP_PARAMETERS)
+    assert not unknown, f"Unknown sweep parameters {sorted(unknown)}"
+    values = [
+        grid.get(name, [default]) for name, default in SweepCell._field_defaults.items()
+    ]
+    return [SweepCell(*combination) for combination in itertools.product(*values)]
+
+
+def default_start_method() -> str:
+    methods = multiprocessing.get_all_start_methods()
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+
+@contextmanager
+def worker_pool(
+    processes: Optional[int] = None,
+    start_method: Optional[str] = None,
+    max_tasks_per_worker: Optional[int] = None,
+):
+    """
+    A multiprocessing.Pool whose workers are ready to play runs as they start.
+
+    This process is warmed up first. With "fork" every worker (replacements
+    included) is forked from it, caches and all. Otherwise it publishes its
+    compiled tables in shared memory (see shared_assets.py) and the workers
+    attach to them as they start, so the tables exist once for the whole
+    pool. With "forkserver" the server imports the engine once and forks the
+    workers, "spawn" workers import it themselves.
+    """
+    start_method = start_method or default_start_method()
+    context = multiprocessing.get_context(start_method)
+    warm_up()
+    with ExitStack() as stack:
+        shared_assets = None
+        if start_method != "fork":
+            if start_method == "forkserver":
+                context.set_forkserver_preload(_PRELOAD)
+            shared_assets = stack.enter_context(SharedAssets.publish()).name
+
+        yield stack.enter_context(
+            context.Pool(
+                processes,
+                initializer=_start_worker,
+                initargs=(shared_assets,),
+                maxtasksperchild=max_tasks_per_worker,
+            )
+        )
+
+
+def _play(jobs, processes, start_method=None, max_runs_per_worker=None):
+    if processes == 1 or len(jobs) <= 1:
+        yield from map(_run_job, jobs)
+        return
+
+    chunksize = max(1, len(jobs) // (4 * (processes or os.cpu_count())))
+    # The pool counts chunks of jobs as its tasks
+    max_tasks = max_runs_per_worker and max(1, max_runs_per_worker // chunksize)
+    with worker_pool(processes, start_method, max_tasks) as pool:
+        yield from pool.imap_unordered(_run_job, jobs, chunksize)
+
+
+def sweep(
+    grid: dict,
+    seeds,
+    max_turns: int = 100,
+    cache: Optional[ResultCache] = None,
+    processes: Optional[int] = None,
+    start_method: Optional[str] = None,
+    max_runs_per_worker: Optional[int] = DEFAULT_MAX_RUNS_PER_WORKER,
+) -> pd.DataFrame:
+    """
+    One row per (cell, seed) with the run's summary, and whether it came from
+    the cache. Only cells missing from the cache are played.
+    """
+    cache = cache if cache is not None else ResultCache()
+    for seed in seeds:
+        _check_seed(seed)
+
+    rows, jobs = {}, []
+    for cell in expand_grid(grid):
+        for seed in seeds:
+            key = cache_key(cell, seed, max_turns)
+            rows[key] = {**cell._asdict(), "seed": seed}
+            result = cache.get(key)
+            if result is None:
+                jobs.append((key, cell, seed, max_turns))
+            else:
+                rows[key].update(result, cached=True)
+
+    for key, result in _play(jobs, processes, start_method, max_runs_per_worker):
+        cache.put(key, result)
+        rows[key].update(result, cached=False)
+
+    return pd.DataFrame(list(rows.values()))
+
+
+def summarize(results: pd.DataFrame) -> pd.DataFrame:
+    """Mean outcome and game over rate of every cell"""
+    return (
+        results.groupby(list(SWEEP_PARAMETERS))
+        .agg(
+            runs=("seed", "size"),
+            turns=("turns", "mean"),
+            gold=("gold", "mean"),
+            notoriety=("notoriety", "mean"),
+            game_over=("game_over", "mean"),
+        )
+        .reset_index()
+    )
+
+
+def parse_seeds(text: str) -> range:
+    """Seeds as "start:stop" (stop excluded) or a count starting at 1"""
+    if ":" in text:
+        start, stop = text.split(":")
+        seeds = range(int(start), int(stop))
+    else:
+        seeds = range(1, int(text) + 1)
+    if seeds and seeds[0] <= 0:
+        raise argparse.ArgumentTypeError(f"Seeds must be positive, got {seeds[0]}")
+    return seeds
+
+
+def add_arguments(ap):
+    ap.add_argument("--n-quests", type=int, nargs="+", default=[2])
+    ap.add_argument("--starting-gold", type=int, nargs="+", default=[500])
+    ap.add_argument("--max-pirates", type=int, nargs="+", default=[2])
+    ap.add_argument("--encounter-chance", type=float, nargs="+", default=[1.0])
+    ap.add_argument("--policy", nargs="+", choices=sorted(POLICIES), default=["random"])
+    ap.add_argument("--seeds", type=parse_seeds, default=parse_seeds("1:101"))
+    ap.add_argument("--max-turns", type=int, default=100)
+    ap.add_argument("--processes", type=int, default=None)
+    ap.add_argument(
+        "--start-method",
+        choices=multiprocessing.get_all_start_methods(),
+        help=f"How workers are started (default: {default_start_method()})",
+    )
+    ap.add_argument(
+        "--max-runs-per-worker",
+        type=int,
+        default=DEFAULT_MAX_RUNS_PER_WORKER,
+        help="Replace workers after this many runs, 0 to keep them",
+    )
+    ap.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    ap.add_argument("--output", type=Path, help="Write every run's row to a CSV")
+
+
+def main(args):
+    grid = {
+        "n_quests": args.n_quests,
+        "starting_gold": args.starting_gold,
+        "max_pirates_per_run": args.max_pirates,
+        "random_encounter_chance": args.encounter_chance,
+        "policy": args.policy,
+    }
+    results = sweep(
+        grid,
+        args.seeds,
+        max_turns=args.max_turns,
+        cache=ResultCache(args.cache_dir),
+        processes=args.processes,
+        start_method=args.start_method,
+        max_runs_per_worker=args.max_runs_per_worker or None,
+    )
+
+    n_cached = int(results["cached"].sum())
+    print(f"{len(results)} runs, {len(results) - n_cached} played, {n_cached} cached")
+    pd.set_option("display.width", 200)
+    print(summarize(results).round(2).to_string(index=False))
+    if args.output:
+        results.to_csv(args.output, index=False)
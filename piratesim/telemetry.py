@@ -0,0 +1,230 @@
+"""
+Columnar records of headless runs, for balance analysis in `notebooks/`.
+
+A `TelemetryRecorder` observes runs and writes one row per concluded quest
+and one per turn. Rows are buffered into record batches and flushed to
+Parquet or Arrow IPC files as they fill up, so a sweep never holds more than
+a batch per table in memory. Writing needs pyarrow, which is only imported
+when a writer is opened.
+
+    recorder = TelemetryRecorder("telemetry/")
+    run = new_headless_run(seed, observers=[recorder])
+    run.simulate(100)
+    recorder.close()
+
+    quests = read_table("telemetry/quests.parquet")
+"""
+
+import uuid
+import weakref
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+# Column name -> pyarrow type factory
+QUEST_COLUMNS = {
+    "run_id": "string",
+    "seed": "int64",
+    "turn": "int32",
+    "pirate": "string",
+    "trait": "string",
+    "quest_template": "string",
+    "qtype": "string",
+    "difficulty": "int32",
+    "bounty": "int32",
+    "success": "bool_",
+    "gold_delta": "int64",
+    "notoriety_delta": "int32",
+}
+TURN_COLUMNS = {
+    "run_id": "string",
+    "seed": "int64",
+    "turn": "int32",
+    "gold": "int64",
+    "notoriety": "int32",
+    "pirates_at_sea": "int32",
+    "pinned_quests": "int32",
+    "game_over": "bool_",
+}
+
+FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Writing telemetry needs pyarrow, install it with"
+            " `poetry install --extras telemetry`"
+        ) from None
+    return pyarrow
+
+
+class RunObserver:
+    """Hooks a SingleRun calls as it plays, override the ones you need"""
+
+    def on_quest_assigned(self, run, pirate, quest):
+        pass
+
+    def on_encounter(self, run, pirate, encounter, option: int, log: list[str]):
+        pass
+
+    def on_quest_concluded(
+        self, run, binding, success: bool, gold_delta: int, notoriety_delta: int
+    ):
+        pass
+
+    def on_turn_ended(self, run, game_over: bool, reason: Optional[str]):
+        pass
+
+
+class ColumnarWriter:
+    """
+    Appends rows to a Parquet or Arrow IPC file (picked from the suffix),
+    `batch_size` rows at a time
+    """
+
+    def __init__(self, path, columns: dict[str, str], batch_size: int = 65_536):
+        self.path = Path(path)
+        assert self.path.suffix in FORMATS, f"Unknown table format {self.path}"
+        self.format = FORMATS[self.path.suffix]
+        self.columns = columns
+        self.batch_size = batch_size
+        self.n_rows = 0
+        self._buffer: dict[str, list] = {name: [] for name in columns}
+        self._writer = None
+
+        pa = _require_pyarrow()
+        self.schema = pa.schema(
+            [(name, getattr(pa, dtype)()) for name, dtype in columns.items()]
+        )
+
+    def __len__(self):
+        return len(self._buffer[next(iter(self.columns))])
+
+    def write(self, row: dict):
+        for name, values in self._buffer.items():
+            values.append(row[name])
+        if len(self) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered rows as one record batch"""
+        if not len(self):
+            return
+
+        pa = _require_pyarrow()
+        batch = pa.RecordBatch.from_pydict(self._buffer, schema=self.schema)
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.format == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self.path, self.schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, self.schema)
+
+        if self.format == "parquet":
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write(batch)
+        self.n_rows += batch.num_rows
+        self._buffer = {name: [] for name in self.columns}
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TelemetryRecorder(RunObserver):
+    """
+    Writes `quests` and `turns` tables under `directory` for every run it
+    observes. Runs are told apart by `run_id`, a fresh uuid by default since
+    runs of different sweep cells can share a seed.
+    """
+
+    def __init__(self, directory, fmt: str = "parquet", batch_size: int = 65_536):
+        directory = Path(directory)
+        self.quests = ColumnarWriter(
+            directory / f"quests.{fmt}", QUEST_COLUMNS, batch_size
+        )
+        self.turns = ColumnarWriter(
+            directory / f"turns.{fmt}", TURN_COLUMNS, batch_size
+        )
+        self._run_ids = weakref.WeakKeyDictionary()
+
+    def attach(self, run, run_id: Optional[str] = None):
+        """Starts observing a run that was created without this recorder"""
+        if run_id is not None:
+            self._run_ids[run] = run_id
+        run.observers.append(self)
+
+    def run_id(self, run) -> str:
+        if run not in self._run_ids:
+            self._run_ids[run] = uuid.uuid4().hex
+        return self._run_ids[run]
+
+    def on_quest_concluded(self, run, binding, success, gold_delta, notoriety_delta):
+        quest, pirate = binding.quest, binding.quest_taker
+        self.quests.write(
+            {
+                "run_id": self.run_id(run),
+                "seed": run._seed,
+                "turn": run.turn,
+                "pirate": pirate.name,
+                "trait": pirate.trait.name,
+                "quest_template": quest.name,
+                "qtype": quest.qtype.name,
+                "difficulty": quest.difficulty,
+                "bounty": binding.bounty_value,
+                "success": success,
+                "gold_delta": gold_delta,
+                "notoriety_delta": notoriety_delta,
+            }
+        )
+
+    def on_turn_ended(self, run, game_over, reason):
+        self.turns.write(
+            {
+                "run_id": self.run_id(run),
+                "seed": run._seed,
+                "turn": run.turn,
+                "gold": run.gold,
+                "notoriety": run.notoriety,
+                "pirates_at_sea": sum(p.on_a_quest for p in run.pirates),
+                "pinned_quests": len(run.pinned_quests),
+                "game_over": game_over,
+            }
+        )
+        if game_over:
+            self._run_ids.pop(run, None)
+
+    def close(self):
+        self.quests.close()
+        self.turns.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_table(path) -> pd.DataFrame:
+    """Loads a table written by a ColumnarWriter"""
+    path = Path(path)
+    if FORMATS.get(path.suffix) == "arrow":
+        pa = _require_pyarrow()
+        with pa.memory_map(str(path)) as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+    return pd.read_parquet(path)
@@ -0,0 +1,234 @@
+"""
+Live JSON lines telemetry of running games, for dashboards following long
+soak campaigns.
+
+`EventStream` observes runs like any `RunObserver`, but instead of writing
+tables it turns every event into one JSON line and hands it to a bounded
+queue. A background thread drains the queue into a sink (a file, stdout or
+a Unix socket), so a slow sink never holds up the simulation: once the
+queue is full, events are dropped according to the stream's `policy`.
+
+    with EventStream(open_sink("unix:/tmp/piratesim.sock")) as stream:
+        run = new_headless_run(seed, observers=[stream])
+        run.simulate(10_000)
+"""
+
+import json
+import queue
+import socket
+import sys
+import threading
+import uuid
+import weakref
+from pathlib import Path
+from typing import Optional, TextIO
+
+from piratesim.telemetry import RunObserver
+
+# What to do with a new event when the queue is full:
+# - "drop_newest": drop the new event
+# - "drop_oldest": drop the oldest queued event to make room for it
+# - "block": wait up to `block_timeout` seconds for room, then drop it
+DROP_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+_CLOSE = object()
+
+
+class StreamSink:
+    """Where the writer thread sends batches of JSON lines"""
+
+    def write(self, lines: list[str]):
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+
+class FileSink(StreamSink):
+    def __init__(self, path) -> None:
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, lines):
+        self.file.write("".join(f"{line}\n" for line in lines))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class StdoutSink(StreamSink):
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.stream = stream if stream is not None else sys.stdout
+
+    def write(self, lines):
+        self.stream.write("".join(f"{line}\n" for line in lines))
+        self.stream.flush()
+
+
+class UnixSocketSink(StreamSink):
+    def __init__(self, path) -> None:
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(str(path))
+
+    def write(self, lines):
+        self.socket.sendall("".join(f"{line}\n" for line in lines).encode())
+
+    def close(self):
+        self.socket.close()
+
+
+def open_sink(target: str) -> StreamSink:
+    """A sink from a target string: "-" for stdout, "unix:<path>" or a file path"""
+    if target == "-":
+        return StdoutSink()
+    if target.startswith("unix:"):
+        return UnixSocketSink(target.removeprefix("unix:"))
+    return FileSink(Path(target))
+
+
+class EventStream(RunObserver):
+    """
+    Streams run events as JSON lines to a sink through a queue holding up to
+    `max_queued` events, see DROP_POLICIES for what happens past that. Like
+    `TelemetryRecorder`, events tell runs apart by a fresh uuid `run_id`.
+    """
+
+    def __init__(
+        self,
+        sink: StreamSink,
+        max_queued: int = 10_000,
+        policy: str = "drop_newest",
+        block_timeout: float = 0.05,
+        batch_size: int = 256,
+    ) -> None:
+        assert policy in DROP_POLICIES, f"Unknown drop policy {policy}"
+        self.sink = sink
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.batch_size = batch_size
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self.sent = 0
+        self.dropped = 0
+        self.errors = 0
+        self._run_ids = weakref.WeakKeyDictionary()
+        self._last_totals = weakref.WeakKeyDictionary()
+
+        self._writer = threading.Thread(
+            target=self._drain, name="piratesim-event-stream", daemon=True
+        )
+        self._writer.start()
+
+    def run_id(self, run) -> str:
+        if run not in self._run_ids:
+            self._run_ids[run] = uuid.uuid4().hex
+        return self._run_ids[run]
+
+    def emit(self, run, event: str, **fields):
+        """Queues one event of a run, without ever waiting on the sink"""
+        line = json.dumps(
+            {
+                "run_id": self.run_id(run),
+                "seed": run._seed,
+                "turn": run.turn,
+                "event": event,
+                **fields,
+            },
+            ensure_ascii=False,
+        )
+        try:
+            if self.policy == "block":
+                self.queue.put(line, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(line)
+            return
+        except queue.Full:
+            pass
+
+        if self.policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(line)
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+    def on_quest_assigned(self, run, pirate, quest):
+        self.emit(
+            run,
+            "quest_assigned",
+            pirate=pirate.name,
+            quest=quest.name,
+            qtype=quest.qtype.name,
+            difficulty=quest.difficulty,
+            bounty=quest.binding.bounty_value,
+        )
+
+    def on_quest_concluded(self, run, binding, success, gold_delta, notoriety_delta):
+        self.emit(
+            run,
+            "quest_completed" if success else "quest_failed",
+            pirate=binding.quest_taker.name,
+            quest=binding.quest.name,
+            gold_delta=gold_delta,
+            notoriety_delta=notoriety_delta,
+        )
+
+    def on_encounter(self, run, pirate, encounter, option, log):
+        self.emit(
+            run,
+            "encounter",
+            pirate=pirate.name,
+            encounter=encounter.title,
+            option=encounter.options[option],
+            log=[line.strip() for line in log],
+        )
+
+    def on_turn_ended(self, run, game_over, reason):
+        gold, notoriety = self._last_totals.get(run, (None, None))
+        if run.gold != gold:
+            self.emit(run, "gold", gold=run.gold)
+        if run.notoriety != notoriety:
+            self.emit(run, "notoriety", notoriety=run.notoriety)
+        self._last_totals[run] = (run.gold, run.notoriety)
+
+        if game_over:
+            self.emit(run, "game_over", reason=reason)
+            self._last_totals.pop(run, None)
+            self._run_ids.pop(run, None)
+
+    def _drain(self):
+        while True:
+            lines = []
+            line = self.queue.get()
+            while line is not _CLOSE:
+                lines.append(line)
+                if len(lines) >= self.batch_size:
+                    break
+                try:
+                    line = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            closing = line is _CLOSE
+            if lines:
+                try:
+                    self.sink.write(lines)
+                    self.sent += len(lines)
+                except OSError:
+                    # A dashboard going away mustn't take the campaign down
+                    self.errors += 1
+            if closing:
+                return
+
+    def close(self):
+        """Sends whatever is still queued and closes the sink"""
+        if self._writer.is_alive():
+            self.queue.put(_CLOSE)
+            self._writer.join()
+        self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,185 +1,168 @@
-import random
 from abc import ABC
 from enum import Enum
+from typing import Optional
 
-from piratesim.quests.quest import Quest, QuestType
+import numpy as np
+
+from piratesim.quests.quest import QuestType
+
+
+def _types(*qtypes: QuestType) -> list[int]:
+    return [qtype.value for qtype in qtypes]
 
 
 class BaseTrait(ABC):
-    def apply_to_quest_selection(
-        self, quests: list[Quest]
-    ) -> dict[Quest, tuple[float, bool]]:
-        """Returns a dictionary with selection modifiers for a given quest list"""
-        return {q: (0.0, False) for q in quests}
+    """
+    Traits are stateless, so each one is a single shared instance (see
+    TraitFactory.get_trait) identified by a stable `trait_id`.
+    """
+
+    name: str = ""
+    trait_id: int = -1
+
+    # The (modifier, multiplicative) applied to quests matching selection_mask
+    selection_modifier: tuple[float, bool] = (0.0, False)
+    # Success (modifier, multiplicative) for quests matching resolution_mask,
+    # then for the rest, and the half width of a uniform noise added on top
+    resolution_modifiers: tuple[tuple[float, bool], tuple[float, bool]] = (
+        (0.0, False),
+        (0.0, False),
+    )
+    resolution_noise: float = 0.0
+    # Bounds of a uniform whim added to every selection chance, if any
+    selection_noise: Optional[tuple[float, float]] = None
+
+    def selection_mask(self, board) -> np.ndarray:
+        """Which quests of a selection.QuestBoard get the selection modifier"""
+        return np.zeros(len(board), dtype=bool)
+
+    def apply_to_board(self, chances: np.ndarray, board, noise=0.0) -> np.ndarray:
+        """
+        Applies selection_modifier to the `chances` of the quests matching
+        selection_mask, the last axis runs over the board. `noise` holds the
+        whims drawn within selection_noise, if the trait has any.
+        """
+        modifier, multiplicative = self.selection_modifier
+        mask = self.selection_mask(board)
+        chances = np.where(
+            mask, chances * modifier if multiplicative else chances + modifier, chances
+        )
+        return chances + noise
+
+    def resolution_mask(self, board) -> np.ndarray:
+        """Which quests of a board get the first of resolution_modifiers"""
+        return self.selection_mask(board)
+
+    def resolution_arrays(self, board) -> tuple[np.ndarray, np.ndarray]:
+        """Success (modifier, multiplicative) of every quest of the board"""
+        (hit, hit_mult), (miss, miss_mult) = self.resolution_modifiers
+        mask = self.resolution_mask(board)
+        return np.where(mask, hit, miss), np.where(mask, hit_mult, miss_mult)
 
     def apply_to_quest_progress(self, pirate) -> int:
         """Override to apply a different progress amount depending on the quest"""
         return 0
 
-    def apply_to_quest_resolution(self, quest: Quest) -> tuple[float, bool]:
-        """Returns success modifiers for a given quest"""
-        return (0.0, False)
-
     def apply_to_minimum_bounty(self) -> int:
         return 0
 
     def __repr__(self) -> str:
         return self.__class__.__name__.upper().removesuffix("TRAIT")
 
+    def __reduce__(self):
+        # Copies and unpickled traits resolve to the shared instance
+        return TraitFactory.from_id, (self.trait_id,)
+
 
 class BoldTrait(BaseTrait):
-    def apply_to_quest_selection(
-        self, quests: list[Quest]
-    ) -> dict[Quest, tuple[float, bool]]:
-        return {q: (2.0, False) for q in quests if q.difficulty >= 3}
+    selection_modifier = (2.0, False)
+    resolution_modifiers = ((0.5, False), (-0.5, False))
 
-    def apply_to_quest_resolution(self, quest: Quest) -> tuple[float, bool]:
-        if quest.difficulty >= 3:
-            return 0.5, False
-        else:
-            return -0.5, False 
+    def selection_mask(self, board) -> np.ndarray:
+        return board.difficulty >= 3
 
 
 class CautiousTrait(BaseTrait):
-    def apply_to_quest_selection(
-        self, quests: list[Quest]
-    ) -> dict[Quest, tuple[float, bool]]:
-        return {q: (2.0, False) for q in quests if q.difficulty <= 3}
+    selection_modifier = (2.0, False)
+    resolution_modifiers = ((0.5, False), (-0.5, False))
 
-    def apply_to_quest_resolution(self, quest: Quest) -> tuple[float, bool]:
-        if quest.difficulty <= 3:
-            return 0.5, False  # Add 10% to success chance
-        else:
-            return -0.5, False  # Subtract 10% from success chance
+    def selection_mask(self, board) -> np.ndarray:
+        return board.difficulty <= 3
 
 
 class GreedyTrait(BaseTrait):
-    def apply_to_quest_selection(
-        self, quests: list[Quest]
-    ) -> dict[Quest, tuple[float, bool]]:
-        return {q: (2.0, False) for q in quests if q.bounty >= 100}
+    selection_modifier = (2.0, False)
+    resolution_modifiers = ((0.85, False), (-0.5, False))
+
+    def selection_mask(self, board) -> np.ndarray:
+        return board.bounty >= 100
 
-    def apply_to_quest_resolution(self, quest: Quest) -> tuple[float, bool]:
-        if quest.reward >= 200:
-            return 0.85, False
-        else:
-            return -0.5, False
+    def resolution_mask(self, board) -> np.ndarray:
+        return board.reward >= 200
 
     def apply_to_minimum_bounty(self) -> int:
         return 10  # needs 10% more bounty / reward than other pirates
 
 
 class LoyalTrait(BaseTrait):
-    def apply_to_quest_selection(
-        self, quests: list[Quest]
-    ) -> dict[Quest, tuple[float, bool]]:
-        return {
-            q: (2.0, False)
-            for q in quests
-            if q.qtype in {QuestType.rescue, QuestType.escort}
-        }
-
-    def apply_to_quest_resolution(self, quest: Quest) -> tuple[float, bool]:
-        if quest.qtype in {QuestType.rescue, QuestType.escort}:
-            return 1.0, False
-        else:
-            return -0.5, False
+    selection_modifier = (2.0, False)
+    resolution_modifiers = ((1.0, False), (-0.5, False))
 
+    def selection_mask(self, board) -> np.ndarray:
+        return np.isin(board.qtype, _types(QuestType.rescue, QuestType.escort))
 
-class ImpulsiveTrait(BaseTrait):
-    def apply_to_quest_selection(
-        self, quests: list[Quest]
-    ) -> dict[Quest, tuple[float, bool]]:
-        return {q: (random.uniform(-0.5, 1.0), False) for q in quests}
 
-    def apply_to_quest_resolution(self, quest: Quest) -> tuple[float, bool]:
-        return random.uniform(-0.5, 0.5), False  # Random success chance
+class ImpulsiveTrait(BaseTrait):
+    resolution_noise = 0.5
+    selection_noise = (-0.5, 1.0)
 
 
 class StrategicTrait(BaseTrait):
-    def apply_to_quest_selection(
-        self, quests: list[Quest]
-    ) -> dict[Quest, tuple[float, bool]]:
-        return {
-            q: (1.0, False)
-            for q in quests
-            if q.qtype in {QuestType.delivery, QuestType.exploration}
-        }
+    selection_modifier = (1.0, False)
+    resolution_modifiers = ((0.5, False), (0.0, False))
 
-    def apply_to_quest_resolution(self, quest: Quest) -> tuple[float, bool]:
-        if quest.qtype in {QuestType.delivery, QuestType.exploration}:
-            return 0.5, False  # Add 10% to success chance
-        return 0.0, False  # No change
+    def selection_mask(self, board) -> np.ndarray:
+        return np.isin(board.qtype, _types(QuestType.delivery, QuestType.exploration))
 
 
 class SuperstitiousTrait(BaseTrait):
-    def apply_to_quest_selection(
-        self, quests: list[Quest]
-    ) -> dict[Quest, tuple[float, bool]]:
-        return {q: (0.5, True) for q in quests if q.is_cursed}  # Avoid cursed quests
+    selection_modifier = (0.5, True)
+    resolution_modifiers = ((0.5, True), (0.0, False))
 
-    def apply_to_quest_resolution(self, quest: Quest) -> tuple[float, bool]:
-        if quest.is_cursed:
-            return 0.5, True
-        return 0.0, False
+    def selection_mask(self, board) -> np.ndarray:
+        return board.is_cursed
 
 
 class BrutalTrait(BaseTrait):
-    def apply_to_quest_selection(
-        self, quests: list[Quest]
-    ) -> dict[Quest, tuple[float, bool]]:
-        return {q: (1.5, True) for q in quests if q.qtype == QuestType.combat}
+    selection_modifier = (1.5, True)
+    resolution_modifiers = ((0.85, False), (-0.3, False))
 
-    def apply_to_quest_resolution(self, quest: Quest) -> tuple[float, bool]:
-        if quest.qtype == QuestType.combat:
-            return 0.85, False
-        return -0.3, False
+    def selection_mask(self, board) -> np.ndarray:
+        return board.qtype == QuestType.combat.value
 
 
 class ResourcefulTrait(BaseTrait):
-    def apply_to_quest_selection(
-        self, quests: list[Quest]
-    ) -> dict[Quest, tuple[float, bool]]:
-        return {
-            q: (1.0, False)
-            for q in quests
-            if q.qtype in {QuestType.exploration, QuestType.fetch}
-        }
+    selection_modifier = (1.0, False)
+    resolution_modifiers = ((0.5, False), (0.0, False))
 
-    def apply_to_quest_resolution(self, quest: Quest) -> tuple[float, bool]:
-        if quest.qtype in {QuestType.exploration, QuestType.fetch}:
-            return 0.5, False
-        return 0.0, False  # No change
+    def selection_mask(self, board) -> np.ndarray:
+        return np.isin(board.qtype, _types(QuestType.exploration, QuestType.fetch))
 
 
 class CowardlyTrait(BaseTrait):
-    def apply_to_quest_selection(
-        self, quests: list[Quest]
-    ) -> dict[Quest, tuple[float, bool]]:
-        return {
-            q: (1.0, False) for q in quests if q.difficulty <= 2
-        }  # Prefer low-risk quests
+    selection_modifier = (1.0, False)
+    resolution_modifiers = ((0.5, False), (-0.5, False))
 
-    def apply_to_quest_resolution(self, quest: Quest) -> tuple[float, bool]:
-        if quest.difficulty <= 2:
-            return 0.5, False
-        return -0.5, False
+    def selection_mask(self, board) -> np.ndarray:
+        return board.difficulty <= 2
 
 
 class TrickyTrait(BaseTrait):
-    def apply_to_quest_selection(
-        self, quests: list[Quest]
-    ) -> dict[Quest, tuple[float, bool]]:
-        return {
-            q: (3.0, False)
-            for q in quests
-            if q.qtype in {QuestType.smuggling, QuestType.theft}
-        }
+    selection_modifier = (3.0, False)
+    resolution_modifiers = ((1.0, False), (0.0, False))
 
-    def apply_to_quest_resolution(self, quest: Quest) -> tuple[float, bool]:
-        if quest.qtype in {QuestType.smuggling, QuestType.theft}:
-            return 1.0, False
-        return 0.0, False  # No change
+    def selection_mask(self, board) -> np.ndarray:
+        return np.isin(board.qtype, _types(QuestType.smuggling, QuestType.theft))
 
 
 class TraitFactory(Enum):
@@ -196,8 +179,26 @@ class TraitFactory(Enum):
     tricky = TrickyTrait
 
     @staticmethod
-    def get_trait(trait_name: str):
+    def get_trait(trait_name: str) -> BaseTrait:
         try:
-            return TraitFactory[trait_name].value()
+            return TRAITS[TRAIT_IDS[trait_name]]
         except KeyError:
             raise ValueError(f"Trait '{trait_name}' is not defined in TraitFactory.")
+
+    @staticmethod
+    def from_id(trait_id: int) -> BaseTrait:
+        return TRAITS[trait_id]
+
+
+# Interned traits, indexed by trait id (the TraitFactory declaration order)
+TRAITS: tuple[BaseTrait, ...] = tuple(member.value() for member in TraitFactory)
+TRAIT_IDS: dict[str, int] = {member.name: i for i, member in enumerate(TraitFactory)}
+for _name, _trait_id in TRAIT_IDS.items():
+    TRAITS[_trait_id].name = _name
+    TRAITS[_trait_id].trait_id = _trait_id
+
+
+def minimum_bounty(trait_id: int) -> int:
+    """The lowest bounty pirates with this trait take a quest for"""
+    thresh = 10
+    return thresh + TRAITS[trait_id].apply_to_minimum_bounty()
@@ -1,7 +1,12 @@
 
+import hashlib
+import math
 import random
-from typing import Optional
+from collections import OrderedDict
+from typing import Hashable, Optional
 
+from piratesim.common.spatial import GridIndex, compass_direction, compass_vector
+from piratesim.common.utils import shallow_copy
 from piratesim.quests import load_quest_bank
 from piratesim.quests.quest import Quest
 from piratesim.quests.quest_factory import QuestFactory
@@ -24,54 +29,461 @@ class Region:
     def __init__(self, 
                  island_name: str,
                  direction: str,
-                 available_quest: Optional[Quest],
+                 available_quest: Optional[Quest] = None,
                  distance: int = 3,
+                 region_id: Hashable = 0,
+                 x: float = 0.0,
+                 y: float = 0.0,
+                 quest_template: Optional[dict] = None,
+                 hazard: float = 0.0,
                  ) -> None:
         
+        self.region_id = region_id
         self.island_name = island_name
         self.direction = direction
-        self.available_quest = available_quest
+        self._available_quest = available_quest
+        # Chain roots are only built once the region is actually explored
+        self.quest_template = quest_template
         self.distance = distance
+        # Reefs, storms and navy patrols, 0 is open sea
+        self.hazard = hazard
+        self.x = x
+        self.y = y
         self.discovered = False
 
-    def explore(self):
+    @property
+    def has_quest(self) -> bool:
+        return self._available_quest is not None or self.quest_template is not None
+
+    @property
+    def available_quest(self) -> Optional[Quest]:
+        return self.build_quest()
+
+    def build_quest(self, rng=random) -> Optional[Quest]:
+        """The region's quest, built from its template with `rng` on first use"""
+        if self._available_quest is None and self.quest_template is not None:
+            template = self.quest_template
+            self._available_quest = QuestFactory().from_dict(template, rng=rng)
+        return self._available_quest
+
+    def explore(self, rng=random):
         self.discovered = True
-        return self.available_quest
+        return self.build_quest(rng)
     
     def __repr__(self) -> str:
         return f"{self.island_name if self.discovered else '???'}, {self.distance} leagues to the {self.direction}"
 
 
+def _chain_root_templates() -> list[dict]:
+    quest_bank = load_quest_bank()
+    roots = quest_bank[quest_bank['is_chain_root'] == 1]
+    return [row.to_dict() for _, row in roots.iterrows()]
+
+
 class WorldMap:
-    def __init__(self, quests_to_spawn = 4) -> None:
+    """
+    Regions placed at 2D coordinates around the home port at (0, 0).
+
+    By default the map is the eight compass regions. With `n_regions` the map
+    is scattered over a disc of `radius` leagues instead, and only regions
+    within `sight_radius` of home or of a discovered region are revealed.
+    Newly revealed regions are queued as they appear, so quest generation only
+    has to look at what changed since the last turn.
+    """
+
+    def __init__(
+        self,
+        quests_to_spawn=4,
+        n_regions: Optional[int] = None,
+        radius: float = 50.0,
+        sight_radius: Optional[float] = None,
+        rng=random,
+    ) -> None:
         self.directions = ['NORTH', 'SOUTH', 'EAST', 'WEST',
                     'NORTHEAST', 'NORTHWEST', 'SOUTHEAST', 'SOUTHWEST']
-        self.map = self._generate_map(quests_to_spawn)
-    
+        self.sight_radius = sight_radius
+
+        if n_regions is None:
+            self.map = self._generate_map(quests_to_spawn, rng)
+            regions = [self.map[d] for d in self.directions]
+        else:
+            self.map = {}
+            regions = self._generate_scattered_regions(
+                quests_to_spawn, n_regions, radius, rng
+            )
+
+        spacing = radius / max(1, len(regions)) ** 0.5
+        self.index = GridIndex(cell_size=max(1.0, sight_radius or spacing))
+        self.regions: dict[Hashable, Region] = {}
+        self.undiscovered: set = set()
+        # Bumped whenever regions are added or dropped, see routing.SeaRouter
+        self.version = 0
+        # After a clone the regions and index are shared until changed, only
+        # the ids of regions copied since are this map's own
+        self._owned: set = set()
+        self._shares_index = False
+        self._add_regions(regions)
+
+        self.revealed: set = set()
+        self._newly_revealed: list[Region] = []
+        self._reveal_around(0.0, 0.0)
+
+    def clone(self) -> "WorldMap":
+        """
+        A copy of the map for a cloned run, see SingleRun.clone. Regions and
+        the spatial index stay shared with this map until either one changes
+        them.
+        """
+        clone = shallow_copy(self)
+        clone.map = dict(self.map)
+        clone.regions = dict(self.regions)
+        clone.undiscovered = set(self.undiscovered)
+        clone.revealed = set(self.revealed)
+        clone._newly_revealed = list(self._newly_revealed)
+        self._owned = set()
+        clone._owned = set()
+        self._shares_index = clone._shares_index = True
+        return clone
+
+    def _own_region(self, region: Region) -> Region:
+        """The region, copied first if it may be shared with a clone"""
+        if region.region_id in self._owned:
+            return region
+        owned = shallow_copy(region)
+        if self.regions.get(region.region_id) is region:
+            self.regions[region.region_id] = owned
+            self._owned.add(region.region_id)
+            if self.map.get(region.direction) is region:
+                self.map[region.direction] = owned
+        return owned
+
+    def _own_index(self):
+        if self._shares_index:
+            self.index = self.index.copy()
+            self._shares_index = False
+
+    def _add_regions(self, regions):
+        self.version += 1
+        self._own_index()
+        for region in regions:
+            self.regions[region.region_id] = region
+            self._owned.add(region.region_id)
+            self.index.insert(region.region_id, region.x, region.y)
+            if not region.discovered:
+                self.undiscovered.add(region.region_id)
+
     def get_region(self, direction):
-        return self.map[direction]
+        if direction in self.map:
+            return self.map[direction]
+        found = self.in_direction(direction)
+        return found[0] if found else None
     
     def get_all_regions(self):
-        return [self.map[d] for d in self.directions]
+        return list(self.regions.values())
 
-    def _generate_map(self, quests_to_spawn):
-        quest_bank = load_quest_bank()
-        roots = quest_bank[quest_bank['is_chain_root'] == 1]
-        
-        selected_quests = [QuestFactory().from_dict(row.to_dict()) 
-                        for _, row in roots.sample(quests_to_spawn).iterrows()]
-        selected_directions = random.sample(self.directions, quests_to_spawn)
+    def region(self, region_id) -> Region:
+        return self.regions[region_id]
+
+    def nearest(self, x: float, y: float, k: int = 1) -> list[Region]:
+        return [self.regions[i] for i in self.index.nearest(x, y, k)]
+
+    def within_radius(self, x: float, y: float, radius: float) -> list[Region]:
+        return [self.regions[i] for i in self.index.within_radius(x, y, radius)]
+
+    def in_direction(
+        self, direction: str, x: float = 0.0, y: float = 0.0, k: int = 1
+    ) -> list[Region]:
+        return [self.regions[i] for i in self.index.in_direction(x, y, direction, k)]
+
+    def explore(self, region: Region, rng=random):
+        """
+        Marks a region as discovered and reveals the regions around it. Its
+        quest, if it's yet to be built, rolls on `rng`.
+        """
+        region = self.regions.get(region.region_id, region)
+        if region.discovered:
+            return None
+        quest = self._own_region(region).explore(rng)
+        self.undiscovered.discard(region.region_id)
+        self._reveal_around(region.x, region.y)
+        return quest
+
+    def pop_newly_revealed(self) -> list[Region]:
+        """Undiscovered regions revealed since the last call"""
+        revealed, self._newly_revealed = self._newly_revealed, []
+        # Regions copied since they were queued are looked up again
+        revealed = [self.regions.get(r.region_id, r) for r in revealed]
+        return [r for r in revealed if not r.discovered]
+
+    def requeue(self, region: Region):
+        """Offers a revealed region again, e.g. after its exploration quest expired"""
+        region = self.regions.get(region.region_id, region)
+        if not region.discovered:
+            self._newly_revealed.append(region)
 
-        dir_quest_dict = dict(zip(selected_directions, selected_quests))
+    def _regions_in_sight(self, x, y):
+        if self.sight_radius is None:
+            return list(self.regions)
+        return self.index.within_radius(x, y, self.sight_radius)
+
+    def _reveal_around(self, x, y):
+        for region_id in self._regions_in_sight(x, y):
+            if region_id not in self.revealed and region_id in self.undiscovered:
+                self.revealed.add(region_id)
+                self._newly_revealed.append(self.regions[region_id])
+
+    def _generate_map(self, quests_to_spawn, rng=random):
+        selected_templates = rng.sample(_chain_root_templates(), quests_to_spawn)
+        selected_directions = rng.sample(self.directions, quests_to_spawn)
+
+        dir_template_dict = dict(zip(selected_directions, selected_templates))
         world_map = {}
         
-        for direction in self.directions:
-            island_name = f"{random.choice(ISLAND_NAMES)} {random.choice(ISLAND_TYPES)}"
+        for region_id, direction in enumerate(self.directions):
+            island_name = f"{rng.choice(ISLAND_NAMES)} {rng.choice(ISLAND_TYPES)}"
+            distance = rng.randint(2, 5)
+            dx, dy = compass_vector(direction)
             world_map[direction] = Region(
                 island_name=island_name,
-                available_quest=dir_quest_dict.get(direction, None),
-                distance=random.randint(2, 5),
-                direction=direction
+                quest_template=dir_template_dict.get(direction),
+                distance=distance,
+                direction=direction,
+                region_id=region_id,
+                x=dx * distance,
+                y=dy * distance,
+            )
+
+        return world_map
+
+    def _generate_scattered_regions(
+        self, quests_to_spawn, n_regions, radius, rng=random
+    ):
+        templates = _chain_root_templates()
+        n_quests = min(quests_to_spawn, n_regions)
+        quest_regions = {
+            region_id: rng.choice(templates)
+            for region_id in rng.sample(range(n_regions), n_quests)
+        }
+
+        regions = []
+        for region_id in range(n_regions):
+            # Uniform over the disc, keeping clear of the home port
+            r = radius * max(rng.random(), 1e-4) ** 0.5
+            angle = rng.uniform(0, 2 * math.pi)
+            x, y = r * math.cos(angle), r * math.sin(angle)
+            island_name = f"{rng.choice(ISLAND_NAMES)} {rng.choice(ISLAND_TYPES)}"
+            regions.append(
+                Region(
+                    island_name=island_name,
+                    direction=compass_direction(x, y),
+                    quest_template=quest_regions.get(region_id),
+                    distance=max(1, round(r)),
+                    region_id=region_id,
+                    x=x,
+                    y=y,
+                )
             )
+        return regions
+
+
+class ProceduralWorldMap(WorldMap):
+    """
+    Unbounded open sea generated in square chunks on first use.
+
+    Each chunk is derived only from the map seed and its coordinates, so it
+    can be dropped and rebuilt at any time. Chunks that are fully explored (or
+    were never revealed) go into an LRU of `max_idle_chunks` and are evicted
+    from it, so memory stays bounded however far the crew sails. Only the ids
+    of discovered and revealed regions are kept for the whole run.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        chunk_size: float = 20.0,
+        regions_per_chunk: tuple[int, int] = (2, 6),
+        quest_chance: float = 0.15,
+        sight_radius: float = 8.0,
+        max_idle_chunks: int = 64,
+    ) -> None:
+        self.directions = [
+            "NORTH",
+            "SOUTH",
+            "EAST",
+            "WEST",
+            "NORTHEAST",
+            "NORTHWEST",
+            "SOUTHEAST",
+            "SOUTHWEST",
+        ]
+        self.map = {}
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.regions_per_chunk = regions_per_chunk
+        self.quest_chance = quest_chance
+        self.sight_radius = sight_radius
+        self.max_idle_chunks = max_idle_chunks
+
+        self.index = GridIndex(cell_size=sight_radius)
+        self.regions: dict[Hashable, Region] = {}
+        self.undiscovered: set = set()
+        # Bumped whenever regions are added or dropped, see routing.SeaRouter
+        self.version = 0
+        # After a clone the regions and index are shared until changed, only
+        # the ids of regions copied since are this map's own
+        self._owned: set = set()
+        self._shares_index = False
+
+        self.discovered: set = set()
+        self.revealed: set = set()
+        self._newly_revealed: list[Region] = []
+
+        # Chunks in use, and evictable chunks in least recently used order
+        self._active_chunks: dict[tuple[int, int], list[Region]] = {}
+        self._idle_chunks: OrderedDict[tuple[int, int], list[Region]] = OrderedDict()
+
+        self._reveal_around(0.0, 0.0)
+
+    @property
+    def n_materialized_chunks(self) -> int:
+        return len(self._active_chunks) + len(self._idle_chunks)
+
+    def _chunk_rng(self, cx, cy) -> random.Random:
+        digest = hashlib.blake2b(
+            f"{self.seed}:{cx}:{cy}".encode(), digest_size=8
+        ).digest()
+        return random.Random(int.from_bytes(digest, "little"))
+
+    def _generate_chunk(self, cx, cy) -> list[Region]:
+        rng = self._chunk_rng(cx, cy)
+        templates = _chain_root_templates()
+
+        regions = []
+        for i in range(rng.randint(*self.regions_per_chunk)):
+            x = (cx + rng.random()) * self.chunk_size
+            y = (cy + rng.random()) * self.chunk_size
+            template = None
+            if rng.random() < self.quest_chance:
+                template = rng.choice(templates)
+            hazard = rng.random() ** 3
+            region = Region(
+                island_name=f"{rng.choice(ISLAND_NAMES)} {rng.choice(ISLAND_TYPES)}",
+                direction=compass_direction(x, y),
+                quest_template=template,
+                hazard=hazard,
+                distance=max(1, round(math.hypot(x, y))),
+                region_id=(cx, cy, i),
+                x=x,
+                y=y,
+            )
+            region.discovered = region.region_id in self.discovered
+            regions.append(region)
+        return regions
+
+    def chunk(self, cx: int, cy: int) -> list[Region]:
+        key = (cx, cy)
+        if key in self._active_chunks:
+            return self._active_chunks[key]
+        if key in self._idle_chunks:
+            self._idle_chunks.move_to_end(key)
+            return self._idle_chunks[key]
+
+        regions = self._generate_chunk(cx, cy)
+        self._add_regions(regions)
+        self._file_chunk(key, regions)
+        return regions
+
+    def _file_chunk(self, key, regions):
+        """Files a chunk as active or idle depending on its exploration state"""
+        idle = all(r.discovered for r in regions) or not any(
+            r.region_id in self.revealed for r in regions
+        )
+        if not idle:
+            self._idle_chunks.pop(key, None)
+            self._active_chunks[key] = regions
+            return
+
+        self._active_chunks.pop(key, None)
+        self._idle_chunks[key] = regions
+        self._idle_chunks.move_to_end(key)
+
+    def clone(self) -> "ProceduralWorldMap":
+        clone = super().clone()
+        clone.discovered = set(self.discovered)
+        clone._active_chunks = dict(self._active_chunks)
+        clone._idle_chunks = OrderedDict(self._idle_chunks)
+        return clone
+
+    def _own_region(self, region: Region) -> Region:
+        owned = super()._own_region(region)
+        # Chunks list their regions too
+        key = region.region_id[:2]
+        for chunks in (self._active_chunks, self._idle_chunks):
+            if key in chunks:
+                chunks[key] = [owned if r is region else r for r in chunks[key]]
+        return owned
+
+    def _evict_idle_chunks(self):
+        # Only done before a new query, so the chunks a query just built
+        # stay around long enough for its results to be used
+        while len(self._idle_chunks) > self.max_idle_chunks:
+            _, evicted = self._idle_chunks.popitem(last=False)
+            self.version += 1
+            self._own_index()
+            for region in evicted:
+                del self.regions[region.region_id]
+                self._owned.discard(region.region_id)
+                self.index.remove(region.region_id)
+                self.undiscovered.discard(region.region_id)
+
+    def _chunk_key(self, x, y):
+        return math.floor(x / self.chunk_size), math.floor(y / self.chunk_size)
+
+    def _materialize_box(self, x, y, radius):
+        self._evict_idle_chunks()
+        cx0, cy0 = self._chunk_key(x - radius, y - radius)
+        cx1, cy1 = self._chunk_key(x + radius, y + radius)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self.chunk(cx, cy)
+
+    def nearest(self, x, y, k=1, max_distance=None):
+        max_distance = max_distance or self.chunk_size
+        self._materialize_box(x, y, max_distance)
+        return [
+            self.regions[i]
+            for i in self.index.nearest(x, y, k, max_distance=max_distance)
+        ]
+
+    def within_radius(self, x, y, radius):
+        self._materialize_box(x, y, radius)
+        return super().within_radius(x, y, radius)
+
+    def in_direction(self, direction, x=0.0, y=0.0, k=1, max_distance=None):
+        max_distance = max_distance or self.chunk_size
+        self._materialize_box(x, y, max_distance)
+        return [
+            self.regions[i]
+            for i in self.index.in_direction(
+                x, y, direction, k, max_distance=max_distance
+            )
+        ]
+
+    def explore(self, region: Region, rng=random):
+        self.discovered.add(region.region_id)
+        quest = super().explore(region, rng)
+
+        key = region.region_id[:2]
+        self._file_chunk(key, self.chunk(*key))
+        return quest
+
+    def _regions_in_sight(self, x, y):
+        self._materialize_box(x, y, self.sight_radius)
+        return self.index.within_radius(x, y, self.sight_radius)
+
+    def _reveal_around(self, x, y):
+        super()._reveal_around(x, y)
 
-        return world_map
\ No newline at end of file
+        touched = {region.region_id[:2] for region in self._newly_revealed}
+        for key in touched:
+            self._file_chunk(key, self.chunk(*key))
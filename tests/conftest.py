@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+from piratesim.quests.quest import QuestType
+from piratesim.quests.quest_factory import QuestFactory
+
+
+@pytest.fixture
+def make_board():
+    """Builds a board of random (non idle) quests with random bounties"""
+
+    def make_board(n_quests):
+        quests = []
+        for i in range(n_quests):
+            qtype = random.choice([t for t in QuestType if t is not QuestType.idle])
+            quest = QuestFactory().build_quest(
+                name=f"Haunted quest {i}" if i % 4 == 0 else f"Quest {i}",
+                qtype=qtype,
+                expiration=10,
+                distance=3,
+                difficulty=random.randint(1, 5),
+                reward=random.randint(0, 30) * 10,
+            )
+            quest.bounty = random.choice([0, 10, 20, 50, 100, 150])
+            quests.append(quest)
+        return quests
+
+    return make_board
@@ -0,0 +1,40 @@
+import numpy as np
+
+from piratesim.chains import Archetype, chain_value, voyage_turns
+from piratesim.odds import stat_probabilities
+from piratesim.quests import load_quest_bank
+from piratesim.quests.quest import QuestType
+from piratesim.selection import QuestBoard
+from piratesim.trait import TraitFactory
+
+
+def test_last_quest_of_a_chain_is_retried_until_success():
+    # Deliver the Cursed Chest: a delivery ending its chain, which is retried
+    # on failure without consequences for the pirate
+    archetype = Archetype("greedy", navigation=5, combat=2, trickyness=3)
+    value = chain_value(3, archetype, bounty=60)
+
+    grid = np.meshgrid([2, 3], np.arange(50, 61) * 10)
+    difficulty, reward = (a.ravel() for a in grid)
+    board = QuestBoard.from_columns(
+        difficulty, 60, reward, QuestType.delivery.value, True
+    )
+    p = stat_probabilities(
+        [50], [[5, 2, 3]], [TraitFactory.get_trait("greedy").trait_id], board
+    )[0]
+
+    assert np.isclose(value.gold, np.mean(reward - 60 / p))
+    assert np.isclose(value.notoriety, np.mean(3 + 2 * (1 - p) / p))
+    assert np.isclose(value.turns, np.mean(voyage_turns(5) / p))
+    assert value.completion == 1.0
+
+
+def test_chain_value_includes_the_rest_of_the_chain():
+    quest_bank = load_quest_bank()
+    archetype = Archetype("bold", navigation=2, combat=4, trickyness=4, morale=70)
+
+    for quest_id, template in quest_bank[quest_bank["next_in_chain"] >= 0].iterrows():
+        value = chain_value(quest_id, archetype)
+        rest = chain_value(template["next_in_chain"], archetype)
+        assert value.turns > rest.turns
+        assert value.completion <= rest.completion
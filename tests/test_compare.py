@@ -0,0 +1,44 @@
+import math
+from unittest.mock import patch
+
+from piratesim.common.random import RandomStreams
+from piratesim.compare import compare_variants, t_quantile
+from piratesim.simulation import new_headless_run
+from piratesim.trait import BoldTrait
+
+
+def test_streams_do_not_depend_on_each_other():
+    streams, other = RandomStreams(3), RandomStreams(3)
+    other.stream("encounter", "Redbeard").random()
+
+    assert [streams.stream("pirate", "Redbeard").random() for _ in range(5)] == [
+        other.stream("pirate", "Redbeard").random() for _ in range(5)
+    ]
+    assert streams.stream("pirate", "Redbeard") is streams.stream("pirate", "Redbeard")
+
+
+def test_common_random_numbers_pair_runs():
+    def baseline(seed):
+        return new_headless_run(seed, common_random_numbers=True)
+
+    def bolder(seed):
+        run = new_headless_run(seed, common_random_numbers=True)
+        modifiers = ((1.5, False), (-0.5, False))
+        with patch.object(BoldTrait, "resolution_modifiers", modifiers):
+            run.simulate(40)
+        return run
+
+    same = compare_variants(baseline, baseline, range(1, 11), max_turns=40)
+    assert (same[["mean", "low", "high"]] == 0).all().all()
+
+    tweaked = compare_variants(baseline, bolder, range(1, 21), max_turns=40)
+    gold = tweaked.set_index("metric").loc["gold"]
+    assert gold["low"] <= gold["mean"] <= gold["high"]
+    assert gold["variance_reduction"] > 1
+
+
+def test_t_quantiles_hold_for_few_pairs():
+    # Two sided 95% critical values of Student's t
+    for dof, expected in ((1, 12.7062), (2, 4.3027), (4, 2.7764), (9, 2.2622)):
+        assert math.isclose(t_quantile(0.975, dof), expected, abs_tol=1e-4)
+    assert math.isclose(t_quantile(0.975, 30), 2.0423, abs_tol=1e-4)
@@ -0,0 +1,37 @@
+from piratesim.encounters.effects import MoraleEffect
+from piratesim.encounters.encounter import Encouter
+from piratesim.encounters.resolver import EncounterResolver
+from piratesim.pirate import load_pirate_bank
+
+
+def make_encounter(odds):
+    return Encouter(
+        title="Fog",
+        description="Fog around {name}",
+        options=["Sail", "Wait"],
+        success_odds=odds,
+        success_texts=["{name} made it", "It cleared"],
+        failure_texts=["{name} got lost", "Time was lost"],
+        success_effects=[[MoraleEffect(5)]] * 2,
+        failure_effects=[[MoraleEffect(-5)]] * 2,
+    )
+
+
+def test_batch_resolution():
+    pirate, other = load_pirate_bank()[:2]
+    morale = pirate.morale
+    encounter = make_encounter([1.0, 0.0])
+
+    resolver = EncounterResolver(seed=0)
+    outcomes = resolver.resolve_batch(
+        [(encounter, pirate, 0)] * 2000 + [(encounter, other, 1)] * 10
+    )
+
+    assert len(outcomes) == 2010
+    assert all(o.probability == 0.5 for o in outcomes[:2000])
+    assert 900 < sum(o.success for o in outcomes[:2000]) < 1100
+    assert not any(o.success for o in outcomes[2000:])
+
+    assert pirate.morale == morale + sum(o.morale_delta for o in outcomes[:2000])
+    assert other.morale == morale - 50
+    assert outcomes[-1].text == "Time was lost"
@@ -0,0 +1,41 @@
+import asyncio
+import random
+
+from piratesim.decisions import Notice
+from piratesim.host.loadtest import choose, load_test
+from piratesim.host.server import SessionHost, decision_message
+
+
+def test_concurrent_sessions(tmp_path):
+    host = SessionHost(max_runs=1)
+    report = asyncio.run(load_test(str(tmp_path / "host.sock"), 6, 3, host))
+
+    assert report["sessions"] == 6
+    assert report["decisions"] > 0
+    assert not host.sessions
+
+
+def play_interleaved(sessions):
+    """Answers each session's decisions in turn, as the host interleaves them"""
+    players = [random.Random(0) for _ in sessions]
+    pending = {i: next(session.steps) for i, session in enumerate(sessions)}
+    while pending:
+        for i, decision in list(pending.items()):
+            # Other code drawing from the global generator mustn't matter
+            random.random()
+            answer = None
+            if not isinstance(decision, Notice):
+                message = decision_message(decision)
+                answer = decision.parse(choose(message, players[i]))
+            try:
+                pending[i] = sessions[i].steps.send(answer)
+            except StopIteration:
+                del pending[i]
+    return [[str(run.turn_log) for run in session.game.runs] for session in sessions]
+
+
+def test_sessions_replay_their_seed():
+    alone = play_interleaved([SessionHost(max_runs=1, seed=5).new_session()])
+    host = SessionHost(max_runs=1, seed=5)
+    together = play_interleaved([host.new_session(), host.new_session()])
+    assert together == alone * 2
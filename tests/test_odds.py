@@ -0,0 +1,84 @@
+import itertools
+import random
+
+import numpy as np
+
+from piratesim.common.random import RouletteSelector
+from piratesim.odds import (
+    RELEVANT_STAT,
+    invalidate_odds_surface,
+    odds_surface,
+    success_probabilities,
+)
+from piratesim.pirate import load_pirate_bank
+from piratesim.quests.quest import QuestType
+from piratesim.selection import QuestBoard
+from piratesim.trait import TRAITS, TraitFactory
+
+
+def roulette_probability(pirate, quest):
+    """The success roulette Pirate.progress_quest used to roll"""
+    roulette = RouletteSelector([True, False])
+    roulette.set_chance(True, 2.0)
+    roulette.apply_modifier(True, (pirate.morale - 40) / 100)
+    (modifier,), (multiplicative,) = pirate.trait.resolution_arrays(QuestBoard([quest]))
+    roulette.apply_modifier(True, modifier, bool(multiplicative))
+    noise = pirate.trait.resolution_noise
+    roulette.apply_modifier(True, random.uniform(-noise, noise) if noise else 0.0)
+    stat = getattr(pirate, RELEVANT_STAT[quest.qtype])
+    roulette.apply_modifier(True, 1 + max(0, stat - quest.difficulty) * 0.10, True)
+    roulette._remove_impossible_items()
+    return roulette.get_probabilities().get(True, 0.0)
+
+
+def test_closed_form_matches_the_roulette(make_board):
+    random.seed(5)
+    quests = make_board(60)
+    pirates = []
+    for trait in TRAITS:
+        for morale in (0, 50, 100):
+            pirate = random.choice(load_pirate_bank())
+            pirate.trait, pirate.morale = trait, morale
+            pirates.append(pirate)
+
+    probabilities = success_probabilities(pirates, quests)
+    impulsive = TraitFactory.get_trait("impulsive")
+    for i, pirate in enumerate(pirates):
+        for j, quest in enumerate(quests):
+            if pirate.trait is impulsive:
+                if j < 10:
+                    expected = np.mean(
+                        [roulette_probability(pirate, quest) for _ in range(2000)]
+                    )
+                    assert abs(probabilities[i, j] - expected) < 0.01
+            else:
+                assert np.isclose(
+                    probabilities[i, j], roulette_probability(pirate, quest)
+                )
+
+
+def test_idle_quests_always_succeed():
+    pirate = load_pirate_bank()[0]
+    quest = pirate.get_random_idle_quest()
+    assert quest.qtype is QuestType.idle
+    assert pirate.success_probability(quest) == 1.0
+
+
+def test_odds_surface_matches_the_closed_form(make_board):
+    random.seed(8)
+    quests = make_board(60)
+    pirates = load_pirate_bank()
+    for pirate, morale in zip(pirates, itertools.cycle([-15, 0, 37, 50, 90, 140])):
+        pirate.morale = morale
+    # Pirates off the tabulated morale and stat surpluses get the exact odds
+    pirates[0].trickyness, pirates[1].combat, pirates[2].morale = 30, 25, 42.5
+
+    surface = odds_surface()
+    assert odds_surface() is surface
+    assert odds_surface(check=True) is surface
+    assert np.allclose(
+        surface.success_odds(pirates, quests), success_probabilities(pirates, quests)
+    )
+
+    invalidate_odds_surface()
+    assert odds_surface() is not surface
@@ -0,0 +1,52 @@
+from piratesim.common.profiler import PROFILER, Profiler, profiled
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.section("turn"):
+        pass
+
+    assert profiler.stats == {}
+    assert profiler.events == []
+
+
+def test_nested_sections():
+    profiler = Profiler()
+    profiler.enable()
+
+    for _ in range(3):
+        with profiler.section("turn"):
+            with profiler.section("turn.progress_quest"):
+                [object() for _ in range(10)]
+
+    summary = {row["name"]: row for row in profiler.summary()}
+    assert summary["turn"]["calls"] == 3
+    assert summary["turn.progress_quest"]["calls"] == 3
+    assert summary["turn"]["total_ms"] >= summary["turn.progress_quest"]["total_ms"]
+
+    trace = profiler.to_chrome_trace()
+    assert len(trace["traceEvents"]) == 6
+    assert trace["traceEvents"][0]["name"] == "turn"
+
+    events = profiler.to_speedscope()["profiles"][0]["events"]
+    assert [e["type"] for e in events[:4]] == ["O", "O", "C", "C"]
+    assert all(a["at"] <= b["at"] for a, b in zip(events, events[1:]))
+
+
+def test_profiled_decorator():
+    @profiled("double")
+    def double(x):
+        return 2 * x
+
+    PROFILER.reset()
+    assert double(2) == 4
+    assert "double" not in PROFILER.stats
+
+    PROFILER.enable()
+    try:
+        assert double(3) == 6
+    finally:
+        PROFILER.disable()
+
+    assert PROFILER.stats["double"][0] == 1
+    PROFILER.reset()
@@ -0,0 +1,48 @@
+from piratesim.pirate import load_pirate_bank
+from piratesim.quests.effects import BountyEffect, RewardEffect
+from piratesim.quests.quest_effect import EffectBuffer
+from piratesim.quests.quest_factory import QuestFactory
+
+TEMPLATE = {
+    "name": "Deliver the rum",
+    "type": "delivery",
+    "difficulty_min": 1,
+    "difficulty_max": 1,
+    "reward_min": 100,
+    "reward_max": 100,
+}
+
+
+def test_effects_are_shared_between_quests():
+    first = QuestFactory().from_dict(TEMPLATE)
+    second = QuestFactory().from_dict(TEMPLATE)
+
+    assert [id(e) for e in first.all_effects] == [id(e) for e in second.all_effects]
+    assert RewardEffect.shared(100) in first.success_effects
+
+
+def test_effect_buffer_applies_bindings_at_the_end():
+    class Run:
+        gold = 500
+        notoriety = 0
+
+    pirates = load_pirate_bank()[:2]
+    for pirate in pirates:
+        pirate.gold = 0
+    quests = [QuestFactory().from_dict(TEMPLATE) for _ in pirates]
+    buffer = EffectBuffer()
+    for bounty, quest, pirate in zip((10, 30), quests, pirates):
+        quest.bounty = bounty
+        quest.on_pinned()
+        quest.on_selected(pirate)
+        buffer.push([BountyEffect.shared()], quest.binding, header=quest.name)
+
+    # Pinning the quest again doesn't change what was queued
+    quests[0].bounty = 90
+    quests[0].on_pinned()
+    assert Run.gold == 500
+
+    log = buffer.apply(Run)
+    assert Run.gold == 460
+    assert [p.gold for p in pirates] == [10, 30]
+    assert log[0] == "Deliver the rum" and len(buffer) == 0
@@ -0,0 +1,50 @@
+import math
+
+from piratesim.rare_events import NOTORIETY, splitting_estimate
+from piratesim.simulation import new_headless_run
+
+
+def test_clones_play_independently():
+    run = new_headless_run(seed=5)
+    run.simulate(5)
+    state = (run.turn, run.gold, run.notoriety, len(run.turn_log))
+
+    clone = run.clone(seed=1)
+    clone.simulate(10)
+
+    assert (run.turn, run.gold, run.notoriety, len(run.turn_log)) == state
+    assert clone.turn == 15
+    assert all(a is not b for a, b in zip(run.pirates, clone.pirates))
+
+
+def test_splitting_estimate_is_reproducible():
+    def estimate():
+        return splitting_estimate(
+            lambda: new_headless_run(seed=1),
+            NOTORIETY,
+            horizon=12,
+            levels=(0.05, 0.1),
+            n_per_stage=8,
+            replications=3,
+            seed=4,
+        )
+
+    first = estimate()
+    assert first == estimate()
+    assert 0 <= first.probability <= 1 and math.isfinite(first.stderr)
+    assert len(first.stage_probabilities) == 3
+
+
+def test_clones_with_the_same_seed_play_alike():
+    run = new_headless_run(seed=5)
+    run.simulate(5)
+
+    first, second = run.clone(seed=42), run.clone(seed=42)
+    first.simulate(20)
+    second.simulate(20)
+    assert (first.turn, first.gold, first.notoriety) == (
+        second.turn,
+        second.gold,
+        second.notoriety,
+    )
+    assert first.turn_log == second.turn_log
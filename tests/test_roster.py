@@ -0,0 +1,20 @@
+import random
+
+from piratesim.pirate import PirateRoster, load_pirate_bank
+
+
+def test_roster_recruits_every_locked_pirate_once():
+    random.seed(0)
+    bank = load_pirate_bank()
+    roster = PirateRoster(bank, unlocked=bank[:2])
+    assert roster.unlocked == bank[:2]
+    assert not roster.unlock(bank[0])
+
+    recruited = []
+    while (pirate := roster.sample_locked()) is not None:
+        assert not roster.is_unlocked(pirate)
+        assert roster.unlock(pirate)
+        recruited.append(pirate)
+
+    assert sorted(p.pirate_id for p in recruited) == list(range(2, len(bank)))
+    assert len(roster.unlocked) == len(bank) and roster.n_locked == 0
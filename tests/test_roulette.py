@@ -78,3 +78,11 @@ def test_remove_impossible_items():
             q2_chosen += 1
 
     assert q2_chosen < q1_chosen
+
+
+def test_only_verbose_roulettes_print_their_rolls(capsys):
+    RouletteSelector([True, False], verbose=True).roll()
+    assert "✔️" in capsys.readouterr().out
+
+    RouletteSelector([True, False]).roll()
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,32 @@
+from piratesim.policies import POLICIES
+from piratesim.search import SearchPolicy
+from piratesim.simulation import new_headless_run
+
+
+def _play():
+    policy = SearchPolicy(seed=3, time_budget=None, max_rollouts=8, horizon=3)
+    run = new_headless_run(seed=3, policy=policy)
+    run.simulate(6)
+    return run, policy
+
+
+def test_search_policy_is_reproducible_without_a_time_budget():
+    first, policy = _play()
+    second, _ = _play()
+
+    assert (first.turn, first.gold, first.notoriety) == (
+        second.turn,
+        second.gold,
+        second.notoriety,
+    )
+    assert policy.stats.decisions > 0
+    assert policy.stats.rollouts == 8 * policy.stats.decisions
+    assert 1 <= policy.stats.mean_depth <= 3
+
+
+def test_search_policy_rolls_out_on_a_thread_pool():
+    with SearchPolicy(seed=1, time_budget=0.05, workers=2) as policy:
+        run = new_headless_run(seed=1, policy=policy)
+        run.simulate(2)
+    assert policy.stats.rollouts > 0
+    assert "search" in POLICIES
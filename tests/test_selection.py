@@ -0,0 +1,85 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from piratesim.common.random import RandomStreams
+from piratesim.pirate import load_pirate_bank
+from piratesim.quests.quest import QuestType
+from piratesim.selection import ASSIGNMENT_MODES, QuestBoard, QuestSelector
+from piratesim.trait import TRAITS, TraitFactory
+
+
+def test_kernel_matches_the_roulette(make_board):
+    random.seed(3)
+    quests = make_board(40)
+    pirates = []
+    for trait in TRAITS:
+        if trait is TraitFactory.get_trait("impulsive"):
+            continue
+        pirate = load_pirate_bank()[0]
+        pirate.trait = trait
+        pirates.append(pirate)
+    idle_quests = [p.get_random_idle_quest() for p in pirates]
+
+    chances, idle_chances, _ = QuestSelector(seed=0).weights(
+        pirates, QuestBoard(quests), QuestBoard(idle_quests)
+    )
+    weights = np.maximum(np.column_stack([chances, idle_chances]), 0)
+    probabilities = weights / weights.sum(axis=1, keepdims=True)
+
+    for i, (pirate, idle_quest) in enumerate(zip(pirates, idle_quests)):
+        roulette = pirate.selection_roulette(quests, idle_quest)
+        expected = roulette.get_probabilities()
+        for j, quest in enumerate(quests + [idle_quest]):
+            probability = max(0, expected[quest])
+            assert np.isclose(probabilities[i, j], probability), pirate.trait
+
+
+@pytest.mark.parametrize("mode", ASSIGNMENT_MODES)
+def test_quests_are_taken_once(mode, make_board):
+    random.seed(4)
+    quests = make_board(5)
+    for quest in quests:
+        quest.bounty = 100
+    pirates = load_pirate_bank()[:8]
+
+    selected = QuestSelector(seed=1, mode=mode).select(pirates, quests)
+    taken = [q for q in selected if q.qtype is not QuestType.idle]
+    assert len(taken) == len(set(taken))
+    if mode == "optimal":
+        # Every quest is worth more than idling to someone
+        assert len(taken) == len(quests)
+
+
+def test_optimal_assignment_maximizes_total_weight():
+    rng = np.random.default_rng(0)
+    selector = QuestSelector(mode="optimal")
+    for _ in range(50):
+        weights = rng.random((3, 5)) * (rng.random((3, 5)) > 0.3)
+        picks = selector._assign_optimal(weights).tolist()
+
+        def total(assignment):
+            return sum(
+                weights[i, -1 if j == 4 else j] for i, j in enumerate(assignment)
+            )
+
+        options = [
+            a
+            for a in itertools.product(range(5), repeat=3)
+            if len([j for j in a if j < 4]) == len({j for j in a if j < 4})
+            and all(j == 4 or weights[i, j] > 0 for i, j in enumerate(a))
+        ]
+        assert np.isclose(total(picks), max(total(a) for a in options))
+
+
+def test_pirates_roll_on_their_own_generators():
+    pirates = load_pirate_bank()[:4]
+
+    def selected(pirates):
+        streams = RandomStreams(1)
+        rngs = [streams.stream("select", p.name) for p in pirates]
+        return [q.name for q in QuestSelector(seed=0).select(pirates, [], rngs)]
+
+    assert selected(pirates)[1:] == selected(pirates[1:])
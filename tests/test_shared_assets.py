@@ -0,0 +1,32 @@
+import pytest
+
+from piratesim.common.assets import get_asset
+from piratesim.common.shared_assets import SharedAssets, TableRows
+from piratesim.encounters.encounter_manager import encounter_table
+from piratesim.pirate import pirate_table
+from piratesim.quests import quest_bank_table
+
+
+def test_shared_tables_match_the_compiled_ones():
+    compiled = {"encounters": encounter_table(), "quest_bank": quest_bank_table()}
+    with SharedAssets.publish(list(compiled)) as shared:
+        attached = SharedAssets.attach(shared.name)
+        for name, table in compiled.items():
+            views = attached.table(name)
+            assert list(views) == list(table)
+            for column, values in views.items():
+                assert values.dtype == table[column].dtype
+                assert values.shape == table[column].shape
+                assert values.tobytes() == table[column].tobytes()
+
+        with pytest.raises(ValueError):
+            attached.table("encounters")["n_options"][0] = 3
+        attached.close()
+
+
+def test_table_rows_read_like_the_parsed_rows():
+    rows = TableRows(pirate_table())
+    parsed = get_asset("pirates/pirates.csv")
+    assert len(rows) == len(parsed)
+    assert rows[-1] == parsed.iloc[-1].to_dict()
+    assert [dict(row) for row in rows] == parsed.to_dict("records")
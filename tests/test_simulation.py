@@ -0,0 +1,53 @@
+import builtins
+
+import pytest
+
+from piratesim.simulation import new_headless_run
+from piratesim.world_map import ProceduralWorldMap
+
+
+@pytest.fixture
+def no_input(monkeypatch):
+    def fail(*args):
+        raise AssertionError("Headless runs must not prompt the player")
+
+    monkeypatch.setattr(builtins, "input", fail)
+
+
+def test_headless_run_is_reproducible(no_input):
+    outcomes = []
+    for _ in range(2):
+        run = new_headless_run(seed=42)
+        game_over, reason = run.simulate(30)
+        outcomes.append((game_over, reason, run.turn, run.gold, run.notoriety))
+
+    assert outcomes[0] == outcomes[1]
+    assert outcomes[0][2] <= 30
+
+
+def test_headless_run_sails_a_procedural_map(no_input):
+    outcomes = []
+    for _ in range(2):
+        run = new_headless_run(seed=2, procedural_map=True)
+        game_over, reason = run.simulate(60)
+        discovered = sorted(run.world_map.discovered)
+        outcomes.append((game_over, reason, run.turn, run.gold, discovered))
+
+    assert isinstance(run.world_map, ProceduralWorldMap)
+    assert outcomes[0] == outcomes[1]
+    assert run.world_map.discovered
+
+
+def test_clone_replays_the_original(no_input):
+    run = new_headless_run(seed=7, common_random_numbers=True)
+    run.simulate(20)
+    clone = run.clone()
+
+    outcomes = []
+    for played in (clone, run):
+        game_over, reason = played.simulate(20)
+        log = [line for lines in played.turn_log.values() for line in lines]
+        outcomes.append((game_over, reason, played.turn, played.gold, log))
+
+    assert outcomes[0] == outcomes[1]
+    assert all(a is not b for a, b in zip(run.pirates, clone.pirates))
@@ -0,0 +1,48 @@
+import argparse
+
+import pytest
+
+from piratesim.sweep import ResultCache, SweepCell, cell_assets, parse_seeds, sweep
+
+
+def test_sweeps_only_play_cells_missing_from_the_cache(tmp_path):
+    cache = ResultCache(tmp_path)
+    grid = {"random_encounter_chance": [0.0, 1.0]}
+
+    first = sweep(grid, range(1, 4), max_turns=10, cache=cache, processes=1)
+    assert len(first) == 6 and not first["cached"].any()
+
+    grid["starting_gold"] = [500, 1000]
+    second = sweep(grid, range(1, 4), max_turns=10, cache=cache, processes=1)
+    assert second["cached"].sum() == 6
+    cached = second[second["cached"]].drop(columns="cached").reset_index(drop=True)
+    assert cached.equals(first.drop(columns="cached"))
+
+
+def test_cells_without_encounters_do_not_depend_on_them():
+    assert "encounters/encounters.csv" in cell_assets(SweepCell())
+    assert "encounters/encounters.csv" not in cell_assets(
+        SweepCell(random_encounter_chance=0.0)
+    )
+
+
+def test_recycled_workers_play_the_same_runs(tmp_path):
+    grid = {"n_quests": [2, 3]}
+    serial = sweep(grid, range(1, 5), 10, ResultCache(tmp_path / "serial"), 1)
+    pooled = sweep(
+        grid,
+        range(1, 5),
+        10,
+        ResultCache(tmp_path / "pooled"),
+        processes=2,
+        max_runs_per_worker=1,
+    )
+    assert pooled.equals(serial)
+
+
+def test_seeds_must_be_positive(tmp_path):
+    assert parse_seeds("3") == range(1, 4)
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_seeds("0:10")
+    with pytest.raises(ValueError):
+        sweep({}, [0, 1], cache=ResultCache(tmp_path), processes=1)
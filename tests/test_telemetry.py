@@ -0,0 +1,50 @@
+import pytest
+
+from piratesim.simulation import new_headless_run
+from piratesim.telemetry import RunObserver, TelemetryRecorder, read_table
+
+
+class Collector(RunObserver):
+    def __init__(self):
+        self.quests = []
+        self.turns = []
+
+    def on_quest_concluded(self, run, binding, success, gold_delta, notoriety_delta):
+        self.quests.append((run.turn, binding.quest.name, success, gold_delta))
+
+    def on_turn_ended(self, run, game_over, reason):
+        self.turns.append((run.turn, run.gold, game_over))
+
+
+def test_observers_see_every_turn_and_concluded_quest():
+    collector = Collector()
+    run = new_headless_run(seed=7, observers=[collector])
+    game_over, _ = run.simulate(30)
+
+    assert [turn for turn, *_ in collector.turns] == list(range(1, run.turn + 1))
+    assert collector.turns[-1] == (run.turn, run.gold, game_over)
+    assert collector.quests
+    concluded = sum(
+        1
+        for lines in run.turn_log.values()
+        for line in lines
+        if line.startswith(("✅", "❌"))
+    )
+    assert len(collector.quests) == concluded
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_recorder_writes_readable_tables(tmp_path, fmt):
+    pytest.importorskip("pyarrow")
+
+    with TelemetryRecorder(tmp_path, fmt=fmt, batch_size=8) as recorder:
+        for seed in [0, 1, 1]:
+            new_headless_run(seed=seed, observers=[recorder]).simulate(20)
+
+    quests = read_table(tmp_path / f"quests.{fmt}")
+    turns = read_table(tmp_path / f"turns.{fmt}")
+    # Runs sharing a seed still get their own id
+    assert turns["run_id"].nunique() == 3
+    assert set(turns["seed"]) == {0, 1}
+    assert len(quests) == recorder.quests.n_rows
+    assert quests["success"].dtype == bool
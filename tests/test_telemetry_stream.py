@@ -0,0 +1,63 @@
+import json
+import threading
+import time
+
+from piratesim.simulation import new_headless_run
+from piratesim.telemetry_stream import EventStream, FileSink, StreamSink
+
+
+def test_events_are_streamed_as_json_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with EventStream(FileSink(path)) as stream:
+        run = new_headless_run(seed=3, observers=[stream])
+        game_over, reason = run.simulate(50)
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    kinds = {event["event"] for event in events}
+    assert {"quest_assigned", "gold", "encounter"} <= kinds
+    assert stream.sent == len(events) and stream.dropped == 0
+    assert len({event["run_id"] for event in events}) == 1
+    if game_over:
+        assert events[-1] == {
+            "run_id": events[0]["run_id"],
+            "seed": 3,
+            "turn": run.turn,
+            "event": "game_over",
+            "reason": reason,
+        }
+
+
+class StuckSink(StreamSink):
+    def __init__(self):
+        self.released = threading.Event()
+        self.lines = []
+
+    def write(self, lines):
+        self.released.wait()
+        self.lines.extend(lines)
+
+
+def test_slow_sinks_drop_events_instead_of_blocking():
+    sink = StuckSink()
+    stream = EventStream(sink, max_queued=4, policy="drop_oldest")
+    run = new_headless_run(seed=3, observers=[stream])
+
+    start = time.perf_counter()
+    run.simulate(30)
+    assert time.perf_counter() - start < 5
+    assert stream.dropped > 0
+
+    sink.released.set()
+    stream.close()
+    assert stream.sent == len(sink.lines) <= 4 + stream.batch_size
+
+
+def test_runs_sharing_a_seed_are_told_apart(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with EventStream(FileSink(path)) as stream:
+        for _ in range(2):
+            new_headless_run(seed=3, observers=[stream]).simulate(5)
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len({event["run_id"] for event in events}) == 2
+    assert {event["seed"] for event in events} == {3}
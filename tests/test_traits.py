@@ -0,0 +1,29 @@
+import copy
+import pickle
+
+from piratesim.pirate import load_pirate_bank
+from piratesim.quests.effects import NotorietyEffect
+from piratesim.quests.quest_effect import EffectBinding
+from piratesim.trait import TRAITS, TraitFactory
+
+
+def test_traits_are_interned():
+    assert TraitFactory.get_trait("bold") is TraitFactory.get_trait("bold")
+    for trait_id, trait in enumerate(TRAITS):
+        assert trait.trait_id == trait_id
+        assert TraitFactory.from_id(trait_id) is trait
+        assert copy.deepcopy(trait) is trait
+        assert pickle.loads(pickle.dumps(trait)) is trait
+
+
+def test_cautious_pirates_keep_a_low_profile():
+    class Run:
+        notoriety = 0
+
+    pirate = load_pirate_bank()[0]
+    pirate.trait = TraitFactory.get_trait("cautious")
+
+    binding = EffectBinding(quest=None)
+    binding.quest_taker = pirate
+    NotorietyEffect.shared(5).resolve(Run, binding)
+    assert Run.notoriety == 0
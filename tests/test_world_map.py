@@ -0,0 +1,122 @@
+import math
+import random
+
+from piratesim.common.spatial import GridIndex, compass_direction
+from piratesim.routing import HOME, SeaRouter
+from piratesim.world_map import ProceduralWorldMap, WorldMap
+
+
+def test_grid_index_matches_brute_force():
+    rng = random.Random(0)
+    points = {i: (rng.uniform(-50, 50), rng.uniform(-50, 50)) for i in range(500)}
+    index = GridIndex(cell_size=7.0)
+    for i, (x, y) in points.items():
+        index.insert(i, x, y)
+
+    def by_distance(x, y):
+        return sorted(points, key=lambda i: math.dist(points[i], (x, y)))
+
+    for _ in range(20):
+        x, y = rng.uniform(-60, 60), rng.uniform(-60, 60)
+        expected = by_distance(x, y)
+
+        assert index.nearest(x, y, k=5) == expected[:5]
+        assert index.within_radius(x, y, 10) == [
+            i for i in expected if math.dist(points[i], (x, y)) <= 10
+        ]
+        north = [
+            i
+            for i in expected
+            if compass_direction(points[i][0] - x, points[i][1] - y) == "NORTH"
+        ]
+        assert index.in_direction(x, y, "NORTH", k=3) == north[:3]
+
+
+def test_compass_map_reveals_every_region():
+    random.seed(1)
+    world_map = WorldMap()
+
+    revealed = world_map.pop_newly_revealed()
+    assert [r.direction for r in revealed] == world_map.directions
+    assert world_map.pop_newly_revealed() == []
+    assert world_map.get_region("NORTH").y > 0
+
+
+def test_exploration_reveals_neighbours_incrementally():
+    random.seed(2)
+    world_map = WorldMap(n_regions=2000, radius=100, sight_radius=6)
+
+    frontier = world_map.pop_newly_revealed()
+    assert 0 < len(frontier) < 2000
+
+    region = frontier[0]
+    world_map.explore(region)
+    assert region.discovered
+    assert region.region_id not in world_map.undiscovered
+
+    revealed = world_map.pop_newly_revealed()
+    assert all(math.dist((r.x, r.y), (region.x, region.y)) <= 6 for r in revealed)
+    assert not set(revealed) & set(frontier)
+
+
+def test_clones_explore_separately():
+    random.seed(3)
+    world_map = WorldMap(n_regions=200, radius=50, sight_radius=10)
+    region = world_map.pop_newly_revealed()[0]
+
+    clone = world_map.clone()
+    clone.explore(region)
+    assert clone.region(region.region_id).discovered
+    assert not world_map.region(region.region_id).discovered
+    assert clone.pop_newly_revealed()
+    assert world_map.pop_newly_revealed() == []
+
+    world_map.explore(region)
+    assert world_map.region(region.region_id) is not clone.region(region.region_id)
+
+
+def test_procedural_map_is_deterministic_and_bounded():
+    first = ProceduralWorldMap(seed=7, max_idle_chunks=2)
+    second = ProceduralWorldMap(seed=7)
+    assert [r.island_name for r in first.chunk(3, -2)] == [
+        r.island_name for r in second.chunk(3, -2)
+    ]
+
+    # Sail far away, exploring the closest unknown island every time
+    x, y = 0.0, 0.0
+    for _ in range(50):
+        candidates = first.pop_newly_revealed() or first.nearest(
+            x, y, k=50, max_distance=60
+        )
+        region = next(r for r in candidates if not r.discovered)
+        first.explore(region)
+        x, y = region.x, region.y
+
+    assert len(first.discovered) == 50
+    assert first.n_materialized_chunks < 20
+
+    # Evicted chunks come back with their exploration state
+    for region_id in first.discovered:
+        assert first.chunk(*region_id[:2])[region_id[2]].discovered
+
+
+def test_routes_are_cached_and_match_compass_distances():
+    random.seed(1)
+    world_map = WorldMap()
+    router = SeaRouter(world_map)
+
+    for region in world_map.get_all_regions():
+        route = router.route(HOME, region, navigation=3)
+        assert route.path == (HOME, region.region_id)
+        assert route.voyage_length == region.distance
+
+    router.route(HOME, world_map.get_region("NORTH"), navigation=2)
+    assert (router.hits, router.misses) == (1, 8)
+
+    # Far away islands are reached by hopping between the closest ones
+    world_map = WorldMap(n_regions=300, radius=100)
+    router = SeaRouter(world_map)
+    far = max(world_map.get_all_regions(), key=lambda r: r.distance)
+    route = router.route(HOME, far)
+    assert len(route.path) > 2
+    assert route.leagues >= math.hypot(far.x, far.y)